@@ -117,4 +117,191 @@ document.querySelectorAll('.cal-chip').forEach(chip => {
     if (status === 'Ongoing') {
         chip.classList.add('cal-chip--ongoing');
     }
-});
\ No newline at end of file
+});
+/**
+ * Client-side month navigation.
+ * Prev/next links fetch the month from the JSON range endpoint instead of
+ * reloading the page. Each month is cached with its ETag, so revisiting a
+ * month costs one conditional request that normally ends in a 304.
+ */
+(function () {
+    const table = document.querySelector('.cal-table');
+    const urlMeta = document.querySelector('meta[name="calendar-events-url"]');
+    if (!table || !urlMeta || !window.fetch) return;
+
+    const MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June',
+        'July', 'August', 'September', 'October', 'November', 'December'];
+    const monthCache = new Map();
+    let current = { year: Number(table.dataset.year), month: Number(table.dataset.month) };
+
+    /** Format a local Date as YYYY-MM-DD. */
+    function isoDate(d) {
+        const pad = n => String(n).padStart(2, '0');
+        return `${d.getFullYear()}-${pad(d.getMonth() + 1)}-${pad(d.getDate())}`;
+    }
+
+    /** Return the Monday-first weeks (arrays of Dates) covering a month. */
+    function monthWeeks(year, month) {
+        const first = new Date(year, month - 1, 1);
+        const cursor = new Date(year, month - 1, 1 - ((first.getDay() + 6) % 7));
+        const weeks = [];
+        do {
+            const week = [];
+            for (let i = 0; i < 7; i++) {
+                week.push(new Date(cursor));
+                cursor.setDate(cursor.getDate() + 1);
+            }
+            weeks.push(week);
+        } while (cursor.getMonth() === month - 1);
+        return weeks;
+    }
+
+    /** Shift a {year, month} pair by delta months. */
+    function shiftMonth(ym, delta) {
+        const index = ym.year * 12 + (ym.month - 1) + delta;
+        return { year: Math.floor(index / 12), month: (index % 12) + 1 };
+    }
+
+    /** Derive the same status label the server renders, comparing UTC instants. */
+    function occurrenceStatus(ev, now) {
+        const start = new Date(ev.start_utc);
+        const end = new Date(ev.end_utc);
+        if (start < now && end > now) return 'Ongoing';
+        if (end < now) return 'Past';
+        return 'Upcoming';
+    }
+
+    /**
+     * Fetch a month's occurrences, revalidating any cached copy with If-None-Match.
+     * @returns {Promise<Array>} occurrence records
+     */
+    function loadMonth(ym) {
+        const weeks = monthWeeks(ym.year, ym.month);
+        const params = new URLSearchParams({
+            start: isoDate(weeks[0][0]),
+            end: isoDate(weeks[weeks.length - 1][6]),
+        });
+        const key = `${ym.year}-${ym.month}`;
+        const cached = monthCache.get(key);
+        const headers = { 'X-Requested-With': 'XMLHttpRequest' };
+        if (cached) headers['If-None-Match'] = cached.etag;
+        return fetch(`${urlMeta.content}?${params}`, { headers, cache: 'no-store', credentials: 'same-origin' })
+            .then(res => {
+                if (res.status === 304 && cached) return cached.events;
+                if (!res.ok) throw new Error(`HTTP ${res.status}`);
+                return res.json().then(data => {
+                    monthCache.set(key, { etag: res.headers.get('ETag'), events: data.events });
+                    return data.events;
+                });
+            });
+    }
+
+    /** Build one event chip matching the server-rendered markup. */
+    function buildChip(ev, index, now) {
+        const chip = document.createElement('a');
+        const status = occurrenceStatus(ev, now);
+        chip.href = '#';
+        chip.className = `cal-chip cal-chip--${ev.type}`;
+        if (index >= 3) chip.classList.add('cal-chip-hidden');
+        if (status === 'Ongoing') chip.classList.add('cal-chip--ongoing');
+        chip.setAttribute('data-bs-toggle', 'modal');
+        chip.setAttribute('data-bs-target', '#eventDetailsModal');
+        chip.addEventListener('click', e => e.stopPropagation());
+        Object.assign(chip.dataset, {
+            eventId: ev.id,
+            eventTitle: ev.title,
+            eventType: ev.type_display,
+            eventStart: ev.start,
+            eventEnd: ev.end,
+            eventLocation: ev.location,
+            eventDescription: ev.description,
+            eventRecurrence: ev.recurrence_display,
+            eventAllDay: ev.all_day ? 'True' : 'False',
+            eventVisibility: ev.visibility,
+            eventStatus: status,
+        });
+        chip.textContent = ev.title;
+        return chip;
+    }
+
+    /** Build one day cell. */
+    function buildCell(day, ym, todayIso, events, now) {
+        const td = document.createElement('td');
+        const dayIso = isoDate(day);
+        const inMonth = day.getMonth() === ym.month - 1;
+        if (!inMonth) td.classList.add('cal-outside');
+        if (dayIso === todayIso) td.classList.add('cal-today');
+        if (inMonth) {
+            td.dataset.date = dayIso;
+            td.addEventListener('click', () => openAddEvent(dayIso));
+        }
+        const num = document.createElement('span');
+        num.className = 'cal-day-num';
+        num.textContent = day.getDate();
+        td.appendChild(num);
+        if (!events.length) return td;
+
+        const wrap = document.createElement('div');
+        wrap.className = 'cal-events';
+        events.forEach((ev, i) => wrap.appendChild(buildChip(ev, i, now)));
+        if (events.length > 3) {
+            const more = document.createElement('span');
+            more.className = 'cal-chip-overflow';
+            more.textContent = `+${events.length - 3} more`;
+            const label = day.toLocaleDateString('en-GB', { day: '2-digit', month: 'short', year: 'numeric' });
+            more.addEventListener('click', e => {
+                e.stopPropagation();
+                openDayEvents(dayIso, label, more);
+            });
+            wrap.appendChild(more);
+        }
+        td.appendChild(wrap);
+        return td;
+    }
+
+    /** Replace the grid, heading and nav links with the given month. */
+    function render(ym, events) {
+        const byDate = {};
+        events.forEach(ev => (byDate[ev.date] = byDate[ev.date] || []).push(ev));
+        const now = new Date();
+        // The server marks today by its UTC date, so match it rather than the browser's.
+        const todayIso = now.toISOString().slice(0, 10);
+        const tbody = document.createElement('tbody');
+        monthWeeks(ym.year, ym.month).forEach(week => {
+            const tr = document.createElement('tr');
+            week.forEach(day => tr.appendChild(buildCell(day, ym, todayIso, byDate[isoDate(day)] || [], now)));
+            tbody.appendChild(tr);
+        });
+        table.replaceChild(tbody, table.tBodies[0]);
+        table.dataset.year = ym.year;
+        table.dataset.month = ym.month;
+        document.querySelector('.cal-month').textContent = `${MONTH_NAMES[ym.month - 1]} ${ym.year}`;
+        document.querySelectorAll('[data-cal-nav]').forEach(link => {
+            const target = shiftMonth(ym, Number(link.dataset.calNav));
+            link.href = `?year=${target.year}&month=${target.month}`;
+        });
+        current = ym;
+    }
+
+    /** Navigate to a month, falling back to a full page load on any error. */
+    function goTo(ym, href, push) {
+        loadMonth(ym)
+            .then(events => {
+                render(ym, events);
+                if (push) history.pushState(ym, '', href);
+            })
+            .catch(() => { window.location.href = href; });
+    }
+
+    document.querySelectorAll('[data-cal-nav]').forEach(link => {
+        link.addEventListener('click', e => {
+            e.preventDefault();
+            goTo(shiftMonth(current, Number(link.dataset.calNav)), link.href, true);
+        });
+    });
+
+    history.replaceState(current, '', window.location.href);
+    window.addEventListener('popstate', e => {
+        if (e.state && e.state.year) goTo(e.state, window.location.href, false);
+    });
+})();
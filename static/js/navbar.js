@@ -1,6 +1,6 @@
 /**
  * Navigation Bar Management
- * Handles Bootstrap tooltips, notification badges, real-time polling, and focus mode state.
+ * Handles Bootstrap tooltips, notification badges, pushed and polled updates, and focus mode state.
  */
 
 document.addEventListener("DOMContentLoaded", function () {
@@ -52,7 +52,19 @@ document.addEventListener("DOMContentLoaded", function () {
         if (newUnread > 0) {
           updateNotifBadge(currentUnread + newUnread);}})
       .catch(err => console.error("Polling error:", err));}
-      
-  setInterval(pollNotifications, 10000);
+
+  /* Pushed events from realtime.js; polling stays as the fallback */
+  document.addEventListener("timeout:notification", e => {
+    lastNotifId = Math.max(lastNotifId, e.detail.id);
+    updateNotifBadge(e.detail.unread_count);
+  });
+  document.addEventListener("timeout:unread", e => updateNotifBadge(e.detail.unread_count));
+  document.addEventListener("timeout:sync", pollNotifications);
+
+  let pollTick = 0;
+  setInterval(() => {
+    if (window.TimeoutRealtime?.skipTick(++pollTick, 10000)) return;
+    pollNotifications();
+  }, 10000);
 
 });
@@ -1,7 +1,8 @@
 /**
  * Notification Polling System
  * Fetches unread notification count from server and updates navigation badge.
- * Polls immediately on load, when focus mode ends, and every 10 seconds.
+ * Polls immediately on load, when focus mode ends, and every 10 seconds, or about
+ * once a minute while realtime.js has a push stream open.
  * Skips full polling when user is in focus mode (fire-and-forget only).
  * Reads poll URL from data-poll-url attribute on its own script tag.
  */
@@ -33,7 +34,25 @@ document.addEventListener('DOMContentLoaded', () => {
     }
   }
 
-  /* Poll notifications immediately on page load and every 10 seconds */
+  /**
+   * Show or hide the badge for an unread count.
+   */
+  function showCount(count) {
+    if (!badge) return;
+    badge.textContent = count;
+    badge.style.display = count > 0 ? 'inline-block' : 'none';
+  }
+
+  /* Pushed counts from realtime.js */
+  document.addEventListener('timeout:notification', e => showCount(e.detail.unread_count));
+  document.addEventListener('timeout:unread', e => showCount(e.detail.unread_count));
+  document.addEventListener('timeout:sync', updateNotifications);
+
+  /* Poll notifications immediately on page load and every 10 seconds (about once a minute while pushed) */
   updateNotifications();
-  setInterval(updateNotifications, 10000);
+  let pollTick = 0;
+  setInterval(() => {
+    if (window.TimeoutRealtime?.skipTick(++pollTick, 10000)) return;
+    updateNotifications();
+  }, 10000);
 });
\ No newline at end of file
@@ -251,8 +251,7 @@ document.addEventListener("DOMContentLoaded", () => {
     if (!sentinel) return;
 
     const config = document.getElementById("notifications-config");
-    let currentPage = parseInt(config?.dataset.currentPage || "1");
-    let hasNext = config?.dataset.hasNext === "true";
+    let nextCursor = config?.dataset.nextCursor || "";
     const currentFilter = config?.dataset.currentFilter || "";
     let isLoading = false;
 
@@ -285,19 +284,18 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     const observer = new IntersectionObserver(async (entries) => {
-        if (!entries[0].isIntersecting || isLoading || !hasNext) return;
+        if (!entries[0].isIntersecting || isLoading || !nextCursor) return;
         isLoading = true;
         if (loadingIndicator) loadingIndicator.style.display = "block";
-        currentPage++;
 
         try {
-            const params = new URLSearchParams({ page: currentPage });
+            const params = new URLSearchParams({ cursor: nextCursor });
             if (currentFilter) params.set("filter", currentFilter);
             const res = await fetch("?" + params.toString(), {
                 headers: { "X-Requested-With": "XMLHttpRequest" }
             });
             const data = await res.json();
-            hasNext = data.has_next;
+            nextCursor = data.next_cursor || "";
             data.notifications.forEach(n => {
                 notifList.appendChild(_buildNotifElement(n));
             });
@@ -0,0 +1,33 @@
+/**
+ * Realtime Push Channel
+ * Opens one Server-Sent Events stream per tab and re-dispatches its events
+ * (notification, unread, message, sync) on document as "timeout:<event>".
+ * While the stream is open, pollers fall back to a slow safety-net interval.
+ * Reads the stream URL from data-stream-url attribute on its own script tag.
+ */
+(function () {
+  const realtime = { connected: false };
+  window.TimeoutRealtime = realtime;
+
+  const scriptTag = document.querySelector('script[data-stream-url]');
+  if (!scriptTag || !window.EventSource) return;
+
+  const source = new EventSource(scriptTag.dataset.streamUrl);
+  source.addEventListener('open', () => { realtime.connected = true; });
+  // EventSource reconnects by itself; poll normally until it does.
+  source.addEventListener('error', () => { realtime.connected = false; });
+
+  ['notification', 'unread', 'message', 'sync'].forEach(name => {
+    source.addEventListener(name, e => {
+      document.dispatchEvent(new CustomEvent(`timeout:${name}`, { detail: JSON.parse(e.data) }));
+    });
+  });
+
+  /**
+   * Return true when a poller running every intervalMs should skip this tick,
+   * so that it only runs about once a minute while the stream is open.
+   */
+  realtime.skipTick = function (tick, intervalMs) {
+    return realtime.connected && tick % Math.max(1, Math.round(60000 / intervalMs)) !== 0;
+  };
+})();
@@ -44,11 +44,14 @@ function rsRenderPreview(original, suggestions) {
         const newTime = fmtDatetime(s.start) + ' → ' + fmtTime(s.end);
         const changed = old && (old.start !== s.start);
 
+        const rowClass = s.conflict ? 'table-danger' : (changed ? 'table-warning' : '');
+        const clash = s.conflict ? ' <span class="badge bg-danger">Clashes</span>' : '';
+
         tbody.innerHTML += `
-            <tr class="${changed ? 'table-warning' : ''}">
+            <tr class="${rowClass}">
                 <td>${s.title}</td>
                 <td class="text-muted">${oldTime}</td>
-                <td><strong>${newTime}</strong></td>
+                <td><strong>${newTime}</strong>${clash}</td>
             </tr>`;
     });
 }
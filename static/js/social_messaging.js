@@ -5,12 +5,9 @@
  */
 
 /**
- * Append message to conversation container and auto-scroll to bottom.
+ * Build the bubble row for a message.
  */
-function _appendMessage(container, msg) {
-    const empty = container.querySelector('.convo-empty');
-    if (empty) empty.remove();
-
+function _messageRow(msg) {
     const row = document.createElement('div');
     row.className = `msg-bubble-row ${msg.is_me ? 'msg-mine' : 'msg-theirs'}`;
     row.dataset.messageId = msg.id;
@@ -19,10 +16,41 @@ function _appendMessage(container, msg) {
             <div class="msg-text">${msg.content}</div>
             <div class="msg-time">${msg.created_at}</div>
         </div>`;
-    container.appendChild(row);
+    return row;
+}
+
+/**
+ * Append message to conversation container and auto-scroll to bottom.
+ */
+function _appendMessage(container, msg) {
+    const empty = container.querySelector('.convo-empty');
+    if (empty) empty.remove();
+
+    container.appendChild(_messageRow(msg));
     container.scrollTop = container.scrollHeight;
 }
 
+/**
+ * Fetch the page of messages before the oldest one shown and prepend it,
+ * keeping the visible messages where they are.
+ */
+function _loadOlder(config, container, state) {
+    if (state.loadingOlder || !state.olderCursor) return;
+    state.loadingOlder = true;
+    fetch(`${config.historyUrl}?cursor=${encodeURIComponent(state.olderCursor)}`)
+        .then(r => r.json())
+        .then(data => {
+            const previousHeight = container.scrollHeight;
+            const page = document.createDocumentFragment();
+            data.messages.forEach(msg => page.appendChild(_messageRow(msg)));
+            container.insertBefore(page, container.firstChild);
+            container.scrollTop += container.scrollHeight - previousHeight;
+            state.olderCursor = data.older_cursor;
+        })
+        .catch(err => console.error('History error:', err))
+        .finally(() => { state.loadingOlder = false; });
+}
+
 /**
  * Send message via API and update UI on success.
  */
@@ -47,7 +75,8 @@ function _sendMessage(config, input, sendBtn, container, state) {
  */
 function _pollMessages(config, container, state) {
     fetch(`${config.pollUrl}?last_id=${state.lastMessageId}`)
-        .then(r => r.json())
+        // 204: nothing newer than lastMessageId.
+        .then(r => r.status === 204 ? { messages: [] } : r.json())
         .then(data => {
             data.messages.forEach(msg => {
                 _appendMessage(container, msg);
@@ -67,7 +96,11 @@ function initMessaging() {
     const input     = document.getElementById('message-input');
     const sendBtn   = document.getElementById('send-btn');
     const container = document.getElementById('message-container');
-    const state = { lastMessageId: 0 };
+    const state = {
+        lastMessageId: 0,
+        olderCursor: container.dataset.olderCursor || null,
+        loadingOlder: false,
+    };
 
     document.querySelectorAll('[data-message-id]').forEach(el => {
         const id = parseInt(el.dataset.messageId, 10);
@@ -79,7 +112,21 @@ function initMessaging() {
         if (e.key === 'Enter' && !e.shiftKey) { e.preventDefault(); _sendMessage(config, input, sendBtn, container, state); }
     });
 
-    setInterval(() => _pollMessages(config, container, state), 3000);
+    // A pushed message triggers an immediate poll, which also marks it read.
+    document.addEventListener('timeout:message', e => {
+        if (e.detail.conversation_id === config.conversationId && e.detail.id > state.lastMessageId) {
+            _pollMessages(config, container, state);
+        }
+    });
+    // Older pages are loaded as the thread is scrolled near its top.
+    container.addEventListener('scroll', () => {
+        if (container.scrollTop < 80) _loadOlder(config, container, state);
+    });
+    let pollTick = 0;
+    setInterval(() => {
+        if (window.TimeoutRealtime?.skipTick(++pollTick, 3000)) return;
+        _pollMessages(config, container, state);
+    }, 3000);
     container.scrollTop = container.scrollHeight;
 }
 
@@ -11,8 +11,10 @@ class TimeoutConfig(AppConfig):
     name = 'timeout'
 
     def ready(self):
-        """Register a post_migrate hook to clean up duplicate Google SocialApp records."""
+        """Register a post_migrate hook to clean up duplicate Google SocialApp records,
+        and connect the signal handlers in timeout.signals."""
         from django.db.models.signals import post_migrate
+        from timeout import signals  # noqa: F401
         post_migrate.connect(self._deduplicate_google_socialapp, sender=self)
 
     @staticmethod
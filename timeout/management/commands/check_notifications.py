@@ -2,26 +2,81 @@
 check_notifications.py - Management command to check upcoming deadlines and events
                          and create notifications for all users accordingly.
 
-This command iterates through all users in the system and uses the NotificationService
-to create notifications for any upcoming deadlines and events that they have. It is 
-intended to be run periodically (e.g., via a cron job) to ensure that users receive 
-timely notifications about their deadlines and events.
+The due reminders (1 hour, 1 day and 1 week ahead) of every user are computed in a few
+set-based queries by NotificationService.due_reminders and inserted in chunks. Reminders
+already sent are skipped by the unique (user, deadline, reminder_kind, reminder_due_at)
+constraint, so the command is safe to run as often as needed (e.g., via a cron job).
+
+Usage:
+    python manage.py check_notifications
+    python manage.py check_notifications --workers 4   # split users into 4 id ranges
+    python manage.py check_notifications --dry-run     # count and time, write nothing
 """
 
-from django.core.management.base import BaseCommand
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Max, Min
+from django.utils import timezone
 from timeout.services.notification_service import NotificationService
 
 User = get_user_model()
 
+
+def user_ranges(workers):
+    """Split the user id space into at most `workers` contiguous (first, last) ranges."""
+    bounds = User.objects.aggregate(first=Min('id'), last=Max('id'))
+    if bounds['first'] is None:
+        return []
+    first, last = bounds['first'], bounds['last']
+    step = -(-(last - first + 1) // workers)
+    return [(lo, min(lo + step - 1, last)) for lo in range(first, last + 1, step)]
+
+
+def check_range(user_range, now, dry_run):
+    """Create the due reminders of one user id range. Returns (candidates, seconds)."""
+    started = time.perf_counter()
+    count = NotificationService.create_due_reminders(now, user_range, dry_run)
+    return count, time.perf_counter() - started
+
+
 class Command(BaseCommand):
     """Management command to check upcoming deadlines and events, and create the notifications for all users accordingly."""
     help = "Check upcoming deadlines and create notifications"
 
-    def handle(self, *args, **kwargs):
-        """Iterate through all users and create notifications for deadlines and events."""
-        for user in User.objects.all():
-            NotificationService.create_deadline_notifications(user)
-            NotificationService.create_event_notifications(user)
+    def add_arguments(self, parser):
+        """Add the optional worker count and dry-run flag."""
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes, each handling one range of user ids.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Compute the due reminders and report timings without writing them.',
+        )
 
-        self.stdout.write(self.style.SUCCESS("Notifications checked."))
\ No newline at end of file
+    def handle(self, *args, **options):
+        """Compute and insert the due reminders, in parallel when --workers is above 1."""
+        now, workers, dry_run = timezone.now(), max(1, options['workers']), options['dry_run']
+        started = time.perf_counter()
+        ranges = user_ranges(workers)
+        if workers > 1 and len(ranges) > 1:
+            # Forked workers must open their own database connections.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(check_range, ranges, [now] * len(ranges), [dry_run] * len(ranges)))
+        else:
+            results = [check_range(r, now, dry_run) for r in ranges]
+        if dry_run:
+            for user_range, (count, seconds) in zip(ranges, results):
+                self.stdout.write(f"Users {user_range[0]}-{user_range[1]}: {count} due reminders in {seconds:.2f}s")
+            total = sum(count for count, _ in results)
+            self.stdout.write(f"Dry run: {total} due reminders in {time.perf_counter() - started:.2f}s")
+            return
+        self.stdout.write(self.style.SUCCESS("Notifications checked."))
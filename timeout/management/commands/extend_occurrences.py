@@ -0,0 +1,40 @@
+"""
+extend_occurrences.py - Management command to extend the materialised EventOccurrence table
+                        up to the rolling horizon.
+
+Recurring events only have occurrences stored up to OccurrenceService.HORIZON_DAYS ahead of
+the day they were last saved. This command appends the missing occurrences of every recurring
+series so the horizon keeps moving forward. It is intended to be run daily (e.g., via a cron job).
+
+Usage:
+    python manage.py extend_occurrences
+    python manage.py extend_occurrences --rebuild   # regenerate every event from scratch
+"""
+
+from django.core.management.base import BaseCommand
+from timeout.models import Event
+from timeout.services.occurrence_service import OccurrenceService
+
+
+class Command(BaseCommand):
+    """Management command to extend (or rebuild) materialised event occurrences."""
+    help = "Extend materialised event occurrences up to the rolling horizon"
+
+    def add_arguments(self, parser):
+        """Add optional argument to rebuild every event's occurrences."""
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Delete and regenerate the occurrences of every event.',
+        )
+
+    def handle(self, *args, **options):
+        """Extend recurring series, or regenerate every event when --rebuild is given."""
+        if options['rebuild']:
+            events = Event.objects.all()
+            for event in events.iterator(chunk_size=OccurrenceService.BATCH_SIZE):
+                OccurrenceService.regenerate(event)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt occurrences for {events.count()} events."))
+            return
+        created = OccurrenceService.extend()
+        self.stdout.write(self.style.SUCCESS(f"Created {created} occurrences."))
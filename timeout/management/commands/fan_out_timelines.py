@@ -0,0 +1,39 @@
+"""
+fan_out_timelines.py - Management command that delivers queued posts to the rest of their authors' followers.
+
+Creating a post writes the author's and the first followers' timeline rows in the request and
+queues a PendingFanout row for larger audiences; this runner writes the remaining followers in
+chunks. Run it every minute from cron, or leave it running with --interval.
+
+Usage:
+    python manage.py fan_out_timelines
+    python manage.py fan_out_timelines --interval 5   # keep running, draining every 5 seconds
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from timeout.services import TimelineService
+
+
+class Command(BaseCommand):
+    """Management command to finish the queued timeline fan-outs."""
+    help = "Deliver queued posts to the rest of their authors' followers"
+
+    def add_arguments(self, parser):
+        """Add the optional polling interval."""
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep running and drain the queue every N seconds.',
+        )
+
+    def handle(self, *args, **options):
+        """Drain the queue once, or repeatedly when --interval is given."""
+        while True:
+            finished = TimelineService.drain_fanout()
+            self.stdout.write(self.style.SUCCESS(f"Fanned out {finished} posts."))
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
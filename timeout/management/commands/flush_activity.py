@@ -0,0 +1,39 @@
+"""
+flush_activity.py - Management command that folds queued post activity into notifications.
+
+Only needed when settings.NOTIFICATION_FANOUT is 'queue': likes, bookmarks and comments then
+queue a PendingActivity row after commit and this runner writes the notifications in batches.
+Run it every minute from cron, or leave it running with --interval.
+
+Usage:
+    python manage.py flush_activity
+    python manage.py flush_activity --interval 5   # keep running, flushing every 5 seconds
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from timeout.services import activity_buffer
+
+
+class Command(BaseCommand):
+    """Management command to turn queued post activity into notifications."""
+    help = "Fold queued post activity into notifications"
+
+    def add_arguments(self, parser):
+        """Add the optional polling interval."""
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep running and flush the queue every N seconds.',
+        )
+
+    def handle(self, *args, **options):
+        """Flush the queue once, or repeatedly when --interval is given."""
+        while True:
+            processed = activity_buffer.drain()
+            self.stdout.write(self.style.SUCCESS(f"Flushed {processed} activities."))
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,51 @@
+"""
+purge_notifications.py - Management command to hard-delete old notifications according to the
+                         retention policy in settings.NOTIFICATION_RETENTION.
+
+Dismissed notifications, old read notifications and reminders of events that have ended are
+deleted in batches, so each statement stays short and the table stays small. It is intended
+to be run daily (e.g., via a cron job).
+
+Usage:
+    python manage.py purge_notifications
+    python manage.py purge_notifications --dry-run         # count what would be deleted
+    python manage.py purge_notifications --max-batches 10  # stop each rule after 10 batches
+"""
+
+from django.core.management.base import BaseCommand
+from timeout.services.retention_service import RetentionService
+
+
+class Command(BaseCommand):
+    """Management command to apply the notification retention policy."""
+    help = "Hard-delete dismissed, old read and expired reminder notifications"
+
+    def add_arguments(self, parser):
+        """Add the optional dry-run flag, batch size and batch limit."""
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the notifications each rule would delete without deleting them.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Rows deleted per statement (overrides NOTIFICATION_RETENTION["BATCH_SIZE"]).',
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            help='Stop each rule after this many batches.',
+        )
+
+    def handle(self, *args, **options):
+        """Apply each retention rule and report how many rows it removed."""
+        policy = RetentionService.policy()
+        if options['batch_size']:
+            policy['BATCH_SIZE'] = max(1, options['batch_size'])
+        purged = RetentionService.purge(policy=policy, dry_run=options['dry_run'],
+                                        max_batches=options['max_batches'])
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        for name, count in purged.items():
+            self.stdout.write(f"{verb} {count} {name.replace('_', ' ')} notifications.")
+        self.stdout.write(self.style.SUCCESS(f"{verb} {sum(purged.values())} notifications in total."))
@@ -0,0 +1,37 @@
+"""
+rebuild_timelines.py - Management command to rebuild home timelines from the follow graph.
+
+Timelines are kept in step as posts are written and follows change; this command rebuilds
+them from scratch, e.g. after bulk imports that skipped the post signal or if one drifts.
+Each timeline gets its own and its followed authors' latest posts.
+
+Usage:
+    python manage.py rebuild_timelines
+    python manage.py rebuild_timelines --user alice --user bob
+"""
+
+from django.core.management.base import BaseCommand
+from timeout.models import User
+from timeout.services import TimelineService
+
+
+class Command(BaseCommand):
+    """Management command to rebuild the following-feed timelines."""
+    help = "Rebuild home timelines from follows and recent posts"
+
+    def add_arguments(self, parser):
+        """Add the optional usernames to limit the rebuild to."""
+        parser.add_argument(
+            '--user',
+            action='append',
+            dest='usernames',
+            help='Only rebuild this user\'s timeline (repeatable).',
+        )
+
+    def handle(self, *args, **options):
+        """Rebuild the selected timelines, or every one."""
+        user_ids = None
+        if options['usernames']:
+            user_ids = list(User.objects.filter(username__in=options['usernames']).values_list('pk', flat=True))
+        rebuilt = TimelineService.rebuild(user_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} timelines."))
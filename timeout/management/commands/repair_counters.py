@@ -0,0 +1,29 @@
+"""
+repair_counters.py - Management command to recompute every user's unread counters from scratch.
+
+UserCounters rows are kept in step incrementally; this command rebuilds them from the
+notification and message tables, e.g. after bulk data fixes or if a counter ever drifts.
+
+Usage:
+    python manage.py repair_counters
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from timeout.models import UserCounters
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """Management command to recount the unread counters of all users."""
+    help = "Recompute every user's unread notification and message counters"
+
+    BATCH_SIZE = 500
+
+    def handle(self, *args, **options):
+        """Recount users in batches of BATCH_SIZE ids."""
+        ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        for i in range(0, len(ids), self.BATCH_SIZE):
+            UserCounters.recount(ids[i:i + self.BATCH_SIZE])
+        self.stdout.write(self.style.SUCCESS(f"Recounted unread counters for {len(ids)} users."))
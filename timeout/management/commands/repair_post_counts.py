@@ -0,0 +1,26 @@
+"""
+repair_post_counts.py - Management command to recompute every post's like, comment and bookmark counts.
+
+The counts on Post are kept in step incrementally; this command rebuilds them from the like,
+comment and bookmark tables, e.g. after bulk data fixes or if a count ever drifts.
+
+Usage:
+    python manage.py repair_post_counts
+"""
+
+from django.core.management.base import BaseCommand
+from timeout.models import Post
+
+
+class Command(BaseCommand):
+    """Management command to recount the interactions of all posts."""
+    help = "Recompute every post's like, comment and bookmark counts"
+
+    BATCH_SIZE = 500
+
+    def handle(self, *args, **options):
+        """Recount posts in batches of BATCH_SIZE ids."""
+        ids = list(Post.objects.order_by('pk').values_list('pk', flat=True))
+        for i in range(0, len(ids), self.BATCH_SIZE):
+            Post.recount(ids[i:i + self.BATCH_SIZE])
+        self.stdout.write(self.style.SUCCESS(f"Recounted interactions for {len(ids)} posts."))
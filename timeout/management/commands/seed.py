@@ -22,7 +22,7 @@ from django.utils.timezone import make_aware
 from faker import Faker
 
 from allauth.socialaccount.models import SocialApp
-from timeout.models import Event, Post, Comment, Like, Bookmark, FocusSession, Note, StudyLog, Conversation, Message
+from timeout.models import Event, Post, Comment, Like, Bookmark, FocusSession, Note, StudyLog, Conversation, ConversationMembership, Message
 
 User = get_user_model()
 fake = Faker()
@@ -829,17 +829,11 @@ class Command(BaseCommand):
 
     def _create_conversation(self, johndoe, other_user, index):
         """Create a single conversation with multiple messages."""
-        conv = Conversation.objects.create()
-        conv.participants.add(johndoe, other_user)
+        conv = Conversation.between(johndoe, other_user)
         opening, reply = MESSAGE_PAIRS[index % len(MESSAGE_PAIRS)]
-        Message.objects.create(
-            conversation=conv, sender=other_user,
-            content=opening, is_read=random.choice([True, False]),
-        )
+        Message.objects.create(conversation=conv, sender=other_user, content=opening)
         if random.random() < 0.8:
-            Message.objects.create(
-                conversation=conv, sender=johndoe, content=reply, is_read=True,
-            )
+            Message.objects.create(conversation=conv, sender=johndoe, content=reply)
         # Add extra back-and-forth messages for a more realistic conversation
         extra_messages = random.randint(0, 5)
         for _ in range(extra_messages):
@@ -847,8 +841,10 @@ class Command(BaseCommand):
             Message.objects.create(
                 conversation=conv, sender=sender,
                 content=fake.sentence(nb_words=random.randint(5, 14)),
-                is_read=random.choice([True, False]),
             )
+        # Leave about half of the conversations with unread replies for johndoe
+        if random.random() < 0.5:
+            ConversationMembership.mark_read(johndoe.pk, [conv.pk])
         return conv.messages.count()
 
     def _set_gamification_stats(self, users):
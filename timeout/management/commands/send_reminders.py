@@ -0,0 +1,48 @@
+"""
+send_reminders.py - Management command that fires due reminders from the ReminderSchedule table.
+
+Reminder rows are written when events are saved or subscribed to, so finding the due ones is a
+single indexed fire_at <= now query. Run it every minute from cron, or leave it running with
+--interval as the background runner.
+
+Usage:
+    python manage.py send_reminders
+    python manage.py send_reminders --interval 30   # keep running, firing every 30 seconds
+    python manage.py send_reminders --rebuild       # reschedule every event not yet due first
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from timeout.services.reminder_service import ReminderService
+
+
+class Command(BaseCommand):
+    """Management command to turn due reminders into notifications."""
+    help = "Fire due reminders from the reminder schedule"
+
+    def add_arguments(self, parser):
+        """Add the optional polling interval and rebuild flag."""
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep running and fire due reminders every N seconds.',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Rewrite the schedule of every event not yet due before firing.',
+        )
+
+    def handle(self, *args, **options):
+        """Fire due reminders once, or repeatedly when --interval is given."""
+        if options['rebuild']:
+            scanned = ReminderService.rebuild()
+            self.stdout.write(f"Rescheduled reminders for {scanned} events.")
+        while True:
+            sent = ReminderService.fire_due()
+            self.stdout.write(self.style.SUCCESS(f"Sent {sent} reminders."))
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
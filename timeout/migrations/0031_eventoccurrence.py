@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:52
+
+import calendar as cal
+import django.db.models.deletion
+from django.conf import settings
+from datetime import date, datetime, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# Frozen copy of the series expansion in timeout.services.recurrence as of this
+# migration, so later changes to the service do not change what it writes.
+STEP_DAYS = {'daily': 1, 'weekly': 7}
+
+
+def _nth_occurrence(anchor, recurrence, n):
+    """Return the date of the n-th occurrence of a series (the anchor is n=0)."""
+    if recurrence == 'monthly':
+        month_index = anchor.month - 1 + n
+        year_num, month_num = anchor.year + month_index // 12, month_index % 12 + 1
+        return date(year_num, month_num, min(anchor.day, cal.monthrange(year_num, month_num)[1]))
+    return anchor + timedelta(days=STEP_DAYS[recurrence] * n)
+
+
+def expand_event(event, last):
+    """Yield (start_dt, end_dt) for every occurrence of event from its start up to the date last."""
+    yield event.start_datetime, event.end_datetime
+    if event.recurrence not in ('daily', 'weekly', 'monthly'):
+        return
+    anchor = event.start_datetime.date()
+    duration = event.end_datetime - event.start_datetime
+    n = 1
+    current = _nth_occurrence(anchor, event.recurrence, n)
+    while current <= last:
+        start_dt = timezone.make_aware(datetime.combine(current, event.start_datetime.time()))
+        yield start_dt, start_dt + duration
+        n += 1
+        current = _nth_occurrence(anchor, event.recurrence, n)
+
+
+def backfill_occurrences(apps, schema_editor):
+    """Materialise occurrences for events that existed before the table."""
+    Event = apps.get_model('timeout', 'Event')
+    EventOccurrence = apps.get_model('timeout', 'EventOccurrence')
+    horizon = timezone.now().date() + timedelta(days=400)
+    batch = []
+    for event in Event.objects.iterator(chunk_size=500):
+        batch.extend(
+            EventOccurrence(event_id=event.id, creator_id=event.creator_id,
+                            occurrence_start=start_dt, occurrence_end=end_dt)
+            for start_dt, end_dt in expand_event(event, horizon)
+        )
+        if len(batch) >= 500:
+            EventOccurrence.objects.bulk_create(batch)
+            batch = []
+    EventOccurrence.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0030_remove_user_daily_study_reminder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurrence_start', models.DateTimeField()),
+                ('occurrence_end', models.DateTimeField()),
+                ('creator', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='event_occurrences', to=settings.AUTH_USER_MODEL)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='timeout.event')),
+            ],
+            options={
+                'ordering': ['occurrence_start'],
+                'indexes': [models.Index(fields=['creator', 'occurrence_start'], name='timeout_occ_creator_idx')],
+                'unique_together': {('event', 'occurrence_start')},
+            },
+        ),
+        migrations.RunPython(backfill_occurrences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0031_eventoccurrence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='calendar_token',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['creator', 'updated_at'], name='timeout_eve_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0032_calendar_feed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['creator', 'title', 'start_datetime'], name='timeout_eve_dedup_idx'),
+        ),
+    ]
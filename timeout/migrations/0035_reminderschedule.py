@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0034_eventsubscription'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('week', '1 week'), ('day', '1 day'), ('hour', '1 hour')], max_length=10)),
+                ('fire_at', models.DateTimeField()),
+                ('due_at', models.DateTimeField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='timeout.event')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['fire_at'], name='timeout_reminder_fire_idx')],
+                'unique_together': {('user', 'event', 'kind')},
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:41
+
+from django.db import migrations, models
+
+# Endings of the reminder messages written before reminder_kind existed.
+KIND_SUFFIXES = (
+    ('hour', ('1 hour left to complete your deadline!', 'starts in 1 hour!')),
+    ('day', ('1 day left to complete your deadline!', 'starts tomorrow!')),
+    ('week', ('1 week left to complete your deadline!', 'is coming up this week!')),
+)
+
+
+def backfill_reminder_kind(apps, schema_editor):
+    """Tag existing reminders with their kind, keeping only the oldest of each (user, event, kind) tagged."""
+    Notification = apps.get_model('timeout', 'Notification')
+    for kind, suffixes in KIND_SUFFIXES:
+        seen = set()
+        rows = Notification.objects.filter(deadline__isnull=False).order_by('created_at', 'pk')
+        for pk, user_id, deadline_id, message in rows.values_list('pk', 'user_id', 'deadline_id', 'message').iterator():
+            key = (user_id, deadline_id)
+            if message.endswith(suffixes) and key not in seen:
+                seen.add(key)
+                Notification.objects.filter(pk=pk).update(reminder_kind=kind)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0035_reminderschedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='reminder_kind',
+            field=models.CharField(blank=True, choices=[('week', '1 week'), ('day', '1 day'), ('hour', '1 hour')], max_length=10, null=True),
+        ),
+        migrations.RunPython(backfill_reminder_kind, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('reminder_kind__isnull', False)), fields=('user', 'deadline', 'reminder_kind'), name='timeout_notification_reminder_once'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0036_notification_reminder_kind'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserCounters',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counters', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread_notifications', models.PositiveIntegerField(default=0)),
+                ('unread_messages', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
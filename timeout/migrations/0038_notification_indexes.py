@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0037_usercounters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_dismissed', False)), fields=['user', 'id'], name='timeout_notif_poll_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_dismissed', False)), fields=['user', '-created_at'], name='timeout_notif_list_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_dismissed', False), ('is_read', False)), fields=['user', '-created_at'], name='timeout_notif_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', True), ('is_dismissed', True), _connector='OR'), fields=['created_at'], name='timeout_notif_retention_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0038_notification_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='actor_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='recent_actors',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='verb',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_dismissed', False), ('is_read', False), ('verb__isnull', False)), fields=['user', 'post', 'verb'], name='timeout_notif_fold_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0039_notification_aggregation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor_name', models.CharField(max_length=150)),
+                ('type', models.CharField(choices=[('deadline', 'Deadline'), ('event', 'Event'), ('message', 'Message'), ('like', 'Like'), ('comment', 'Comment'), ('bookmark', 'Bookmark'), ('follow', 'Follow'), ('exam', 'Exam'), ('class', 'Class'), ('meeting', 'Meeting'), ('study_session', 'Study Session')], max_length=20)),
+                ('verb', models.CharField(max_length=20)),
+                ('title', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('actor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_activity', to='timeout.post')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_activity', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
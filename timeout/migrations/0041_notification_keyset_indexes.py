@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0040_pendingactivity'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='timeout_notif_list_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='timeout_notif_unread_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_dismissed', False)), fields=['user', '-created_at', '-id'], name='timeout_notif_list_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_dismissed', False), ('is_read', False)), fields=['user', '-created_at', '-id'], name='timeout_notif_unread_idx'),
+        ),
+    ]
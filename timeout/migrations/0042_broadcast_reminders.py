@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0041_notification_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reminderschedule',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
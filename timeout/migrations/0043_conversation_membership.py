@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Max, Min
+
+
+def backfill(apps, schema_editor):
+    """Fill last_message, message_count and each participant's read cursor from the is_read flags."""
+    Conversation = apps.get_model('timeout', 'Conversation')
+    ConversationMembership = apps.get_model('timeout', 'ConversationMembership')
+    Message = apps.get_model('timeout', 'Message')
+    for conversation in Conversation.objects.annotate(last=Max('messages__id'), total=Count('messages')):
+        Conversation.objects.filter(pk=conversation.pk).update(
+            last_message_id=conversation.last, message_count=conversation.total)
+    for membership in ConversationMembership.objects.all():
+        messages = Message.objects.filter(conversation_id=membership.conversation_id)
+        first_unread = messages.filter(is_read=False).exclude(
+            sender_id=membership.user_id).aggregate(first=Min('id'))['first']
+        read = messages.filter(id__lt=first_unread) if first_unread else messages
+        stats = read.aggregate(last=Max('id'), total=Count('id'))
+        membership.last_read_message_id = stats['last'] or 0
+        membership.read_count = stats['total']
+        membership.save(update_fields=['last_read_message_id', 'read_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0042_broadcast_reminders'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Conversation.participants keeps its table; the through model only takes it over.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ConversationMembership',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='timeout.conversation')),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversation_memberships', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'timeout_conversation_participants',
+                        'unique_together': {('conversation', 'user')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='conversation',
+                    name='participants',
+                    field=models.ManyToManyField(related_name='conversations', through='timeout.ConversationMembership', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[],
+        ),
+        migrations.AddField(
+            model_name='conversationmembership',
+            name='last_read_message_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='conversationmembership',
+            name='read_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='timeout.message'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='message',
+            name='is_read',
+        ),
+    ]
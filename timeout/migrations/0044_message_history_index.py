@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0043_conversation_membership'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', '-created_at', '-id'], name='timeout_msg_history_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:41
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    """Key each two-person conversation by its pair; where a pair has several, the most recent keeps the key."""
+    Conversation = apps.get_model('timeout', 'Conversation')
+    ConversationMembership = apps.get_model('timeout', 'ConversationMembership')
+    members = {}
+    for conversation_id, user_id in ConversationMembership.objects.values_list('conversation_id', 'user_id'):
+        members.setdefault(conversation_id, []).append(user_id)
+    seen = set()
+    for conversation_id in Conversation.objects.order_by('-updated_at', '-id').values_list('id', flat=True):
+        users = members.get(conversation_id, [])
+        if len(users) != 2:
+            continue
+        low, high = sorted(users)
+        key = f'{low}:{high}'
+        if key not in seen:
+            seen.add(key)
+            Conversation.objects.filter(pk=conversation_id).update(pair_key=key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0044_message_history_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='pair_key',
+            field=models.CharField(blank=True, editable=False, max_length=41, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_POSTS = 100
+
+
+def backfill(apps, schema_editor):
+    """Deliver each active author's latest posts to them and their followers."""
+    User = apps.get_model('timeout', 'User')
+    Post = apps.get_model('timeout', 'Post')
+    TimelineEntry = apps.get_model('timeout', 'TimelineEntry')
+    Follow = User.following.through
+    for author_id in Post.objects.filter(author__is_banned=False).values_list('author_id', flat=True).order_by().distinct():
+        posts = list(Post.objects.filter(author_id=author_id).order_by('-created_at')
+                     .values_list('pk', 'created_at')[:BACKFILL_POSTS])
+        owners = [author_id] + list(Follow.objects.filter(to_user_id=author_id).values_list('from_user_id', flat=True))
+        TimelineEntry.objects.bulk_create(
+            [TimelineEntry(owner_id=owner_id, post_id=pk, author_id=author_id, created_at=created_at)
+             for owner_id in owners for pk, created_at in posts],
+            batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0045_conversation_pair_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='timeout.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', '-created_at', '-post'], name='timeout_timeline_read_idx'), models.Index(fields=['owner', 'author'], name='timeout_timeline_prune_idx')],
+                'unique_together': {('owner', 'post')},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:16
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill(apps, schema_editor):
+    """Count each post's existing likes, comments and bookmarks."""
+    Post = apps.get_model('timeout', 'Post')
+
+    def count(model_name):
+        """Return a subquery counting the model's rows on the outer post."""
+        model = apps.get_model('timeout', model_name)
+        return Coalesce(Subquery(
+            model.objects.filter(post=OuterRef('pk')).order_by().values('post')
+            .annotate(n=Count('pk')).values('n')), 0)
+
+    Post.objects.update(like_count=count('Like'), comment_count=count('Comment'), bookmark_count=count('Bookmark'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0046_timeline_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='bookmark_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
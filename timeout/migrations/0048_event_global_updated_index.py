@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0047_post_interaction_counts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_global', True)), fields=['updated_at', 'creator'], name='timeout_eve_global_upd_idx'),
+        ),
+    ]
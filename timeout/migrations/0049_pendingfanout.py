@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0048_event_global_updated_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingFanout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('after_follower_id', models.BigIntegerField(default=0)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_fanouts', to='timeout.post')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:40
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_reminder_due_at(apps, schema_editor):
+    """Date existing reminders at their event's first due time: a deadline's end, otherwise its start."""
+    Event = apps.get_model('timeout', 'Event')
+    Notification = apps.get_model('timeout', 'Notification')
+    events = Event.objects.filter(pk=OuterRef('deadline_id'))
+    reminders = Notification.objects.filter(reminder_kind__isnull=False)
+    reminders.filter(deadline__event_type='deadline').update(
+        reminder_due_at=Subquery(events.values('end_datetime')[:1]))
+    reminders.exclude(deadline__event_type='deadline').update(
+        reminder_due_at=Subquery(events.values('start_datetime')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeout', '0049_pendingfanout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='reminder_due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_reminder_due_at, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='notification',
+            name='timeout_notification_reminder_once',
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('reminder_kind__isnull', False)), fields=('user', 'deadline', 'reminder_kind', 'reminder_due_at'), name='timeout_notification_reminder_once'),
+        ),
+    ]
@@ -1,18 +1,26 @@
 from .user import User
 from .event import Event
+from .event_occurrence import EventOccurrence
+from .event_subscription import EventSubscription
+from .reminder_schedule import ReminderSchedule
 from .post import Post
 from .comment import Comment
 from .like import Like
 from .bookmark import Bookmark
 from .note import Note
 from .message import Message, Conversation
+from .conversation_membership import ConversationMembership
 from .focus_session import FocusSession
 from .study_log import StudyLog
 from .follow_request import FollowRequest
 from .post_flag import PostFlag
 from timeout.models.block import Block
 from .dismissed_alert import DismissedAlert
+from .user_counters import UserCounters
+from .pending_activity import PendingActivity
+from .pending_fanout import PendingFanout
+from .timeline_entry import TimelineEntry
 
 
 
-__all__ = ['User', 'Event', 'Post', 'Comment', 'Like', 'Bookmark', 'Conversation', 'Message', 'Note', 'FocusSession', 'StudyLog', 'FollowRequest', 'PostFlag', 'Block', 'DismissedAlert']
+__all__ = ['User', 'Event', 'EventOccurrence', 'EventSubscription', 'ReminderSchedule', 'Post', 'Comment', 'Like', 'Bookmark', 'Conversation', 'ConversationMembership', 'Message', 'Note', 'FocusSession', 'StudyLog', 'FollowRequest', 'PostFlag', 'Block', 'DismissedAlert', 'UserCounters', 'PendingActivity', 'PendingFanout', 'TimelineEntry']
@@ -70,20 +70,19 @@ class Comment(TimestampMixin, OwnedMixin, models.Model):
 def create_comment_notification(sender, instance, created, **kwargs):
     """Automatically create notifications when a comment is created.
     - Only creates a notification when a new comment is created 
-    - Notifies the post author if someone else comments on their post"""
+    - Notifies the post author if someone else comments on their post
+    - Comments and replies on the same post fold into one notification each,
+      written after the transaction commits"""
     if created:
-        if instance.post.author != instance.author:
-            Notification.objects.create(
-                user=instance.post.author,
-                title=f"💬 {instance.author.username} commented on your post",
-                message=instance.content[:80],
-                type=Notification.Type.COMMENT,
-                post=instance.post)
+        from timeout.services.notification_service import NotificationService
 
-        if instance.parent and instance.parent.author != instance.author:
-            Notification.objects.create(
-                user=instance.parent.author,
-                title=f"💬 {instance.author.username} replied to your comment",
-                message=instance.content[:80],
-                type=Notification.Type.COMMENT,
-                post=instance.post)
+        NotificationService.notify_post_activity(
+            instance.post.author_id, instance.post_id, instance.author, Notification.Type.COMMENT, 'commented',
+            title="💬 {actors} commented on your post",
+            message=instance.content[:80])
+
+        if instance.parent:
+            NotificationService.notify_post_activity(
+                instance.parent.author_id, instance.post_id, instance.author, Notification.Type.COMMENT, 'replied',
+                title="💬 {actors} replied to your comment",
+                message=instance.content[:80])
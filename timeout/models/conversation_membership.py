@@ -0,0 +1,100 @@
+"""
+conversation_membership.py - Defines the ConversationMembership model, the participants table of a
+conversation holding each participant's read cursor, so unread state is a comparison of two ids
+instead of a flag on every message.
+"""
+
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F, FilteredRelation, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
+
+
+class ConversationMembership(models.Model):
+    """
+    Model representing one participant of a conversation.
+
+    last_read_message_id is the id of the newest message the participant has
+    read; ids only grow, so every message above it is unread. read_count is
+    the conversation's message_count at that point, so the number of unread
+    messages is message_count - read_count without counting any rows. Sending
+    a message moves the sender's cursor to it.
+    """
+
+    conversation = models.ForeignKey(
+        'timeout.Conversation',
+        on_delete=models.CASCADE,
+        related_name='memberships',
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='conversation_memberships',
+    )
+    # A plain id rather than a foreign key: deleting the message must not reset the cursor.
+    last_read_message_id = models.BigIntegerField(default=0)
+    read_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        """
+        Metadata for the ConversationMembership model:
+        - Keeps the table created for Conversation.participants
+        - Ensures a user joins a conversation once
+        """
+
+        db_table = 'timeout_conversation_participants'
+        unique_together = ('conversation', 'user')
+
+    def __str__(self):
+        """Return a string representation with the user, conversation and cursor."""
+        return f'{self.user_id} in {self.conversation_id}, read up to {self.last_read_message_id}'
+
+    @classmethod
+    def unread_expression(cls, read_count='read_count'):
+        """Return the expression counting a membership's unread messages."""
+        return Greatest(F('conversation__message_count') - F(read_count), 0)
+
+    @classmethod
+    def mark_read(cls, user_id, conversation_ids=None):
+        """Move the user's cursors to the last message of the given conversations (all when None).
+        Returns the number of messages that were unread; the user's counter drops by as much."""
+        from timeout.models.message import Conversation
+        from timeout.models.user_counters import UserCounters
+
+        memberships = cls.objects.filter(user_id=user_id)
+        if conversation_ids is not None:
+            memberships = memberships.filter(conversation_id__in=conversation_ids)
+        conversation = Conversation.objects.filter(pk=OuterRef('conversation_id'))
+        with transaction.atomic():
+            unread = memberships.filter(read_count__lt=F('conversation__message_count')).aggregate(
+                n=Sum(cls.unread_expression()))['n'] or 0
+            memberships.update(
+                last_read_message_id=Coalesce(Subquery(conversation.values('last_message_id')[:1]), 0),
+                read_count=Subquery(conversation.values('message_count')[:1]),
+            )
+            UserCounters.adjust(user_id, messages=-unread)
+        return unread
+
+    @classmethod
+    def inbox(cls, user, limit=None):
+        """Return the user's conversations, most recently active first, as dicts with the
+        conversation, the other participant, the last message and the unread count.
+
+        One query however long the threads are: it reads the other participant's
+        membership rows and joins the user's own row for the read cursor.
+        """
+        rows = cls.objects.annotate(
+            mine=FilteredRelation('conversation__memberships',
+                                  condition=Q(conversation__memberships__user=user)),
+        ).filter(mine__user=user).exclude(user=user).annotate(
+            unread=cls.unread_expression('mine__read_count'),
+        ).select_related('user', 'conversation__last_message').order_by('-conversation__updated_at')
+        if limit:
+            rows = rows[:limit]
+        return [{
+            'conv': row.conversation,
+            'other': row.user,
+            'last': row.conversation.last_message,
+            'unread_count': row.unread,
+        } for row in rows]
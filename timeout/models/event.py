@@ -108,6 +108,9 @@ class Event(TimestampMixin, models.Model):
          Metadata for the Event model:
          - Orders events by most recent start time first
          - Adds indexes to optimise queries by creator and start time
+         - Adds an index so the newest update per creator is an index lookup
+         - Adds an index so the newest update among global events is an index lookup
+         - Adds an index for duplicate checks on (creator, title, start time)
          """
 
          ordering = ['-start_datetime']
@@ -120,29 +123,109 @@ class Event(TimestampMixin, models.Model):
                 fields=['start_datetime'],
                 name='timeout_eve_start_idx'
             ),
+            models.Index(
+                fields=['creator', 'updated_at'],
+                name='timeout_eve_updated_idx'
+            ),
+            models.Index(
+                fields=['updated_at', 'creator'],
+                name='timeout_eve_global_upd_idx',
+                condition=models.Q(is_global=True),
+            ),
+            models.Index(
+                fields=['creator', 'title', 'start_datetime'],
+                name='timeout_eve_dedup_idx'
+            ),
          ]
 
+    EXCLUSIVE_TYPES = (EventType.EXAM, EventType.STUDY_SESSION)
+    BLOCKING_TYPES = (EventType.EXAM, EventType.CLASS, EventType.MEETING, EventType.STUDY_SESSION)
+
     def clean(self):
         """Prevent overlapping events for the same user unless allowed.
-        - Ensures end time is after start time and prevents overlapping  for certain events"""
+        - Ensures end time is after start time and prevents overlapping  for certain events
+        - Exams and study sessions may not overlap another timed exam, class, meeting or study session
+        - Batch writers can set busy_index to a prebuilt IntervalIndex to avoid a query per event"""
         if self.start_datetime >= self.end_datetime:
             raise ValidationError("End time must be after start time.")
         
         if self.status == self.EventStatus.CANCELLED:
             return
 
+        if self.event_type in self.EXCLUSIVE_TYPES and not self.is_all_day and self.creator_id:
+            if self._busy_index().overlaps(self.start_datetime, self.end_datetime):
+                raise ValidationError(
+                    f"This {self.get_event_type_display().lower()} overlaps another event in your calendar.")
+
+    def _busy_index(self):
+        """Return the interval index used for the overlap check."""
+        index = getattr(self, 'busy_index', None)
+        if index is None:
+            from timeout.services.interval_index import IntervalIndex
+            index = IntervalIndex.for_user(
+                self.creator, self.start_datetime, self.end_datetime,
+                exclude_ids=[self.pk] if self.pk else (), event_types=self.BLOCKING_TYPES)
+        return index
+
+    POST_FIELDS = ('title', 'description', 'start_datetime', 'visibility', 'creator_id')
+    TRACKED_FIELDS = POST_FIELDS + ('end_datetime', 'recurrence', 'is_global', 'event_type')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Load the instance and remember the tracked values it was loaded with."""
+        instance = super().from_db(db, field_names, values)
+        instance._remember_post_fields()
+        return instance
+
+    def _remember_post_fields(self, update_fields=None):
+        """Snapshot the fields mirrored into the social post, the occurrence table or the reminder schedule.
+        After a save with update_fields only those fields are re-snapshotted, so unsaved edits stay dirty."""
+        if update_fields is None:
+            self._loaded_values = {
+                f: self.__dict__[f] for f in self.TRACKED_FIELDS if f in self.__dict__}
+            return
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return
+        names = {'creator_id' if f == 'creator' else f for f in update_fields}
+        loaded.update({f: self.__dict__[f] for f in self.TRACKED_FIELDS if f in names and f in self.__dict__})
+
+    def changed_fields(self):
+        """Return the tracked fields that differ from the values they were loaded with."""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return set(self.TRACKED_FIELDS)
+        return {f for f in self.TRACKED_FIELDS if f not in loaded or loaded[f] != getattr(self, f)}
+
+    def _needs_post_sync(self, adding, update_fields):
+        """Decide whether a save has to touch the mirrored post at all."""
+        if update_fields is not None:
+            names = {'creator_id' if f == 'creator' else f for f in update_fields}
+            if not names & set(self.POST_FIELDS):
+                return False
+        if adding:
+            return self.visibility == self.Visibility.PUBLIC and self.creator_id is not None
+        return bool(self.changed_fields() & set(self.POST_FIELDS))
+
     def save(self, *args, **kwargs):
         """Save the event and synchronise it with a social post.
         - PUBLIC events create or update a corresponding post
-        - PRIVATE events do not create or update posts"""
+        - PRIVATE events do not create or update posts
+        - the post is only touched when a mirrored field changed"""
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        sync = self._needs_post_sync(adding, update_fields)
         super().save(*args, **kwargs)
-        from .post import Post 
+        if sync:
+            self.sync_post(adding)
+        self._remember_post_fields(update_fields)
+
+    def sync_post(self, adding=False):
+        """Create, update or delete the social post mirroring this event."""
+        from .post import Post
         if self.visibility == self.Visibility.PUBLIC and self.creator:
-            existing_post = self.posts.first()
-            post_content = (
-                f"📅 {self.title}\n\n"
-                f"{self.description}\n\n"
-                f"🕒 {self.start_datetime:%d %b %Y %H:%M}")
+            existing_post = None if adding else self.posts.first()
+            post_content = self.post_content()
             if existing_post: # Update existing post
                 existing_post.content = post_content
                 existing_post.save()
@@ -152,9 +235,16 @@ class Event(TimestampMixin, models.Model):
                     content=post_content,
                     event=self,
                     privacy=Post.Privacy.PUBLIC)
-        else: 
+        elif not adding:
             self.posts.all().delete()
 
+    def post_content(self):
+        """Return the text of the social post mirroring this event."""
+        return (
+            f"📅 {self.title}\n\n"
+            f"{self.description}\n\n"
+            f"🕒 {self.start_datetime:%d %b %Y %H:%M}")
+
     def delete(self, *args, **kwargs):
         """" Delete event. """
         self.posts.all().delete()
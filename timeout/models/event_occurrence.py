@@ -0,0 +1,55 @@
+"""
+event_occurrence.py - Defines the EventOccurrence model, a materialised row per occurrence of a
+calendar event, so that recurring series can be queried by date range with an index.
+"""
+
+
+from django.conf import settings
+from django.db import models
+from timeout.models.event import Event
+
+
+class EventOccurrence(models.Model):
+    """
+    Model representing a single occurrence of an Event.
+
+    One-off events have exactly one occurrence. Recurring events have one row per
+    repeat up to a rolling horizon that is extended by the extend_occurrences command.
+    The creator is copied from the event so per-user range queries avoid a join.
+    """
+
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='occurrences',
+    )
+    creator = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='event_occurrences',
+        null=True,
+        blank=True,
+    )
+    occurrence_start = models.DateTimeField()
+    occurrence_end = models.DateTimeField()
+
+    class Meta:
+        """
+        Metadata for the EventOccurrence model:
+        - Orders occurrences chronologically
+        - Ensures an event has at most one occurrence per start time
+        - Adds an index for per-user date range queries
+        """
+
+        ordering = ['occurrence_start']
+        unique_together = ('event', 'occurrence_start')
+        indexes = [
+            models.Index(
+                fields=['creator', 'occurrence_start'],
+                name='timeout_occ_creator_idx'
+            ),
+        ]
+
+    def __str__(self):
+        """Return a string representation with the event id and occurrence start."""
+        return f'Occurrence of {self.event_id} at {self.occurrence_start:%Y-%m-%d %H:%M}'
@@ -0,0 +1,59 @@
+"""
+event_subscription.py - Defines the EventSubscription model linking a user to another user's public
+event, so the event appears in the subscriber's calendar without copying it.
+"""
+
+
+from django.conf import settings
+from django.db import models
+from timeout.models.event import Event
+from timeout.models.mixins import CreatedAtMixin
+
+
+class EventSubscription(CreatedAtMixin, models.Model):
+    """
+    Model representing a user's subscription to a public event.
+
+    A popular event is stored once, with one thin link row per subscriber. The
+    subscriber's calendar, deadlines and notifications read the source event
+    through the link, so edits to it reach every subscriber immediately. While
+    the owner keeps the event private the link is kept but hidden, and the
+    event comes back if it is made public again.
+
+    The unique (user, event) constraint doubles as the index used to look up a
+    user's subscribed event ids.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='event_subscriptions',
+    )
+    event = models.ForeignKey(
+        'timeout.Event',
+        on_delete=models.CASCADE,
+        related_name='subscriptions',
+    )
+
+    class Meta:
+        """
+        Metadata for the EventSubscription model:
+        - Ensures a user subscribes to an event once
+        - The (user, event) unique index serves the lookup of a user's subscribed event ids
+        - The event foreign key index serves the lookup of an event's subscribers
+        """
+
+        unique_together = ('user', 'event')
+
+    @classmethod
+    def live(cls):
+        """Return the subscriptions whose event is still public."""
+        return cls.objects.filter(event__visibility=Event.Visibility.PUBLIC)
+
+    @classmethod
+    def event_ids(cls, user):
+        """Return a subquery of the ids of public events the user is subscribed to."""
+        return cls.live().filter(user=user).values('event_id')
+
+    def __str__(self):
+        """Return a string representation with the user and event ids."""
+        return f'{self.user_id} subscribed to {self.event_id}'
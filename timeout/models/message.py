@@ -4,8 +4,11 @@ message.py - Defines the Conversation and Message models for user messaging func
 
 
 from django.conf import settings
-from django.db import models
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+from django.db.models import Q
 from timeout.models.mixins import TimestampMixin, CreatedAtMixin
+from timeout.utils import decode_cursor, encode_cursor
 
 
 
@@ -15,12 +18,34 @@ class Conversation(TimestampMixin, models.Model):
 
     Each conversation has multiple participants and tracks timestamps for
     creation and last update. The most recently updated conversations are ordered first.
+    last_message and message_count are kept in step by the message signals,
+    so listing conversations never touches their messages. Direct
+    conversations carry a pair_key of their two sorted user ids, unique so a
+    pair has a single conversation that is found through one indexed lookup.
     """
 
     participants = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
         related_name='conversations',
+        through='timeout.ConversationMembership',
     )
+    last_message = models.ForeignKey(
+        'Message',
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+    )
+    message_count = models.PositiveIntegerField(default=0)
+    pair_key = models.CharField(
+        max_length=41,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    HISTORY_PAGE_SIZE = 50
 
     class Meta:
         """
@@ -34,21 +59,63 @@ class Conversation(TimestampMixin, models.Model):
         """Return a string representation with the conversation ID."""
         return f'Conversation {self.id}'
 
+    @staticmethod
+    def make_pair_key(user_a_id, user_b_id):
+        """Return the canonical key of a pair of users, the same whichever order they come in."""
+        low, high = sorted((user_a_id, user_b_id))
+        return f'{low}:{high}'
+
+    @classmethod
+    def between(cls, user_a, user_b):
+        """Return the direct conversation between two users, creating it on first use.
+
+        The unique pair_key makes this a single indexed get-or-create: of two
+        concurrent first messages, one inserts and the other fetches its row.
+        """
+        with transaction.atomic():
+            conversation, created = cls.objects.get_or_create(
+                pair_key=cls.make_pair_key(user_a.pk, user_b.pk))
+            if created:
+                conversation.participants.add(user_a, user_b)
+        return conversation
+
     def get_other_participant(self, user):
-        """Return the other user in the conversation."""
+        """Return the other user in the conversation, read from the pair key when there is one."""
+        if self.pair_key:
+            other_ids = [int(pk) for pk in self.pair_key.split(':') if int(pk) != user.id]
+            return get_user_model().objects.filter(pk__in=other_ids).first()
         return self.participants.exclude(id=user.id).first()
 
     def get_last_message(self):
         """Return the most recent message."""
         return self.messages.order_by('-created_at', '-pk').first()
 
+    def history(self, cursor=None, page_size=None):
+        """Return (messages, older_cursor) for one page of the thread, oldest message first.
+
+        Pages backwards from the newest message with keyset pagination on
+        (created_at, id), so opening a long thread or loading an old page is
+        one index range scan of page_size + 1 rows. older_cursor points below
+        the page's oldest message and is None once the start of the thread is reached.
+        """
+        page_size = page_size or self.HISTORY_PAGE_SIZE
+        messages = self.messages.all()
+        position = decode_cursor(cursor)
+        if position:
+            created_at, pk = position
+            messages = messages.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+        rows = list(messages.select_related('sender').order_by('-created_at', '-id')[:page_size + 1])
+        older = encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size][::-1], older
+
 
 class Message(CreatedAtMixin, models.Model):
     """
     Model representing a single message within a conversation.
 
     Each message is associated with a conversation and a sender, and
-    tracks when it was created and whether it has been read.
+    tracks when it was created. Whether it has been read is given by each
+    participant's ConversationMembership cursor.
     """
 
     # The conversation this message belongs to
@@ -68,15 +135,20 @@ class Message(CreatedAtMixin, models.Model):
     # The content of the message, with a 2000 character limit
     content = models.TextField(max_length=2000)
 
-    is_read = models.BooleanField(default=False)
-
     class Meta:
         """
         Metadata for the Message model:
         - Orders messages by creation time (oldest first)
+        - Indexes each thread newest first for history pages
         """
 
         ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['conversation', '-created_at', '-id'],
+                name='timeout_msg_history_idx',
+            ),
+        ]
 
     def __str__(self):
         """Return a string representation with sender and first 30 chars of content."""
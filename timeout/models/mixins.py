@@ -47,14 +47,12 @@ class OwnedMixin(models.Model):
 
 
 def notify_post_action(instance, emoji, notification_type, verb):
-    """Create a notification when a user performs an action on a post (like, bookmark, etc.)."""
-    from timeout.models.notification import Notification
-
-    if instance.post.author != instance.user:
-        Notification.objects.create(
-            user=instance.post.author,
-            title=f"{emoji} New {notification_type.label}",
-            message=f"{instance.user.username} {verb} your post",
-            type=notification_type,
-            post=instance.post,
-        )
+    """Notify the post's author when a user performs an action on a post (like, bookmark, etc.).
+    The notification is written after commit, and repeated actions on the same post fold into one."""
+    from timeout.services.notification_service import NotificationService
+
+    NotificationService.notify_post_activity(
+        instance.post.author_id, instance.post_id, instance.user, notification_type, verb,
+        title=f"{emoji} New {notification_type.label}",
+        message=f"{{actors}} {verb} your post",
+    )
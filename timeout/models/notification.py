@@ -7,6 +7,7 @@ deadlines, events, messages, likes, comments, bookmarks, follows, exams, classes
 from django.conf import settings
 from django.db import models
 from timeout.models.mixins import CreatedAtMixin
+from timeout.models.reminder_schedule import ReminderSchedule
 
 
 class Notification(CreatedAtMixin, models.Model):
@@ -14,7 +15,11 @@ class Notification(CreatedAtMixin, models.Model):
     Represents a user notification for various activities.
 
     Notifications can relate to events, posts, messages, or social interactions.
-    Each notification tracks read/deleted status.
+    Each notification tracks read/deleted status. Deadline and event reminders
+    also record which reminder (week, day or hour) they are and the due time
+    (deadline end or occurrence start) they are for. Likes, bookmarks
+    and comments on a post are folded into one row per verb, counting the
+    actors and keeping the names of the most recent ones.
     """
 
     class Type(models.TextChoices):
@@ -65,6 +70,16 @@ class Notification(CreatedAtMixin, models.Model):
         on_delete=models.CASCADE,
         related_name="notifications"
     )
+    reminder_kind = models.CharField(
+        max_length=10,
+        choices=ReminderSchedule.Kind.choices,
+        null=True,
+        blank=True,
+    )
+    reminder_due_at = models.DateTimeField(null=True, blank=True)
+    verb = models.CharField(max_length=20, null=True, blank=True)
+    actor_count = models.PositiveIntegerField(default=1)
+    recent_actors = models.JSONField(default=list, blank=True)
     sender = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -74,9 +89,54 @@ class Notification(CreatedAtMixin, models.Model):
     )
 
     class Meta:
-        """Order notifications by most recent first."""
+        """
+        Metadata for the Notification model:
+        - Orders notifications by most recent first
+        - Allows one week, day or hour reminder per user, event and due time,
+          so batch writers can insert with ignore_conflicts instead of checking
+          first, and each occurrence of a recurring event gets its own
+        - Adds partial indexes over the undismissed rows matching the poll
+          (user, id > last_id) and the keyset-paginated notifications page
+          (user, newest (created_at, id) first, optionally unread only), plus
+          one over read or dismissed rows for the retention purge, and one
+          finding the unread row a post activity folds into
+        """
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['user', 'id'],
+                condition=models.Q(is_dismissed=False),
+                name='timeout_notif_poll_idx',
+            ),
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                condition=models.Q(is_dismissed=False),
+                name='timeout_notif_list_idx',
+            ),
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                condition=models.Q(is_dismissed=False, is_read=False),
+                name='timeout_notif_unread_idx',
+            ),
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(is_read=True) | models.Q(is_dismissed=True),
+                name='timeout_notif_retention_idx',
+            ),
+            models.Index(
+                fields=['user', 'post', 'verb'],
+                condition=models.Q(verb__isnull=False, is_read=False, is_dismissed=False),
+                name='timeout_notif_fold_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'deadline', 'reminder_kind', 'reminder_due_at'],
+                condition=models.Q(reminder_kind__isnull=False),
+                name='timeout_notification_reminder_once',
+            ),
+        ]
 
     def __str__(self):
         """Return a string representation with user and notification title."""
-        return f"Notification for {self.user.username}: {self.title}"
\ No newline at end of file
+        return f"Notification for {self.user.username}: {self.title}"
\ No newline at end of file
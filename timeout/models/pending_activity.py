@@ -0,0 +1,45 @@
+"""
+pending_activity.py - Defines the PendingActivity model, a queue of post activity (likes, bookmarks,
+comments) waiting to be folded into notifications by the flush_activity runner.
+"""
+
+
+from django.conf import settings
+from django.db import models
+from timeout.models.mixins import CreatedAtMixin
+from timeout.models.notification import Notification
+
+
+class PendingActivity(CreatedAtMixin, models.Model):
+    """
+    Model representing one queued post activity for a recipient.
+
+    Only used when settings.NOTIFICATION_FANOUT is 'queue': interaction
+    endpoints then write these rows in one insert after commit and return,
+    and the flush_activity runner turns them into notifications in batches.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='pending_activity',
+    )
+    post = models.ForeignKey(
+        'timeout.Post',
+        on_delete=models.CASCADE,
+        related_name='pending_activity',
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    actor_name = models.CharField(max_length=150)
+    type = models.CharField(max_length=20, choices=Notification.Type.choices)
+    verb = models.CharField(max_length=20)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+
+    def __str__(self):
+        """Return a string representation with the actor, verb and post."""
+        return f'{self.actor_name} {self.verb} post {self.post_id}'
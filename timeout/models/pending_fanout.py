@@ -0,0 +1,31 @@
+"""
+pending_fanout.py - Defines the PendingFanout model, the outbox of posts still being delivered to
+their authors' followers by the fan_out_timelines runner.
+"""
+
+
+from django.db import models
+from timeout.models.mixins import CreatedAtMixin
+
+
+class PendingFanout(CreatedAtMixin, models.Model):
+    """
+    Model representing a post whose timeline fan-out is not finished.
+
+    Creating a post writes the author's and the first FANOUT_CHUNK followers'
+    timeline rows in the request and queues one of these rows for the rest.
+    The fan_out_timelines runner delivers the remaining followers in chunks,
+    moving after_follower_id past each chunk, and deletes the row once every
+    follower has the post.
+    """
+
+    post = models.ForeignKey(
+        'timeout.Post',
+        on_delete=models.CASCADE,
+        related_name='pending_fanouts',
+    )
+    after_follower_id = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        """Return a string representation with the post and the follower cursor."""
+        return f'Post {self.post_id}, delivered up to follower {self.after_follower_id}'
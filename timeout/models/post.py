@@ -5,11 +5,18 @@ post.py - Defines the Post model representing a social media post with privacy c
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from timeout.models.mixins import TimestampMixin, OwnedMixin
 
 
 class Post(TimestampMixin, OwnedMixin, models.Model):
-    """Social media post with privacy controls."""
+    """Social media post with privacy controls.
+
+    like_count, comment_count and bookmark_count are moved with F()
+    expressions by the like, bookmark and comment signals, so cards never
+    count rows; recount() rebuilds them, e.g. from the repair_post_counts command.
+    """
 
     class Privacy(models.TextChoices):
         """Class that determines the privacy of the post"""
@@ -35,6 +42,9 @@ class Post(TimestampMixin, OwnedMixin, models.Model):
         choices=Privacy.choices,
         default=Privacy.PUBLIC,
     )
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    bookmark_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         """Order posts by newest first and index for fast feed queries."""
@@ -48,9 +58,23 @@ class Post(TimestampMixin, OwnedMixin, models.Model):
         preview = self.content[:50]
         return f'{self.author.username}: {preview}...'
 
+    @classmethod
+    def recount(cls, post_ids=None):
+        """Recompute the stored counts of the given posts (all when None) with one update."""
+        from timeout.models import Bookmark, Comment, Like
+
+        def count(model):
+            """Return a subquery counting the model's rows on the outer post."""
+            return Coalesce(Subquery(
+                model.objects.filter(post=OuterRef('pk')).order_by().values('post')
+                .annotate(n=Count('pk')).values('n')), 0)
+
+        posts = cls.objects.all() if post_ids is None else cls.objects.filter(pk__in=post_ids)
+        return posts.update(like_count=count(Like), comment_count=count(Comment), bookmark_count=count(Bookmark))
+
     def get_like_count(self):
         """Return the number of likes on this post."""
-        return self.likes.count()
+        return self.like_count
 
     def is_liked_by(self, user):
         """Check if a user has liked this post."""
@@ -65,8 +89,8 @@ class Post(TimestampMixin, OwnedMixin, models.Model):
         return self.bookmarks.filter(user=user).exists()
 
     def get_comment_count(self):
-        """Return the number of comments on this post."""
-        return self.comments.count()
+        """Return the number of comments on this post, replies included."""
+        return self.comment_count
 
     def can_view(self, user):
         """Check if user can view this post based on privacy."""
@@ -0,0 +1,57 @@
+"""
+reminder_schedule.py - Defines the ReminderSchedule model, a precomputed row per pending reminder so
+that due reminders are found with one indexed fire_at query instead of scanning every event.
+"""
+
+
+from django.conf import settings
+from django.db import models
+
+
+class ReminderSchedule(models.Model):
+    """
+    Model representing one pending reminder for a user about an event.
+
+    Rows are written when an event is saved or subscribed to, one per reminder
+    kind still ahead of the event's due time. due_at is the deadline's end or
+    the start of the event's next occurrence. The send_reminders runner turns
+    due rows into notifications and deletes them. Global events get a single
+    row per kind with no user, which the runner broadcasts to every user.
+    """
+
+    class Kind(models.TextChoices):
+        WEEK = 'week', '1 week'
+        DAY =  'day',  '1 day'
+        HOUR = 'hour', '1 hour'
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='reminders',
+        null=True,
+        blank=True,
+    )
+    event = models.ForeignKey(
+        'timeout.Event',
+        on_delete=models.CASCADE,
+        related_name='reminders',
+    )
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    fire_at = models.DateTimeField()
+    due_at = models.DateTimeField()
+
+    class Meta:
+        """
+        Metadata for the ReminderSchedule model:
+        - Ensures a user has at most one pending reminder of each kind per event
+        - Adds an index for the runner's fire_at <= now scan
+        """
+
+        unique_together = ('user', 'event', 'kind')
+        indexes = [
+            models.Index(fields=['fire_at'], name='timeout_reminder_fire_idx'),
+        ]
+
+    def __str__(self):
+        """Return a string representation with the event id, kind and fire time."""
+        return f'{self.kind} reminder for {self.event_id} at {self.fire_at:%Y-%m-%d %H:%M}'
@@ -0,0 +1,54 @@
+"""
+timeline_entry.py - Defines the TimelineEntry model, one row per post in each follower's home
+timeline, written when the post is created so the following feed is read from one indexed range.
+"""
+
+
+from django.conf import settings
+from django.db import models
+
+
+class TimelineEntry(models.Model):
+    """
+    Model representing a post delivered to one user's following feed.
+
+    TimelineService writes a row for the author and each follower when a post
+    is created, backfills an author's recent posts on follow, and deletes the
+    rows again on unfollow, block or ban. author and created_at are copied
+    from the post so pruning and paging never join the posts table.
+    """
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+    )
+    post = models.ForeignKey(
+        'timeout.Post',
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        """
+        Metadata for the TimelineEntry model:
+        - Delivers a post to a user once
+        - Indexes each timeline newest first for feed pages
+        - Indexes (owner, author) for pruning on unfollow and block
+        """
+
+        unique_together = ('owner', 'post')
+        indexes = [
+            models.Index(fields=['owner', '-created_at', '-post'], name='timeout_timeline_read_idx'),
+            models.Index(fields=['owner', 'author'], name='timeout_timeline_prune_idx'),
+        ]
+
+    def __str__(self):
+        """Return a string representation with the owner and post."""
+        return f'Post {self.post_id} in {self.owner_id}\'s timeline'
@@ -4,6 +4,7 @@ user.py - Defines the custom User model for the Timeout application, including f
 
 
 import math
+import secrets
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
@@ -90,6 +91,11 @@ class User(AbstractUser):
     longest_note_streak = models.PositiveIntegerField(default=0)
     last_note_date = models.DateField(null=True, blank=True)
 
+    # Calendar subscription feed
+    calendar_token = models.CharField(
+        max_length=64, unique=True, null=True, blank=True, editable=False,
+    )
+
     # Moderation 
     is_banned = models.BooleanField(default=False)
     ban_reason = models.CharField(max_length=300, blank=True)
@@ -111,6 +117,13 @@ class User(AbstractUser):
         parts = [self.first_name, self.middle_name, self.last_name]
         return ' '.join(part for part in parts if part)
 
+    def get_calendar_token(self, reset=False):
+        """Return the secret token for the .ics feed, creating (or replacing) it if needed."""
+        if reset or not self.calendar_token:
+            self.calendar_token = secrets.token_urlsafe(32)
+            self.save(update_fields=['calendar_token'])
+        return self.calendar_token
+
     @property
     def level(self):
         """Level = floor(sqrt(xp / 50)). Level 1 at 50 XP, 2 at 200, 3 at 450, etc."""
@@ -0,0 +1,84 @@
+"""
+user_counters.py - Defines the UserCounters model, a denormalised row per user holding unread
+notification and message counts so the navbar, dashboard and poll endpoints read them in O(1).
+"""
+
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest
+
+
+class UserCounters(models.Model):
+    """
+    Model holding a user's unread counters.
+
+    Writers that change a notification's is_read or is_dismissed, or move a
+    conversation read cursor, move the counters with F() expressions in the
+    same transaction, so concurrent updates never lose a
+    step. The row is created lazily from a full recount the first time it is
+    read, and the repair_counters command recounts every user from scratch.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='counters',
+    )
+    unread_notifications = models.PositiveIntegerField(default=0)
+    unread_messages = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        """Return a string representation with both counts."""
+        return f'{self.user_id}: {self.unread_notifications} notifications, {self.unread_messages} messages unread'
+
+    @classmethod
+    def get(cls, user_id):
+        """Return the user's counters, recounting them if the row does not exist yet."""
+        counters = cls.objects.filter(user_id=user_id).first()
+        if counters is None:
+            cls.recount([user_id])
+            counters = cls.objects.get(user_id=user_id)
+        return counters
+
+    @classmethod
+    def adjust(cls, user_id, notifications=0, messages=0):
+        """Move a user's counters by the given deltas, never below zero.
+
+        A missing row is left missing; get() builds it from a recount, which
+        already includes this change.
+        """
+        changes = {}
+        if notifications:
+            changes['unread_notifications'] = Greatest(F('unread_notifications') + notifications, 0)
+        if messages:
+            changes['unread_messages'] = Greatest(F('unread_messages') + messages, 0)
+        if changes:
+            cls.objects.filter(user_id=user_id).update(**changes)
+
+    @classmethod
+    def recount(cls, user_ids):
+        """Recompute and store the counters of the given users with two grouped queries."""
+        from timeout.models.conversation_membership import ConversationMembership
+        from timeout.models.notification import Notification
+
+        user_ids = list(get_user_model().objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+        if not user_ids:
+            return
+        notifications = dict(
+            Notification.objects.filter(user_id__in=user_ids, is_read=False, is_dismissed=False)
+            .values('user_id').annotate(n=Count('id')).values_list('user_id', 'n').order_by())
+        messages = dict(
+            ConversationMembership.objects.filter(user_id__in=user_ids)
+            .values('user_id').annotate(n=Sum(ConversationMembership.unread_expression()))
+            .values_list('user_id', 'n').order_by())
+        cls.objects.bulk_create(
+            [cls(user_id=pk, unread_notifications=notifications.get(pk, 0),
+                 unread_messages=messages.get(pk, 0)) for pk in user_ids],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['unread_notifications', 'unread_messages'],
+        )
@@ -3,5 +3,11 @@ from .note_service import NoteService
 from .deadline_service import DeadlineService
 from .ai_service import AIService
 from .event_service import EventService
+from .import_service import EventImportService
+from .study_session_service import StudySessionService
+from .reminder_service import ReminderService
+from .retention_service import RetentionService
+from .timeline_service import TimelineService
 
-__all__ = ['FeedService', 'NoteService', 'DeadlineService', 'AIService', 'EventService']
\ No newline at end of file
+__all__ = ['FeedService', 'NoteService', 'DeadlineService', 'AIService', 'EventService', 'EventImportService',
+           'StudySessionService', 'ReminderService', 'RetentionService', 'TimelineService']
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+activity_buffer.py - Write-behind buffer for the notifications caused by post activity. Activity
+deferred inside collect() is written once, after its transaction commits, as one batch; with
+settings.NOTIFICATION_FANOUT = 'queue' the batch is only queued in PendingActivity and the
+flush_activity runner folds it into notifications outside the request.
+"""
+
+
+import threading
+from contextlib import contextmanager
+from functools import partial
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from timeout.models import PendingActivity
+
+DEFAULT_MODE = 'commit'
+BATCH_SIZE = 500
+
+
+class PostActivity(NamedTuple):
+    """One like, bookmark or comment to notify a recipient about."""
+    recipient_id: int
+    post_id: int
+    actor_id: int
+    actor_name: str
+    type: str
+    verb: str
+    title: str
+    message: str
+
+
+_local = threading.local()
+
+
+def mode():
+    """Return the configured fan-out mode, 'commit' or 'queue'."""
+    return getattr(settings, 'NOTIFICATION_FANOUT', DEFAULT_MODE)
+
+
+@contextmanager
+def collect(using=None):
+    """Run a block in one transaction and write the activity it defers as one batch after commit.
+
+    The buffer is kept per thread. A nested collect() adds to the outer buffer
+    and drops what it added if its block raises, so a rolled-back block never
+    reaches the batch.
+    """
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is not None:
+        mark = len(buffer)
+        try:
+            with transaction.atomic(using=using):
+                yield
+        except BaseException:
+            del buffer[mark:]
+            raise
+        return
+    buffer = _local.buffer = []
+    try:
+        with transaction.atomic(using=using):
+            yield
+    finally:
+        _local.buffer = None
+    transaction.on_commit(partial(flush, buffer), using=using)
+
+
+def defer(activity, using=None):
+    """Buffer an activity until the current transaction commits.
+
+    Inside collect() the activity joins that block's batch. Otherwise it is
+    written after the surrounding transaction commits, or straight away
+    outside a transaction.
+    """
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is not None:
+        buffer.append(activity)
+    elif transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(partial(flush, [activity]), using=using)
+    else:
+        flush([activity])
+
+
+def flush(activities):
+    """Fold activities into notifications, or queue them for the runner in 'queue' mode."""
+    if not activities:
+        return
+    if mode() == 'queue':
+        PendingActivity.objects.bulk_create(
+            [PendingActivity(user_id=a.recipient_id, post_id=a.post_id, actor_id=a.actor_id,
+                             actor_name=a.actor_name, type=a.type, verb=a.verb,
+                             title=a.title, message=a.message)
+             for a in activities], batch_size=BATCH_SIZE)
+        return
+    # Imported here: NotificationService defers through this module.
+    from timeout.services.notification_service import NotificationService
+    NotificationService.apply_post_activity(activities)
+
+
+def drain(batch_size=BATCH_SIZE):
+    """Fold the queued activities into notifications, oldest first. Returns the number processed."""
+    from timeout.services.notification_service import NotificationService
+    processed = 0
+    while True:
+        rows = list(PendingActivity.objects.order_by('pk')[:batch_size])
+        if not rows:
+            return processed
+        with transaction.atomic():
+            NotificationService.apply_post_activity([
+                PostActivity(row.user_id, row.post_id, row.actor_id, row.actor_name,
+                             row.type, row.verb, row.title, row.message)
+                for row in rows
+            ])
+            PendingActivity.objects.filter(pk__in=[row.pk for row in rows]).delete()
+        processed += len(rows)
+        if len(rows) < batch_size:
+            return processed
@@ -0,0 +1,48 @@
+"""
+calendar_cache.py - Per-user calendar versions, and the cache of rendered month grids keyed on them.
+A version is read from the database rather than kept in the cache, so every worker process sees the
+same one: any write that changes what a calendar shows changes the version, a cached grid is never
+served after its data changed, and old entries simply age out.
+"""
+
+
+import hashlib
+
+from django.db.models import Count, Max, Q
+from timeout.models import Event, EventSubscription
+
+GRID_TIMEOUT = 3600
+
+
+def version(user):
+    """Return a fingerprint of every event shown in the user's calendar.
+
+    It is built from the newest event update (indexed on updated_at), the event
+    count and the newest subscription, so any create, edit, delete, subscribe
+    or unsubscribe visible to the user changes it, whichever process wrote it.
+    """
+    stats = Event.objects.filter(
+        Q(creator=user) | Q(is_global=True) | Q(pk__in=EventSubscription.event_ids(user)),
+    ).aggregate(latest=Max('updated_at'), total=Count('id'))
+    linked = EventSubscription.objects.filter(user=user).aggregate(latest=Max('created_at'))
+    raw = f"{user.pk}:{stats['latest']}:{stats['total']}:{linked['latest']}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def grid_key(user, year, month, today):
+    """Return the cache key of a user's rendered month grid for the current version."""
+    return f'calendar_grid_{user.pk}_{year}_{month}_{version(user)}_{today:%Y%m%d}'
+
+
+def grid_timeout(occurrences, now):
+    """Seconds a grid may be cached: until the next occurrence starts or ends, at most GRID_TIMEOUT.
+
+    Chips carry an Upcoming/Ongoing/Past status, so a grid expires at the next
+    status change even when no event was edited.
+    """
+    timeout = GRID_TIMEOUT
+    for _, start_dt, end_dt in occurrences:
+        for moment in (start_dt, end_dt):
+            if moment > now:
+                timeout = min(timeout, (moment - now).total_seconds())
+    return max(1, int(timeout))
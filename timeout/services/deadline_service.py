@@ -6,6 +6,7 @@ marking them complete or incomplete, and computing urgency labels and time-remai
 
 from django.utils import timezone
 from timeout.models import Event
+from timeout.services.event_service import EventService
 from timeout.utils import urgency_label, time_string, time_passed
 
 
@@ -21,8 +22,7 @@ class DeadlineService:
         if not user.is_authenticated:
             return []
  
-        deadlines = Event.objects.filter(
-            creator=user,
+        deadlines = EventService.owned_or_subscribed(user).filter(
             #event_type=Event.EventType.DEADLINE,
             is_completed=False,
         ).order_by('start_datetime')
@@ -47,8 +47,7 @@ class DeadlineService:
             until: optional upper bound for start_datetime
         """
         now = timezone.now()
-        qs = Event.objects.filter(
-            creator=user,
+        qs = EventService.owned_or_subscribed(user).filter(
             event_type__in=[Event.EventType.DEADLINE, Event.EventType.EXAM],
             start_datetime__gte=now,
         ).order_by('start_datetime')
@@ -92,7 +91,7 @@ class DeadlineService:
 def create_filter_query(user, status_filter, event_type, sort_order):
     """Build a queryset applying filters.
     Takes parameters from get_filtered_deadlines function and applies them"""
-    qs = Event.objects.filter(creator=user)
+    qs = EventService.owned_or_subscribed(user)
 
     if event_type:
         qs = qs.filter(event_type=event_type)
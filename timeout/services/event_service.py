@@ -2,13 +2,20 @@
 Service layer for Event-related business logic. This is where complex queries and data transformations related to Events should live, keeping views thin and focused on HTTP handling.
 """
 
+from django.db.models import Q
 from django.utils import timezone
-from timeout.models import Event
+from timeout.models import Event, EventSubscription, Post
+from timeout.services.timeline_service import TimelineService
 
 
 class EventService:
     """Service for building and querying Event objects."""
 
+    @staticmethod
+    def owned_or_subscribed(user):
+        """Return the events a user created or subscribed to, via the indexed subscription link."""
+        return Event.objects.filter(Q(creator=user) | Q(pk__in=EventSubscription.event_ids(user)))
+
     @staticmethod
     def get_dashboard_upcoming(user, limit=5):
         """Return upcoming/ongoing events for the dashboard schedule widget."""
@@ -39,3 +46,36 @@ class EventService:
             is_all_day=data.get('is_all_day', False),
             recurrence=data.get('recurrence', 'none'),
         )
+
+    @staticmethod
+    def sync_posts(events):
+        """Bring the social posts of many events in line with their visibility.
+
+        The batch counterpart of Event.sync_post for bulk writers, which skip
+        Event.save(): one read of the existing posts, then at most one insert,
+        one update and one delete however many events are passed. New posts
+        are fanned out to timelines, which bulk_create leaves to the caller.
+        """
+        events = [e for e in events if e.pk is not None]
+        if not events:
+            return
+        public = {e.pk: e for e in events if e.visibility == Event.Visibility.PUBLIC and e.creator_id}
+        existing = {}
+        for post in Post.objects.filter(event__in=[e.pk for e in events]).order_by('pk'):
+            existing.setdefault(post.event_id, post)
+        stale = [e.pk for e in events if e.pk not in public]
+        if stale:
+            Post.objects.filter(event__in=stale).delete()
+        updated, now = [], timezone.now()
+        for pk, event in public.items():
+            post = existing.get(pk)
+            if post is not None and post.content != event.post_content():
+                post.content, post.updated_at = event.post_content(), now
+                updated.append(post)
+        Post.objects.bulk_update(updated, ['content', 'updated_at'])
+        created = Post.objects.bulk_create([
+            Post(author_id=event.creator_id, content=event.post_content(), event=event,
+                 privacy=Post.Privacy.PUBLIC)
+            for pk, event in public.items() if pk not in existing
+        ])
+        TimelineService.fan_out(created)
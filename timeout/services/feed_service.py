@@ -3,18 +3,21 @@ feed_service.py - Defines FeedService for building social feeds (following, disc
 with privacy filtering, block relationships, and cursor-based pagination.
 """
 
-from django.db.models import Q
-from timeout.models import Post, Block
+from django.db.models import Prefetch, Q
+from timeout.models import Post, Block, Comment, TimelineEntry
+from timeout.services.timeline_service import TimelineService
 
 PAGE_SIZE = 15
 
 
 def _finalise_feed_qs(qs, cursor):
-    """Apply cursor filter, eager loading, ordering, and page size slice."""
+    """Apply cursor filter, eager loading, ordering, and page size slice.
+    Like, comment and bookmark counts are columns on Post; only the comments
+    shown under each card are prefetched."""
     if cursor:
         qs = qs.filter(id__lt=cursor)
     return qs.select_related('author', 'event').prefetch_related(
-        'likes', 'comments', 'bookmarks'
+        Prefetch('comments', queryset=Comment.objects.select_related('author'))
     ).order_by('-created_at')[:PAGE_SIZE + 1]
 
 
@@ -29,21 +32,28 @@ class FeedService:
 
     @staticmethod
     def get_following_feed(user, cursor=None):
-        """Get posts from followed users and self, respecting privacy and blocks."""
+        """Get posts from followed users and self from the user's precomputed timeline.
+
+        One indexed range scan of the timeline picks the page's posts; the posts
+        of heavy authors the user follows, which are not fanned out, are merged
+        in by the same query. Timelines are pruned on unfollow and block, so
+        only bans are still filtered here.
+        """
         if not user.is_authenticated:
             return Post.objects.none()
-        
-        blocked_by_me, blocking_me = _get_blocked_ids(user)
-
-        following_ids = user.following.values_list('id', flat=True)
-
-        qs = (Post.objects.filter(Q(author_id__in=following_ids) | Q(author=user))
-                          .exclude(author__is_banned=True)
-                          .exclude(author_id__in=blocked_by_me)
-                          .exclude(author_id__in=blocking_me))
 
-        posts = [p for p in _finalise_feed_qs(qs, cursor) if p.can_view(user)]
-        return posts
+        entries = TimelineEntry.objects.filter(owner=user)
+        if cursor:
+            entries = entries.filter(post_id__lt=cursor)
+        post_ids = list(entries.order_by('-created_at', '-post_id')
+                        .values_list('post_id', flat=True)[:PAGE_SIZE + 1])
+
+        visible = Q(id__in=post_ids)
+        heavy_ids = TimelineService.followed_heavy_ids(user)
+        if heavy_ids:
+            visible |= Q(author_id__in=heavy_ids)
+        qs = Post.objects.filter(visible).exclude(author__is_banned=True)
+        return list(_finalise_feed_qs(qs, cursor))
 
     @staticmethod
     def get_discover_feed(user, cursor=None):
@@ -0,0 +1,128 @@
+"""
+ical_service.py - Builds RFC 5545 iCalendar (.ics) output for a user's events. Recurring series
+are emitted once with an RRULE instead of being expanded, and lines are produced lazily so the
+feed can be streamed.
+"""
+
+
+import hashlib
+from datetime import timedelta, timezone
+from django.db.models import Count, Max, Q
+from timeout.models import Event, EventSubscription
+from timeout.services.recurrence import RECURRING
+
+PRODID = '-//Timeout//Calendar Feed//EN'
+
+RRULE_FREQ = {'daily': 'DAILY', 'weekly': 'WEEKLY', 'monthly': 'MONTHLY'}
+
+
+def escape_text(value):
+    """Escape a TEXT property value (backslash, semicolon, comma and newlines)."""
+    return (
+        value.replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """Fold a content line to at most 75 octets, continuing with a leading space."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts, limit = [], 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1  # never split a multi-byte character
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded, limit = encoded[cut:], 74
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def format_utc(dt):
+    """Format an aware datetime as an iCalendar UTC date-time."""
+    return dt.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def rrule(event):
+    """Return the RRULE value for a recurring event, or None for one-off events.
+
+    Monthly series past the 28th clamp to the end of shorter months, matching
+    the in-app expansion, via BYMONTHDAY with BYSETPOS=-1.
+    """
+    if event.recurrence not in RECURRING:
+        return None
+    value = f'FREQ={RRULE_FREQ[event.recurrence]}'
+    day = event.start_datetime.day
+    if event.recurrence == 'monthly' and day > 28:
+        value += f";BYMONTHDAY={','.join(str(d) for d in range(28, day + 1))};BYSETPOS=-1"
+    return value
+
+
+def event_lines(event):
+    """Yield the unfolded content lines of one VEVENT."""
+    yield 'BEGIN:VEVENT'
+    yield f'UID:event-{event.pk}@timeout'
+    yield f'DTSTAMP:{format_utc(event.updated_at)}'
+    yield f'LAST-MODIFIED:{format_utc(event.updated_at)}'
+    if event.is_all_day:
+        start = event.start_datetime.date()
+        yield f'DTSTART;VALUE=DATE:{start:%Y%m%d}'
+        yield f'DTEND;VALUE=DATE:{start + timedelta(days=1):%Y%m%d}'
+    else:
+        yield f'DTSTART:{format_utc(event.start_datetime)}'
+        yield f'DTEND:{format_utc(event.end_datetime)}'
+    rule = rrule(event)
+    if rule:
+        yield f'RRULE:{rule}'
+    yield f'SUMMARY:{escape_text(event.title)}'
+    if event.description:
+        yield f'DESCRIPTION:{escape_text(event.description)}'
+    if event.location:
+        yield f'LOCATION:{escape_text(event.location)}'
+    yield f'CATEGORIES:{escape_text(event.get_event_type_display())}'
+    if event.status == Event.EventStatus.CANCELLED:
+        yield 'STATUS:CANCELLED'
+    yield 'END:VEVENT'
+
+
+def feed_events(user):
+    """Return the queryset of events published in a user's feed."""
+    return Event.objects.filter(
+        Q(creator=user) | Q(is_global=True) | Q(pk__in=EventSubscription.event_ids(user)),
+    ).order_by('pk')
+
+
+def feed_chunks(user, chunk_size=200):
+    """Yield the folded .ics document for a user, one VEVENT at a time."""
+    yield fold('BEGIN:VCALENDAR')
+    yield fold('VERSION:2.0')
+    yield fold(f'PRODID:{PRODID}')
+    yield fold('CALSCALE:GREGORIAN')
+    yield fold(f'X-WR-CALNAME:{escape_text(f"Timeout - {user.username}")}')
+    for event in feed_events(user).iterator(chunk_size=chunk_size):
+        yield ''.join(fold(line) for line in event_lines(event))
+    yield fold('END:VCALENDAR')
+
+
+def feed_validators(user):
+    """Return (etag, last_modified) for a user's feed.
+
+    Both come from index-backed aggregates (newest updated_at and count), so a
+    conditional poll never reads event rows. The counts catch deletions and
+    unsubscribes.
+    """
+    own = Event.objects.filter(creator=user).aggregate(latest=Max('updated_at'), total=Count('pk'))
+    shared = Event.objects.filter(is_global=True).exclude(creator=user).aggregate(
+        latest=Max('updated_at'), total=Count('pk'))
+    subscribed = EventSubscription.live().filter(user=user).aggregate(
+        latest=Max('event__updated_at'), linked=Max('created_at'), total=Count('pk'))
+    stamps = [s for s in (own['latest'], shared['latest'], subscribed['latest'], subscribed['linked'])
+              if s is not None]
+    last_modified = max(stamps) if stamps else None
+    raw = f"{user.pk}:{last_modified}:{own['total']}:{shared['total']}:{subscribed['total']}"
+    return hashlib.sha1(raw.encode()).hexdigest(), last_modified
+
@@ -0,0 +1,301 @@
+"""
+import_service.py - Defines EventImportService for importing a term timetable from an uploaded
+.ics or CSV file. Files are parsed as a stream, rows are validated and de-duplicated in batches,
+and events are written with bulk_create inside a single transaction.
+"""
+
+
+import csv
+import io
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from timeout.models import Event
+from timeout.services.event_service import EventService
+from timeout.services.interval_index import IntervalIndex
+from timeout.services.occurrence_service import OccurrenceService
+from timeout.services.recurrence import RECURRING
+from timeout.services.reminder_service import ReminderService
+
+CSV_COLUMNS = ['title', 'start', 'end', 'event_type', 'location', 'description',
+               'recurrence', 'visibility', 'is_all_day']
+
+
+class ImportRowError(Exception):
+    """Raised for a row (or whole file) that cannot be imported."""
+
+
+def text_lines(upload):
+    """Yield decoded lines from an uploaded file without reading it into memory."""
+    upload.seek(0)
+    yield from io.TextIOWrapper(upload.file, encoding='utf-8-sig', errors='replace', newline='')
+
+
+def _unfold(lines):
+    """Yield (line_number, logical_line) pairs, joining folded .ics continuation lines."""
+    current, start_no = None, 0
+    for number, raw in enumerate(lines, 1):
+        line = raw.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield start_no, current
+        current, start_no = line, number
+    if current is not None:
+        yield start_no, current
+
+
+def _unescape(value):
+    """Undo iCalendar TEXT escaping."""
+    return (value.replace('\\n', '\n').replace('\\N', '\n').replace('\\,', ',')
+            .replace('\\;', ';').replace('\\\\', '\\'))
+
+
+def _ics_params(params):
+    """Split property parameters such as 'VALUE=DATE;TZID=Europe/London' into a dict.
+    Names are upper-cased; values keep their case, as TZID names are case-sensitive."""
+    pairs = (p.split('=', 1) for p in params.split(';') if '=' in p)
+    return {name.upper(): value for name, value in pairs}
+
+
+def _ics_zone(tzid):
+    """Return the time zone named by a TZID parameter. Unknown names reject the row."""
+    try:
+        return ZoneInfo(tzid.strip('"'))
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ImportRowError(f'unknown time zone {tzid}') from None
+
+
+def _ics_datetime(value, params):
+    """Parse a DTSTART/DTEND value. Returns (aware datetime, is_date).
+    Local times with a TZID are read in that zone, floating ones in the server's."""
+    params = _ics_params(params)
+    if params.get('VALUE', '').upper() == 'DATE' or len(value) == 8:
+        day = datetime.strptime(value[:8], '%Y%m%d')
+        return timezone.make_aware(day), True
+    if value.endswith('Z'):
+        return datetime.strptime(value, '%Y%m%dT%H%M%SZ').replace(tzinfo=dt_timezone.utc), False
+    local = datetime.strptime(value, '%Y%m%dT%H%M%S')
+    if 'TZID' in params:
+        return timezone.make_aware(local, _ics_zone(params['TZID'])), False
+    return timezone.make_aware(local), False
+
+
+def _ics_recurrence(rule):
+    """Map an RRULE to one of the supported recurrences, or 'none'."""
+    parts = dict(p.split('=', 1) for p in rule.split(';') if '=' in p)
+    freq = parts.get('FREQ', '').lower()
+    interval = parts.get('INTERVAL', '1')
+    return freq if freq in RECURRING and interval == '1' else 'none'
+
+
+def _ics_row(number, props):
+    """Convert the properties of one VEVENT into a normalised row dict."""
+    if 'DTSTART' not in props:
+        raise ImportRowError('missing DTSTART')
+    start, all_day = _ics_datetime(*props['DTSTART'])
+    if 'DTEND' in props:
+        end, _ = _ics_datetime(*props['DTEND'])
+    else:
+        end = start + (timedelta(days=1) if all_day else timedelta(hours=1))
+    if all_day:
+        end = end - timedelta(minutes=1)  # DTEND is exclusive for all-day events
+    return {
+        'line': number,
+        'title': _unescape(props.get('SUMMARY', ('', ''))[0]) or 'Untitled',
+        'start_datetime': start,
+        'end_datetime': end,
+        'location': _unescape(props.get('LOCATION', ('', ''))[0]),
+        'description': _unescape(props.get('DESCRIPTION', ('', ''))[0]),
+        'recurrence': _ics_recurrence(props['RRULE'][0]) if 'RRULE' in props else 'none',
+        'is_all_day': all_day,
+        'event_type': Event.EventType.CLASS,
+    }
+
+
+def parse_ics(lines):
+    """Yield row dicts (or ImportRowError instances) for every VEVENT in an .ics stream."""
+    props, start_no = None, 0
+    for number, line in _unfold(lines):
+        if line == 'BEGIN:VEVENT':
+            props, start_no = {}, number
+        elif line == 'END:VEVENT' and props is not None:
+            try:
+                yield _ics_row(start_no, props)
+            except (ImportRowError, ValueError) as exc:
+                yield ImportRowError(f'Line {start_no}: {exc}')
+            props = None
+        elif props is not None and ':' in line:
+            head, value = line.split(':', 1)
+            name, _, params = head.partition(';')
+            props.setdefault(name.upper(), (value, params))
+
+
+def _csv_datetime(value):
+    """Parse an ISO date or datetime from a CSV cell. Returns (aware datetime, is_date)."""
+    value = value.strip()
+    if len(value) == 10:
+        return timezone.make_aware(datetime.combine(date.fromisoformat(value), time.min)), True
+    return timezone.make_aware(datetime.fromisoformat(value)), False
+
+
+def _csv_row(number, record):
+    """Convert one CSV record into a normalised row dict."""
+    if not (record.get('title') or '').strip():
+        raise ImportRowError('missing title')
+    start, all_day = _csv_datetime(record.get('start') or '')
+    if (record.get('is_all_day') or '').strip().lower() in ('1', 'true', 'yes'):
+        all_day = True
+    if all_day:
+        start = start.replace(hour=0, minute=0)
+        end = start.replace(hour=23, minute=59)
+    else:
+        end, _ = _csv_datetime(record.get('end') or '')
+    recurrence = (record.get('recurrence') or 'none').strip().lower()
+    return {
+        'line': number,
+        'title': record['title'].strip(),
+        'start_datetime': start,
+        'end_datetime': end,
+        'event_type': (record.get('event_type') or Event.EventType.CLASS).strip().lower(),
+        'location': (record.get('location') or '').strip(),
+        'description': (record.get('description') or '').strip(),
+        'recurrence': recurrence if recurrence in RECURRING else 'none',
+        'visibility': (record.get('visibility') or Event.Visibility.PRIVATE).strip().lower(),
+        'is_all_day': all_day,
+    }
+
+
+def parse_csv(lines):
+    """Yield row dicts (or ImportRowError instances) for every record of a CSV stream."""
+    reader = csv.DictReader(lines)
+    try:
+        fieldnames = reader.fieldnames
+    except csv.Error as exc:
+        raise ImportRowError(f'Line {reader.line_num}: {exc}') from exc
+    if not fieldnames or 'title' not in fieldnames or 'start' not in fieldnames:
+        raise ImportRowError(f"CSV header must include: {', '.join(CSV_COLUMNS)}")
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:  # e.g. NUL bytes, bad quoting or an oversized field
+            yield ImportRowError(f'After line {reader.line_num}: {exc}')
+            continue
+        try:
+            yield _csv_row(reader.line_num, record)
+        except (ImportRowError, ValueError) as exc:
+            yield ImportRowError(f'Line {reader.line_num}: {exc}')
+
+
+def _validate(event, busy_index):
+    """Run model validation against the batch's busy_index, then reserve the event's slot if it blocks."""
+    event.busy_index = busy_index
+    try:
+        event.full_clean(exclude=['creator'], validate_unique=False)
+    finally:
+        del event.busy_index
+    if event.event_type in Event.BLOCKING_TYPES and not event.is_all_day:
+        busy_index.add(event.start_datetime, event.end_datetime)
+
+
+def _busy_index(user, events):
+    """Index the user's blocking events across the span of the batch rows that get an overlap check."""
+    checked = [e for e in events if e.event_type in Event.EXCLUSIVE_TYPES and not e.is_all_day]
+    if not checked:
+        return IntervalIndex()
+    return IntervalIndex.for_user(
+        user, min(e.start_datetime for e in checked), max(e.end_datetime for e in checked),
+        event_types=Event.BLOCKING_TYPES)
+
+
+class EventImportService:
+    """Service for bulk-importing timetable rows as events for one user."""
+
+    BATCH_SIZE = 200
+    MAX_ROWS = 2000
+    MAX_ERRORS = 20
+
+    @staticmethod
+    def parse(upload):
+        """Return a row iterator for an uploaded .ics or .csv file."""
+        name = (upload.name or '').lower()
+        if name.endswith('.ics'):
+            return parse_ics(text_lines(upload))
+        if name.endswith('.csv'):
+            return parse_csv(text_lines(upload))
+        raise ImportRowError('Please upload an .ics or .csv file.')
+
+    @staticmethod
+    def import_rows(user, rows):
+        """Validate, de-duplicate and insert rows. Returns a summary dict.
+
+        Every batch costs one indexed duplicate lookup, one overlap index read
+        plus the bulk inserts; the social Post sync runs once at the end for
+        public events only.
+        """
+        result = {'created': 0, 'duplicates': 0, 'errors': []}
+        created, batch, seen = [], [], set()
+        with transaction.atomic():
+            for count, row in enumerate(rows, 1):
+                if count > EventImportService.MAX_ROWS:
+                    EventImportService._error(result, f'Stopped after {EventImportService.MAX_ROWS} rows.')
+                    break
+                if isinstance(row, ImportRowError):
+                    EventImportService._error(result, str(row))
+                    continue
+                batch.append(row)
+                if len(batch) >= EventImportService.BATCH_SIZE:
+                    created += EventImportService._flush(user, batch, seen, result)
+                    batch = []
+            created += EventImportService._flush(user, batch, seen, result)
+            EventService.sync_posts(created)
+        ReminderService.schedule_events(created)
+        result['created'] = len(created)
+        return result
+
+    @staticmethod
+    def _error(result, message):
+        """Record an error, keeping the list short."""
+        if len(result['errors']) < EventImportService.MAX_ERRORS:
+            result['errors'].append(message)
+
+    @staticmethod
+    def _flush(user, batch, seen, result):
+        """Drop duplicates from one batch, validate the rest and bulk insert them with their occurrences.
+
+        The overlap check in Event.clean reads one interval index built for the
+        batch, and each accepted blocking event is added to it so rows in the
+        same file cannot collide. Occurrences are stored per batch, so the next
+        batch's index sees this one.
+        """
+        if not batch:
+            return []
+        events = [(row, EventService.build_from_data(user, row)) for row in batch]
+        existing = set(Event.objects.filter(
+            creator=user,
+            title__in={e.title for _, e in events},
+            start_datetime__in={e.start_datetime for _, e in events},
+        ).values_list('title', 'start_datetime'))
+        busy_index = _busy_index(user, [e for _, e in events])
+        fresh = []
+        for row, event in events:
+            key = (event.title, event.start_datetime)
+            if key in existing or key in seen:
+                result['duplicates'] += 1
+                continue
+            try:
+                _validate(event, busy_index)
+            except ValidationError as exc:
+                EventImportService._error(result, f"Line {row['line']}: {'; '.join(exc.messages)}")
+                continue
+            seen.add(key)
+            fresh.append(event)
+        created = Event.objects.bulk_create(fresh)
+        OccurrenceService.materialize_new(created)
+        return created
+
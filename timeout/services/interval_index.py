@@ -0,0 +1,95 @@
+"""
+interval_index.py - Defines IntervalIndex, an in-memory index over (start, end) intervals built once
+per request from a user's occurrences. Intervals are kept sorted by start with a max-end segment
+tree on top, so overlap checks and per-day gap searches cost O(log n + k) instead of a full scan.
+"""
+
+
+from bisect import bisect_left, insort
+from django.db.models import Q
+from timeout.models import Event, EventOccurrence, EventSubscription
+
+
+class IntervalIndex:
+    """Static interval index answering overlap and free-gap queries.
+
+    Intervals are half-open: (start, end) overlaps [a, b) when start < b and end > a.
+    """
+
+    def __init__(self, intervals=()):
+        """Build the index from an iterable of (start, end) pairs."""
+        self._items = sorted((start, end) for start, end in intervals)
+        self._build()
+
+    def _build(self):
+        """(Re)build the sorted starts and the max-end segment tree."""
+        self._starts = [start for start, _ in self._items]
+        size = 1
+        while size < len(self._items):
+            size *= 2
+        tree = [None] * (2 * size)
+        for i, (_, end) in enumerate(self._items):
+            tree[size + i] = end
+        for node in range(size - 1, 0, -1):
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if right is None or (left is not None and left >= right) else right
+        self._size, self._tree = size, tree
+
+    @classmethod
+    def for_user(cls, user, start, end, exclude_ids=(), event_types=None):
+        """Index the occurrences visible to user that overlap [start, end).
+
+        Cancelled events are skipped; event_types narrows the index to some types.
+        """
+        occurrences = EventOccurrence.objects.filter(
+            Q(creator=user) | Q(event_id__in=EventSubscription.event_ids(user)),
+            occurrence_start__lt=end,
+            occurrence_end__gt=start,
+        ).exclude(event__status=Event.EventStatus.CANCELLED)
+        if exclude_ids:
+            occurrences = occurrences.exclude(event_id__in=list(exclude_ids))
+        if event_types is not None:
+            occurrences = occurrences.filter(event__event_type__in=event_types, event__is_all_day=False)
+        return cls(occurrences.values_list('occurrence_start', 'occurrence_end'))
+
+    def __len__(self):
+        """Return the number of indexed intervals."""
+        return len(self._items)
+
+    def add(self, start, end):
+        """Insert one interval. O(n); meant for the handful added while validating a batch."""
+        insort(self._items, (start, end))
+        self._build()
+
+    def overlapping(self, start, end):
+        """Yield the intervals overlapping [start, end), in start order."""
+        limit = bisect_left(self._starts, end)
+        if limit:
+            yield from self._collect(1, 0, self._size, limit, start)
+
+    def _collect(self, node, lo, hi, limit, start):
+        """Walk the subtree covering items[lo:hi], pruning branches whose max end is <= start."""
+        best = self._tree[node]
+        if lo >= limit or best is None or best <= start:
+            return
+        if node >= self._size:
+            yield self._items[lo]
+            return
+        mid = (lo + hi) // 2
+        yield from self._collect(2 * node, lo, mid, limit, start)
+        yield from self._collect(2 * node + 1, mid, hi, limit, start)
+
+    def overlaps(self, start, end):
+        """Return True if anything in the index overlaps [start, end)."""
+        return next(self.overlapping(start, end), None) is not None
+
+    def gaps(self, start, end, min_gap):
+        """Yield the free (gap_start, gap_end) spans of at least min_gap inside [start, end)."""
+        cursor = start
+        for busy_start, busy_end in self.overlapping(start, end):
+            if cursor < busy_start and (busy_start - cursor) >= min_gap:
+                yield cursor, busy_start
+            if busy_end > cursor:
+                cursor = busy_end
+        if cursor < end and (end - cursor) >= min_gap:
+            yield cursor, end
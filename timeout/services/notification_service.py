@@ -4,9 +4,19 @@ deadlines, calendar events, and new messages, with deduplication to prevent repe
 """
 
 
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Min, Q
 from django.utils import timezone
 from timeout.models.notification import Notification
 from timeout.models.event import Event
+from timeout.models.event_occurrence import EventOccurrence
+from timeout.models.event_subscription import EventSubscription
+from timeout.models.user import User
+from timeout.models.user_counters import UserCounters
+from timeout.services import activity_buffer, realtime
+from timeout.utils import decode_cursor, encode_cursor
 
 class NotificationService:
     """Maps event type to friendly label for notification messages"""
@@ -20,96 +30,156 @@ class NotificationService:
         Event.EventType.OTHER:         ("Event",         "📅"),
     }
 
+    EVENT_REMINDER_TYPES = [
+        Event.EventType.EXAM, Event.EventType.CLASS,
+        Event.EventType.MEETING, Event.EventType.STUDY_SESSION,
+        Event.EventType.OTHER,
+    ]
+    REMINDER_HORIZON = timezone.timedelta(weeks=1)
+    INSERT_CHUNK = 1000
+    # Post activity within this window folds into the same unread notification.
+    AGGREGATION_WINDOW = timezone.timedelta(days=1)
+    RECENT_ACTORS = 3
+    PAGE_SIZE = 15
+
+    DEADLINE_MESSAGES = {
+        'hour': "1 hour left to complete your deadline!",
+        'day':  "1 day left to complete your deadline!",
+        'week': "1 week left to complete your deadline!",
+    }
+
+    EVENT_MESSAGES = {
+        'hour': 'Your {label} "{title}" starts in 1 hour!',
+        'day':  'Your {label} "{title}" starts tomorrow!',
+        'week': 'Your {label} "{title}" is coming up this week!',
+    }
+
     @staticmethod
-    def create_deadline_notifications(user):
-        """Check upcoming deadlines and create notifications if needed."""
-        now = timezone.now()
-        upcoming_deadlines = Event.objects.filter(
-            creator=user,
-            event_type=Event.EventType.DEADLINE,
-            is_completed=False,
-        )
-        for event in upcoming_deadlines:
-            time_to_end = (event.end_datetime - now).total_seconds()
-            if 0 < time_to_end <= 3600:
-                NotificationService._notify_once(user, event, "1 hour left to complete your deadline!")
-            elif 3600 < time_to_end <= 86400:
-                NotificationService._notify_once(user, event, "1 day left to complete your deadline!")
-            elif 86400 < time_to_end <= 604800:
-                NotificationService._notify_once(user, event, "1 week left to complete your deadline!")
-
-    
-    
-    @staticmethod
-    def create_event_notifications(user):
-        """Check all upcoming event types and create notifications if needed."""
-        now = timezone.now()
-        event_types = [
-            Event.EventType.EXAM, Event.EventType.CLASS,
-            Event.EventType.MEETING, Event.EventType.STUDY_SESSION,
-            Event.EventType.OTHER,
-        ]
-        upcoming_events = Event.objects.filter(
-            creator=user, event_type__in=event_types,
-            is_completed=False,
-            status__in=[Event.EventStatus.UPCOMING, Event.EventStatus.ONGOING],
-            start_datetime__gt=now,
-        )
-        for event in upcoming_events:
-            NotificationService._notify_event_by_time(user, event, now)
+    def _reminder_kind(time_left):
+        """Return the reminder kind whose window contains time_left, or None outside all of them."""
+        seconds = time_left.total_seconds()
+        if 0 < seconds <= 3600:
+            return 'hour'
+        if 3600 < seconds <= 86400:
+            return 'day'
+        if 86400 < seconds <= 604800:
+            return 'week'
+        return None
+
+    @staticmethod
+    def reminder_message(event, kind):
+        """Return the message text of a week, day or hour reminder for an event."""
+        if event.event_type == Event.EventType.DEADLINE:
+            return NotificationService.DEADLINE_MESSAGES[kind]
+        label, icon = NotificationService.EVENT_TYPE_LABELS.get(event.event_type, ("Event", "📅"))
+        return NotificationService.EVENT_MESSAGES[kind].format(label=label, title=event.title)
 
     @staticmethod
-    def _notify_event_by_time(user, event, now):
-        """Send a time-based notification for an upcoming event."""
-        label, icon = NotificationService.EVENT_TYPE_LABELS.get(
-            event.event_type, ("Event", "📅")
+    def build_reminder(user_id, event, kind, due_at):
+        """Return an unsaved reminder notification for the occurrence due at due_at, for batch writers using bulk_create."""
+        label, icon = NotificationService.EVENT_TYPE_LABELS.get(event.event_type, ("Event", "📅"))
+        return Notification(
+            user_id=user_id,
+            title=f"{icon} {label}: {event.title}",
+            message=NotificationService.reminder_message(event, kind),
+            deadline=event,
+            type=NotificationService._get_notification_type(event.event_type),
+            reminder_kind=kind,
+            reminder_due_at=due_at,
         )
-        time_to_start = (event.start_datetime - now).total_seconds()
-        if 0 < time_to_start <= 3600:
-            msg = f'Your {label} "{event.title}" starts in 1 hour!'
-        elif 3600 < time_to_start <= 86400:
-            msg = f'Your {label} "{event.title}" starts tomorrow!'
-        elif 86400 < time_to_start <= 604800:
-            msg = f'Your {label} "{event.title}" is coming up this week!'
-        else:
-            return
-        NotificationService._notify_once(user, event, msg)
 
     @staticmethod
-    def create_message_notification(user, message):
-        """Create a notification for a new message."""
-        conversation = message.conversation
-        sender = message.sender
-        recipient = conversation.participants.exclude(id=sender.id).first()
-        if not recipient:
-            return
-        Notification.objects.create(
-            user=user,
-            title="New Message",
-            message=message,
-            type=Notification.Type.MESSAGE
+    def broadcast_reminder(event, kind, due_at):
+        """Send a global event's reminder to every active user. Returns the number of users reached.
+
+        Users are walked in id order, INSERT_CHUNK at a time, and each chunk is
+        its own short bulk insert, so announcing to tens of thousands of users
+        never holds one long transaction. Users who already have the reminder
+        are skipped by the (user, deadline, reminder_kind, reminder_due_at) constraint.
+        """
+        users = User.objects.filter(is_active=True).order_by('pk').values_list('pk', flat=True)
+        reached, last = 0, 0
+        while True:
+            ids = list(users.filter(pk__gt=last)[:NotificationService.INSERT_CHUNK])
+            if not ids:
+                return reached
+            Notification.objects.bulk_create(
+                [NotificationService.build_reminder(user_id, event, kind, due_at) for user_id in ids],
+                ignore_conflicts=True)
+            NotificationService.bulk_inserted(ids)
+            reached += len(ids)
+            last = ids[-1]
+            if len(ids) < NotificationService.INSERT_CHUNK:
+                return reached
+
+    @staticmethod
+    def due_reminders(now, user_range=None):
+        """Return unsaved reminders for every recipient of a deadline or event due within a week.
+
+        Runs a fixed number of queries however many users there are: the due
+        deadlines, the next occurrence of each due event, the events behind those
+        occurrences, and the subscribers of all of them. user_range = (first, last)
+        keeps only recipients with ids in that inclusive range; it is applied in
+        the queries, so a worker reads only the events its own users own or
+        subscribe to.
+        """
+        horizon = now + NotificationService.REMINDER_HORIZON
+        deadlines = Event.objects.filter(
+            event_type=Event.EventType.DEADLINE,
+            is_completed=False,
+            end_datetime__gt=now,
+            end_datetime__lte=horizon,
+        )
+        occurrences = EventOccurrence.objects.filter(
+            occurrence_start__gt=now,
+            occurrence_start__lte=horizon,
+            event__event_type__in=NotificationService.EVENT_REMINDER_TYPES,
+            event__is_completed=False,
+            event__status__in=[Event.EventStatus.UPCOMING, Event.EventStatus.ONGOING],
         )
+        subscriptions = EventSubscription.live().filter(
+            Q(event__in=deadlines) | Q(event__in=occurrences.values('event_id')),
+        )
+        if user_range:
+            first, last = user_range
+            subscriptions = subscriptions.filter(user_id__gte=first, user_id__lte=last)
+            subscribed = subscriptions.values('event_id')
+            owned = Q(creator_id__gte=first, creator_id__lte=last)
+            deadlines = deadlines.filter(owned | Q(pk__in=subscribed))
+            occurrences = occurrences.filter(owned | Q(event_id__in=subscribed))
+        next_starts = dict(occurrences.values('event_id').annotate(
+            first=Min('occurrence_start')).values_list('event_id', 'first').order_by())
+        due = {event.pk: (event, event.end_datetime) for event in deadlines}
+        for event in Event.objects.filter(pk__in=occurrences.values('event_id')):
+            due[event.pk] = (event, next_starts[event.pk])
+
+        recipients = [(event.creator_id, event_id) for event_id, (event, _) in due.items()]
+        recipients += subscriptions.values_list('user_id', 'event_id')
+        reminders = []
+        for user_id, event_id in recipients:
+            if user_id is None or event_id not in due:
+                continue
+            if user_range and not user_range[0] <= user_id <= user_range[1]:
+                continue
+            event, due_at = due[event_id]
+            reminders.append(NotificationService.build_reminder(
+                user_id, event, NotificationService._reminder_kind(due_at - now), due_at))
+        return reminders
 
     @staticmethod
-    def _notify_once(user, event, message):
-        """Create notification only if one does not already exist for this event and message."""
-        exists = Notification.objects.filter(
-            user=user,
-            deadline=event,
-            message=message
-        ).exists()
-        
-        if not exists:
-            label, icon = NotificationService.EVENT_TYPE_LABELS.get(
-                event.event_type, ("Event", "📅")
-            )
-            Notification.objects.create(
-                user=user,
-                title=f"{icon} {label}: {event.title}",
-                message=message,
-                deadline=event,
-                type=NotificationService._get_notification_type(event.event_type),
-            )
+    def create_due_reminders(now=None, user_range=None, dry_run=False):
+        """Insert the reminders from due_reminders in chunks. Returns the number of candidates.
+
+        Reminders already sent are skipped by the (user, deadline, reminder_kind,
+        reminder_due_at) unique constraint; nothing is written when dry_run is set.
+        """
+        reminders = NotificationService.due_reminders(now or timezone.now(), user_range)
+        if not dry_run:
+            for i in range(0, len(reminders), NotificationService.INSERT_CHUNK):
+                Notification.objects.bulk_create(
+                    reminders[i:i + NotificationService.INSERT_CHUNK], ignore_conflicts=True)
+            NotificationService.bulk_inserted(n.user_id for n in reminders)
+        return len(reminders)
 
     @staticmethod
     def notify_new_message(receiver, sender, content, conversation):
@@ -122,6 +192,89 @@ class NotificationService:
             conversation=conversation,
         )
 
+    @staticmethod
+    def actors_phrase(names, count):
+        """Return e.g. "alice", "alice and bob" or "alice and 41 others" for the most recent names first."""
+        if count <= 1 or not names:
+            return names[0] if names else "Someone"
+        if count == 2 and len(names) >= 2:
+            return f"{names[0]} and {names[1]}"
+        others = count - 1
+        return f"{names[0]} and {others} other{'s' if others > 1 else ''}"
+
+    @staticmethod
+    def notify_post_activity(recipient_id, post_id, actor, notification_type, verb, title, message):
+        """Notify a post's author (or a commenter) of activity on a post.
+
+        The notification is written after the transaction commits, batched
+        with the rest of the activity of the enclosing activity_buffer.collect().
+        "{actors}" in title and message is replaced by the actor phrase.
+        """
+        if recipient_id == actor.pk:
+            return
+        activity_buffer.defer(activity_buffer.PostActivity(
+            recipient_id, post_id, actor.pk, actor.username, notification_type, verb, title, message))
+
+    @staticmethod
+    def _fold(notification, activity):
+        """Add one activity to a notification: count the actor and re-render the text."""
+        names = notification.recent_actors
+        notification.actor_count += activity.actor_name not in names
+        names = [activity.actor_name] + [n for n in names if n != activity.actor_name]
+        notification.recent_actors = names[:NotificationService.RECENT_ACTORS]
+        phrase = NotificationService.actors_phrase(notification.recent_actors, notification.actor_count)
+        notification.title = activity.title.replace('{actors}', phrase)
+        notification.message = activity.message.replace('{actors}', phrase)
+        notification.sender_id = activity.actor_id
+
+    @staticmethod
+    def apply_post_activity(activities, now=None):
+        """Fold a batch of post activity into notifications. Returns the number applied.
+
+        Activity on the same post with the same verb goes into the recipient's
+        unread notification for it from the last AGGREGATION_WINDOW, which moves
+        to the top of the list ("alice and 41 others liked your post"); an actor
+        already among the recent names is not counted twice. One read finds the
+        open rows, then one bulk update and one bulk insert write the batch.
+        """
+        activities = [a for a in activities if a.recipient_id != a.actor_id]
+        if not activities:
+            return 0
+        now = now or timezone.now()
+        keys = {(a.recipient_id, a.post_id, a.verb) for a in activities}
+        open_rows = {}
+        candidates = Notification.objects.filter(
+            user_id__in={k[0] for k in keys}, post_id__in={k[1] for k in keys}, verb__in={k[2] for k in keys},
+            is_read=False, is_dismissed=False, created_at__gte=now - NotificationService.AGGREGATION_WINDOW,
+        ).order_by('created_at')
+        for notification in candidates:
+            key = (notification.user_id, notification.post_id, notification.verb)
+            if key in keys:
+                open_rows[key] = notification
+        touched, new_rows = {}, {}
+        for activity in activities:
+            key = (activity.recipient_id, activity.post_id, activity.verb)
+            if key in open_rows:
+                notification = touched[key] = open_rows[key]
+            elif key not in new_rows:
+                notification = new_rows[key] = Notification(
+                    user_id=activity.recipient_id, post_id=activity.post_id, verb=activity.verb,
+                    type=activity.type, actor_count=0, recent_actors=[])
+            else:
+                notification = new_rows[key]
+            NotificationService._fold(notification, activity)
+            notification.created_at = now
+        with transaction.atomic():
+            Notification.objects.bulk_update(
+                touched.values(),
+                ['title', 'message', 'actor_count', 'recent_actors', 'sender', 'created_at'],
+                batch_size=NotificationService.INSERT_CHUNK)
+            Notification.objects.bulk_create(new_rows.values(), batch_size=NotificationService.INSERT_CHUNK)
+            for user_id, count in Counter(n.user_id for n in new_rows.values()).items():
+                UserCounters.adjust(user_id, notifications=count)
+        NotificationService.push_sync({key[0] for key in keys})
+        return len(activities)
+
     @staticmethod
     def notify_follow_request(to_user, from_user):
         """Create a notification for a new follow request."""
@@ -152,6 +305,104 @@ class NotificationService:
             type=Notification.Type.EVENT,
         )
 
+    @staticmethod
+    def encode_cursor(notification):
+        """Return the opaque cursor of a notification: its created_at in microseconds and its id."""
+        return encode_cursor(notification)
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Return (created_at, id) from a cursor, or None when it is missing or malformed."""
+        return decode_cursor(cursor)
+
+    @staticmethod
+    def page(user, unread_only=False, cursor=None, page_size=None):
+        """Return (notifications, next_cursor) for one page of a user's undismissed notifications.
+
+        Keyset pagination on (created_at, id), newest first: the page after a
+        cursor starts strictly below it, so deep pages are an index range scan
+        like the first one. page_size + 1 rows are fetched to know whether there
+        is a next page, and no total is counted. next_cursor is None on the last page.
+        """
+        page_size = page_size or NotificationService.PAGE_SIZE
+        notifications = Notification.objects.filter(user=user, is_dismissed=False)
+        if unread_only:
+            notifications = notifications.filter(is_read=False)
+        position = NotificationService.decode_cursor(cursor)
+        if position:
+            created_at, pk = position
+            notifications = notifications.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+        rows = list(notifications.select_related('sender').order_by('-created_at', '-id')[:page_size + 1])
+        if len(rows) <= page_size:
+            return rows, None
+        rows = rows[:page_size]
+        return rows, NotificationService.encode_cursor(rows[-1])
+
+    @staticmethod
+    def summary(notification):
+        """Return the compact dict sent to the navbar by polling and by the push stream."""
+        return {
+            'id': notification.id,
+            'title': notification.title,
+            'message': notification.message,
+            'created_at': notification.created_at.strftime('%H:%M'),
+            'is_read': bool(notification.is_read),
+        }
+
+    @staticmethod
+    def unread_count(user_id):
+        """Return the number of unread, undismissed notifications of a user, from their counters row."""
+        return UserCounters.get(user_id).unread_notifications
+
+    @staticmethod
+    def set_read(user, is_read, ids=None):
+        """Mark the user's undismissed notifications, or those in ids, read or unread.
+        Returns the number changed; the unread counter moves by the same amount in the same transaction."""
+        notifications = Notification.objects.filter(user=user, is_dismissed=False, is_read=not is_read)
+        if ids is not None:
+            notifications = notifications.filter(pk__in=ids)
+        with transaction.atomic():
+            changed = notifications.update(is_read=is_read)
+            UserCounters.adjust(user.pk, notifications=-changed if is_read else changed)
+        if changed:
+            NotificationService.push_unread(user.pk)
+        return changed
+
+    @staticmethod
+    def dismiss(user, ids=None):
+        """Dismiss (and mark read) the user's notifications, or those in ids.
+        Returns the number dismissed; unread ones are taken off the counter."""
+        notifications = Notification.objects.filter(user=user, is_dismissed=False)
+        if ids is not None:
+            notifications = notifications.filter(pk__in=ids)
+        with transaction.atomic():
+            unread = notifications.filter(is_read=False).update(is_read=True, is_dismissed=True)
+            changed = unread + notifications.update(is_read=True, is_dismissed=True)
+            UserCounters.adjust(user.pk, notifications=-unread)
+        if unread:
+            NotificationService.push_unread(user.pk)
+        return changed
+
+    @staticmethod
+    def bulk_inserted(user_ids):
+        """Bring counters and open streams up to date after notifications were bulk-inserted.
+        bulk_create skips post_save, and ignore_conflicts hides which rows were new, so the
+        affected users are recounted."""
+        user_ids = set(user_ids)
+        UserCounters.recount(user_ids)
+        NotificationService.push_sync(user_ids)
+
+    @staticmethod
+    def push_unread(user_id):
+        """Push a user's current unread count to their open streams."""
+        realtime.publish([user_id], 'unread', {'unread_count': NotificationService.unread_count(user_id)})
+
+    @staticmethod
+    def push_sync(user_ids):
+        """Tell users' open streams to re-poll, after notifications were bulk-inserted without signals."""
+        realtime.publish(set(user_ids), 'sync', {})
+
     @staticmethod
     def _get_notification_type(event_type):
         """Map event type to notification type."""
@@ -163,4 +414,4 @@ class NotificationService:
             Event.EventType.STUDY_SESSION: Notification.Type.STUDY_SESSION,
             Event.EventType.OTHER:         Notification.Type.EVENT,
         }
-        return mapping.get(event_type, Notification.Type.EVENT)
\ No newline at end of file
+        return mapping.get(event_type, Notification.Type.EVENT)
\ No newline at end of file
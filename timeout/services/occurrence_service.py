@@ -0,0 +1,153 @@
+"""
+occurrence_service.py - Defines OccurrenceService for keeping the materialised EventOccurrence table
+in step with Event rows and for answering per-user date range queries against it.
+"""
+
+
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+from timeout.models import Event, EventSubscription
+from timeout.models.event_occurrence import EventOccurrence
+from timeout.services.recurrence import (
+    RECURRING, expand_event, window_bounds, window_q,
+)
+
+
+class OccurrenceService:
+    """Service for materialising event occurrences up to a rolling horizon.
+
+    Occurrences are written HORIZON_DAYS ahead of today, and reads are trusted
+    up to TRUSTED_DAYS ahead so a daily extend_occurrences run always keeps the
+    trusted range filled. Callers fall back to on-the-fly expansion beyond it.
+    """
+
+    HORIZON_DAYS = 400
+    TRUSTED_DAYS = 365
+    BATCH_SIZE = 500
+    SCHEDULE_FIELDS = {'start_datetime', 'end_datetime', 'recurrence', 'creator'}
+
+    @staticmethod
+    def horizon(today=None):
+        """Return the last date occurrences are materialised up to."""
+        today = today or timezone.now().date()
+        return today + timedelta(days=OccurrenceService.HORIZON_DAYS)
+
+    @staticmethod
+    def covers(last_date, today=None):
+        """Return True if the table can be trusted for dates up to last_date."""
+        today = today or timezone.now().date()
+        return last_date <= today + timedelta(days=OccurrenceService.TRUSTED_DAYS)
+
+    @staticmethod
+    def schedule_changed(event):
+        """Return True if any scheduling field differs from when the event was loaded."""
+        changed = event.changed_fields()
+        return bool({'creator_id' if f == 'creator' else f for f in OccurrenceService.SCHEDULE_FIELDS} & changed)
+
+    @staticmethod
+    def build(event, first, last):
+        """Return unsaved occurrences of event between the dates first and last."""
+        return [
+            EventOccurrence(
+                event=event,
+                creator_id=event.creator_id,
+                occurrence_start=start_dt,
+                occurrence_end=end_dt,
+            )
+            for start_dt, end_dt in expand_event(event, first, last)
+        ]
+
+    @staticmethod
+    def regenerate(event, until=None):
+        """Replace every stored occurrence of a single event."""
+        until = until or OccurrenceService.horizon()
+        anchor = event.start_datetime.date()
+        with transaction.atomic():
+            EventOccurrence.objects.filter(event=event).delete()
+            EventOccurrence.objects.bulk_create(
+                OccurrenceService.build(event, anchor, max(anchor, until)),
+                batch_size=OccurrenceService.BATCH_SIZE,
+            )
+
+    @staticmethod
+    def materialize_new(events, until=None):
+        """Store occurrences for freshly bulk-created events in one batched insert.
+
+        bulk_create skips post_save, so batch writers call this instead of
+        relying on the signal.
+        """
+        until = until or OccurrenceService.horizon()
+        rows = []
+        for event in events:
+            anchor = event.start_datetime.date()
+            rows.extend(OccurrenceService.build(event, anchor, max(anchor, until)))
+        EventOccurrence.objects.bulk_create(rows, batch_size=OccurrenceService.BATCH_SIZE)
+
+    @staticmethod
+    def regenerate_many(events, until=None):
+        """Replace the stored occurrences of many events with one delete and one insert.
+
+        The batch counterpart of regenerate for writers using bulk_update.
+        """
+        with transaction.atomic():
+            EventOccurrence.objects.filter(event__in=[e.pk for e in events]).delete()
+            OccurrenceService.materialize_new(events, until)
+
+    @staticmethod
+    def extend(until=None):
+        """Append occurrences of every recurring series up to until.
+
+        Only the dates after each series' last stored occurrence are generated.
+        Returns the number of rows created.
+        """
+        until = until or OccurrenceService.horizon()
+        series = Event.objects.filter(
+            recurrence__in=RECURRING,
+            start_datetime__lte=window_bounds(until, until)[1],
+        ).annotate(last_stored=Max('occurrences__occurrence_start'))
+        pending, created = [], 0
+        for event in series.iterator(chunk_size=OccurrenceService.BATCH_SIZE):
+            first = event.start_datetime.date()
+            if event.last_stored:
+                first = event.last_stored.date() + timedelta(days=1)
+            if first <= until:
+                pending.extend(OccurrenceService.build(event, first, until))
+            if len(pending) >= OccurrenceService.BATCH_SIZE:
+                created += len(EventOccurrence.objects.bulk_create(pending, ignore_conflicts=True))
+                pending = []
+        if pending:
+            created += len(EventOccurrence.objects.bulk_create(pending, ignore_conflicts=True))
+        return created
+
+    @staticmethod
+    def for_user(user, start_dt, end_dt):
+        """Return occurrences visible to user that overlap [start_dt, end_dt]."""
+        return EventOccurrence.objects.filter(
+            Q(creator=user) | Q(event__is_global=True) | Q(event_id__in=EventSubscription.event_ids(user)),
+            occurrence_start__lte=end_dt,
+            occurrence_end__gte=start_dt,
+        ).select_related('event').order_by('occurrence_start')
+
+    @staticmethod
+    def visible_in_window(user, first, last):
+        """Yield (event, start_dt, end_dt) for occurrences starting within the dates first..last.
+
+        Served from the table while the window is inside the trusted horizon,
+        otherwise expanded on the fly from the window-bounded event query.
+        """
+        if OccurrenceService.covers(last):
+            start_dt, end_dt = window_bounds(first, last)
+            rows = OccurrenceService.for_user(user, start_dt, end_dt).filter(
+                occurrence_start__gte=start_dt)
+            for occ in rows:
+                yield occ.event, occ.occurrence_start, occ.occurrence_end
+            return
+        events = Event.objects.filter(
+            Q(creator=user) | Q(is_global=True) | Q(pk__in=EventSubscription.event_ids(user)),
+            window_q(first, last),
+        ).order_by('start_datetime')
+        for event in events:
+            for start_dt, end_dt in expand_event(event, first, last):
+                yield event, start_dt, end_dt
@@ -0,0 +1,111 @@
+"""
+realtime.py - Publish/subscribe hub behind the Server-Sent Events stream. Writers publish small
+JSON events to user ids after their transaction commits; each open stream holds a subscription
+queue for its user. The backend is pluggable through settings.REALTIME_BACKEND.
+"""
+
+
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+DEFAULT_BACKEND = 'timeout.services.realtime.LocalBackend'
+QUEUE_SIZE = 100
+
+
+class BaseBackend:
+    """Interface of a realtime backend.
+
+    publish may be called from any thread; subscribe and unsubscribe are called
+    from the event loop serving the stream. A cross-process backend (e.g. one
+    relaying through Redis) implements the same three methods.
+    """
+
+    def publish(self, user_id, event, data):
+        """Deliver an event to every open subscription of a user."""
+        raise NotImplementedError
+
+    def subscribe(self, user_id):
+        """Return an asyncio.Queue receiving (event, data) pairs for a user."""
+        raise NotImplementedError
+
+    def unsubscribe(self, user_id, queue):
+        """Stop delivering to a queue returned by subscribe."""
+        raise NotImplementedError
+
+
+class LocalBackend(BaseBackend):
+    """In-process backend: events reach the streams served by the same process.
+
+    Queues are bounded; a stream that falls QUEUE_SIZE events behind drops the
+    overflow, and the client's fallback poll catches it up.
+    """
+
+    def __init__(self):
+        """Start with no subscriptions."""
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, user_id, event, data):
+        """Hand the event to each subscribed queue on its own event loop."""
+        with self._lock:
+            targets = list(self._subscribers.get(user_id, ()))
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, (event, data))
+            except RuntimeError:
+                # The loop serving this stream has closed.
+                self.unsubscribe(user_id, queue)
+
+    def subscribe(self, user_id):
+        """Register a new queue bound to the running event loop."""
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[user_id].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        """Remove a queue, dropping the user's entry once it has none left."""
+        with self._lock:
+            entries = self._subscribers.get(user_id, set())
+            entries -= {entry for entry in entries if entry[1] is queue}
+            if not entries:
+                self._subscribers.pop(user_id, None)
+
+
+def _offer(queue, item):
+    """Put an item on a queue unless it is full."""
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        pass
+
+
+@lru_cache(maxsize=1)
+def get_backend():
+    """Return the configured backend instance, shared by the whole process."""
+    return import_string(getattr(settings, 'REALTIME_BACKEND', DEFAULT_BACKEND))()
+
+
+def publish(user_ids, event, data):
+    """Publish an event to users once the current transaction commits."""
+    user_ids = list(user_ids)
+
+    def send():
+        backend = get_backend()
+        for user_id in user_ids:
+            backend.publish(user_id, event, data)
+
+    if user_ids:
+        transaction.on_commit(send)
+
+
+def format_event(event, data):
+    """Encode one event in the text/event-stream wire format."""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
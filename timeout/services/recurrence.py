@@ -0,0 +1,98 @@
+"""
+recurrence.py - Window-bounded expansion of recurring events. Occurrences are computed
+arithmetically from the series anchor, so the cost depends on the size of the visible
+window rather than on how long ago the series started.
+"""
+
+
+import calendar as cal
+from datetime import date, datetime, time, timedelta
+from django.db.models import Q
+from django.utils import timezone
+
+RECURRING = ('daily', 'weekly', 'monthly')
+
+STEP_DAYS = {'daily': 1, 'weekly': 7}
+
+
+def shift_months(anchor, months):
+    """Return anchor moved forward by whole months, clamping the day to the month length."""
+    month_index = anchor.month - 1 + months
+    year_num, month_num = anchor.year + month_index // 12, month_index % 12 + 1
+    day_num = min(anchor.day, cal.monthrange(year_num, month_num)[1])
+    return date(year_num, month_num, day_num)
+
+
+def advance_date(current_date, recurrence):
+    """Return the next occurrence date. Returns None if the recurrence is not recognized."""
+    if recurrence in STEP_DAYS:
+        return current_date + timedelta(days=STEP_DAYS[recurrence])
+    if recurrence == 'monthly':
+        return shift_months(current_date, 1)
+    return None
+
+
+def nth_occurrence(anchor, recurrence, n):
+    """Return the date of the n-th occurrence of a series (the anchor is n=0)."""
+    if recurrence == 'monthly':
+        return shift_months(anchor, n)
+    return anchor + timedelta(days=STEP_DAYS[recurrence] * n)
+
+
+def first_index_on_or_after(anchor, recurrence, first):
+    """Return the index of the first occurrence falling on or after the date first."""
+    if first <= anchor:
+        return 0
+    if recurrence == 'monthly':
+        n = (first.year - anchor.year) * 12 + first.month - anchor.month
+        return n if shift_months(anchor, n) >= first else n + 1
+    step = STEP_DAYS[recurrence]
+    return -(-(first - anchor).days // step)
+
+
+def occurrence_dates(anchor, recurrence, first, last):
+    """Yield every occurrence date of a series within [first, last], both inclusive."""
+    if recurrence not in RECURRING:
+        if first <= anchor <= last:
+            yield anchor
+        return
+    n = first_index_on_or_after(anchor, recurrence, first)
+    current = nth_occurrence(anchor, recurrence, n)
+    while current <= last:
+        yield current
+        n += 1
+        current = nth_occurrence(anchor, recurrence, n)
+
+
+def expand_event(event, first, last):
+    """Yield (start_dt, end_dt) pairs for every occurrence of event within [first, last].
+
+    The original occurrence keeps its stored datetimes; repeats keep the wall-clock
+    start time and duration of the original.
+    """
+    anchor = event.start_datetime.date()
+    duration = event.end_datetime - event.start_datetime
+    for current_date in occurrence_dates(anchor, event.recurrence, first, last):
+        if current_date == anchor:
+            yield event.start_datetime, event.end_datetime
+            continue
+        start_dt = timezone.make_aware(
+            datetime.combine(current_date, event.start_datetime.time()),
+        )
+        yield start_dt, start_dt + duration
+
+
+def window_bounds(first, last):
+    """Return aware datetimes covering the whole of the dates first..last."""
+    return (
+        timezone.make_aware(datetime.combine(first, time.min)),
+        timezone.make_aware(datetime.combine(last, time.max)),
+    )
+
+
+def window_q(first, last):
+    """Return a Q matching one-off events overlapping [first, last] and recurring
+    series that started on or before last."""
+    start_dt, end_dt = window_bounds(first, last)
+    recurring = Q(recurrence__in=RECURRING)
+    return Q(start_datetime__lte=end_dt) & (recurring | Q(end_datetime__gte=start_dt))
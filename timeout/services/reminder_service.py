@@ -0,0 +1,229 @@
+"""
+reminder_service.py - Defines ReminderService for keeping the ReminderSchedule table in step with
+events and subscriptions, and for firing due reminders as notifications in batches.
+"""
+
+
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+from timeout.models import Event, EventOccurrence, EventSubscription, ReminderSchedule
+from timeout.models.notification import Notification
+from timeout.services.notification_service import NotificationService
+
+
+class ReminderService:
+    """Service for the precomputed reminder schedule.
+
+    Each event gets up to three rows per recipient (week, day and hour before
+    it is due), written when it is saved. Windows already entered collapse
+    into a single row firing immediately, so an event created two days ahead
+    gets an immediate week reminder followed by its day and hour ones.
+    Global events get one row per window with no user instead, broadcast to
+    everyone in chunks when it fires. When the hour reminder of a recurring
+    event fires, the rows of its next occurrence are written, for the windows
+    shorter than the gap to it: a daily class is only re-armed an hour ahead.
+    """
+
+    BATCH_SIZE = 500
+    # Tightest window first; see _rows.
+    WINDOWS = (
+        (ReminderSchedule.Kind.HOUR, timedelta(hours=1)),
+        (ReminderSchedule.Kind.DAY,  timedelta(days=1)),
+        (ReminderSchedule.Kind.WEEK, timedelta(weeks=1)),
+    )
+    SCHEDULE_FIELDS = {'start_datetime', 'end_datetime', 'recurrence', 'creator_id', 'event_type', 'is_global',
+                       'visibility'}
+    ACTIVE_STATUSES = (Event.EventStatus.UPCOMING, Event.EventStatus.ONGOING)
+
+    @staticmethod
+    def needs_reschedule(event, created, update_fields):
+        """Return True if a save may have moved the event's reminders.
+        Completion and status are checked when a reminder fires, so toggling them writes nothing here."""
+        if created:
+            return True
+        if update_fields is not None:
+            names = {'creator_id' if f == 'creator' else f for f in update_fields}
+            return bool(names & ReminderService.SCHEDULE_FIELDS)
+        return bool(event.changed_fields() & ReminderService.SCHEDULE_FIELDS)
+
+    @staticmethod
+    def _due_times(events, now):
+        """Map event id to the time each event is due: a deadline's end, otherwise its next start."""
+        due = {}
+        others = []
+        for event in events:
+            if event.is_completed:
+                continue
+            if event.event_type == Event.EventType.DEADLINE:
+                if event.end_datetime > now:
+                    due[event.pk] = event.end_datetime
+            elif event.status in ReminderService.ACTIVE_STATUSES:
+                others.append(event.pk)
+        if others:
+            next_starts = EventOccurrence.objects.filter(
+                event_id__in=others, occurrence_start__gt=now,
+            ).values('event_id').annotate(next_start=Min('occurrence_start'))
+            due.update((row['event_id'], row['next_start']) for row in next_starts)
+        return due
+
+    @staticmethod
+    def _rows(user_id, event_id, due_at, now, shorter_than=None):
+        """Return the pending reminder rows for one recipient of one event.
+        shorter_than skips the windows at least that long, e.g. the gap between two occurrences."""
+        rows = []
+        for kind, delta in ReminderService.WINDOWS:
+            if shorter_than is not None and delta >= shorter_than:
+                break
+            fire_at = due_at - delta
+            if fire_at <= now:
+                # Already inside this window: remind now and skip the looser ones.
+                rows.append(ReminderSchedule(user_id=user_id, event_id=event_id, kind=kind,
+                                             fire_at=now, due_at=due_at))
+                break
+            rows.append(ReminderSchedule(user_id=user_id, event_id=event_id, kind=kind,
+                                         fire_at=fire_at, due_at=due_at))
+        return rows
+
+    @staticmethod
+    def schedule_events(events, user_ids=None, now=None):
+        """Rewrite the reminder rows of events for their creators and subscribers.
+        Subscribers of an event made private get none until it is public again.
+
+        user_ids narrows the rewrite to some recipients, e.g. a new subscriber.
+        Batch writers using bulk_create or bulk_update call this directly.
+        """
+        events = [e for e in events if e.pk]
+        if not events:
+            return
+        now = now or timezone.now()
+        ids = [e.pk for e in events]
+        recipients = {e.pk: {e.creator_id} - {None} for e in events}
+        for event_id, user_id in EventSubscription.live().filter(
+                event_id__in=ids).values_list('event_id', 'user_id'):
+            recipients[event_id].add(user_id)
+        # A global event reaches everyone, its creator and subscribers included: one broadcast row.
+        recipients.update((e.pk, {None}) for e in events if e.is_global)
+        stale = ReminderSchedule.objects.filter(event_id__in=ids)
+        if user_ids is not None:
+            user_ids = set(user_ids)
+            recipients = {pk: users & user_ids for pk, users in recipients.items()}
+            stale = stale.filter(user_id__in=user_ids)
+        rows = []
+        for event_id, due_at in ReminderService._due_times(events, now).items():
+            for user_id in recipients[event_id]:
+                rows.extend(ReminderService._rows(user_id, event_id, due_at, now))
+        with transaction.atomic():
+            stale.delete()
+            ReminderSchedule.objects.bulk_create(
+                rows, batch_size=ReminderService.BATCH_SIZE, ignore_conflicts=True)
+
+    @staticmethod
+    def unschedule(user_id, event_id):
+        """Drop a user's pending reminders for an event, e.g. after unsubscribing."""
+        ReminderSchedule.objects.filter(user_id=user_id, event_id=event_id).delete()
+
+    @staticmethod
+    def rebuild(now=None):
+        """Schedule reminders for every event not yet due. Returns the number of events scanned."""
+        now = now or timezone.now()
+        pending = Event.objects.filter(is_completed=False, end_datetime__gt=now).order_by('pk')
+        batch, scanned = [], 0
+        for event in pending.iterator(chunk_size=ReminderService.BATCH_SIZE):
+            batch.append(event)
+            if len(batch) >= ReminderService.BATCH_SIZE:
+                ReminderService.schedule_events(batch, now=now)
+                scanned += len(batch)
+                batch = []
+        ReminderService.schedule_events(batch, now=now)
+        return scanned + len(batch)
+
+    @staticmethod
+    def _still_due(row, now):
+        """Return True if a due row should still produce a notification.
+
+        Rows are dropped once their event is done, cancelled or past, and when a
+        tighter window has been entered too (the runner was not running).
+        """
+        event = row.event
+        if event.is_completed or row.due_at <= now:
+            return False
+        if event.event_type != Event.EventType.DEADLINE and event.status not in ReminderService.ACTIVE_STATUSES:
+            return False
+        for kind, delta in ReminderService.WINDOWS:
+            if kind == row.kind:
+                return True
+            if row.due_at - delta <= now:
+                return False
+        return True
+
+    @staticmethod
+    def _next_rows(fired, now):
+        """Return the reminder rows of the next occurrence for fired rows that ended an occurrence.
+
+        The hour reminder is the last one of an occurrence, so once it is handled
+        its recipient is armed for the first occurrence after it, with one query.
+        Only windows shorter than the gap between the two are armed; a longer one
+        would open before the occurrence just reminded about has even started.
+        """
+        after = {}
+        for row in fired:
+            event = row.event
+            if (row.kind != ReminderSchedule.Kind.HOUR or event.recurrence == Event.EventRecurrence.NONE
+                    or event.event_type == Event.EventType.DEADLINE or event.is_completed
+                    or event.status not in ReminderService.ACTIVE_STATUSES):
+                continue
+            after[row.event_id] = max(after.get(row.event_id, now), row.due_at)
+        if not after:
+            return []
+        window = Q()
+        for event_id, moment in after.items():
+            window |= Q(event_id=event_id, occurrence_start__gt=moment)
+        next_starts = dict(EventOccurrence.objects.filter(window).values('event_id')
+                           .annotate(next_start=Min('occurrence_start')).values_list('event_id', 'next_start'))
+        rows = []
+        for row in fired:
+            if row.event_id in next_starts and row.kind == ReminderSchedule.Kind.HOUR:
+                next_start = next_starts[row.event_id]
+                rows.extend(ReminderService._rows(row.user_id, row.event_id, next_start, now,
+                                                  shorter_than=next_start - row.due_at))
+        return rows
+
+    @staticmethod
+    def fire_due(now=None):
+        """Turn every reminder with fire_at <= now into a notification. Returns the number fired.
+
+        Works through the due rows in batches: one indexed read, one insert and
+        one delete. Reminders already sent, e.g. by check_notifications, are
+        skipped by the notification's (user, deadline, reminder_kind,
+        reminder_due_at) constraint, which lets every occurrence of a recurring
+        event have its own. Recurring events are then re-armed for their next
+        occurrence (see _next_rows).
+        Broadcast rows are fanned out afterwards and deleted once every chunk is
+        in, so a run that stops halfway resumes where the constraint left off.
+        """
+        now = now or timezone.now()
+        fired = 0
+        while True:
+            due = list(ReminderSchedule.objects.filter(fire_at__lte=now)
+                       .select_related('event').order_by('fire_at')[:ReminderService.BATCH_SIZE])
+            if not due:
+                return fired
+            live = [row for row in due if ReminderService._still_due(row, now)]
+            broadcasts = [row for row in live if row.user_id is None]
+            broadcast_ids = {row.pk for row in broadcasts}
+            reminders = [NotificationService.build_reminder(row.user_id, row.event, row.kind, row.due_at)
+                         for row in live if row.user_id is not None]
+            with transaction.atomic():
+                Notification.objects.bulk_create(reminders, ignore_conflicts=True)
+                ReminderSchedule.objects.filter(
+                    pk__in=[row.pk for row in due if row.pk not in broadcast_ids]).delete()
+                ReminderSchedule.objects.bulk_create(ReminderService._next_rows(due, now), ignore_conflicts=True)
+            NotificationService.bulk_inserted(n.user_id for n in reminders)
+            fired += len(reminders)
+            for row in broadcasts:
+                fired += NotificationService.broadcast_reminder(row.event, row.kind, row.due_at)
+                row.delete()
+            if len(due) < ReminderService.BATCH_SIZE:
+                return fired
@@ -0,0 +1,93 @@
+"""
+retention_service.py - Defines RetentionService for purging old notifications in bounded batches
+according to settings.NOTIFICATION_RETENTION.
+"""
+
+
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from timeout.models import Event
+from timeout.models.notification import Notification
+from timeout.services.notification_service import NotificationService
+
+
+class RetentionService:
+    """Service for keeping the notification table small.
+
+    Three rules, each an age in days (None disables it):
+    - DISMISSED_DAYS: dismissed notifications, which no page shows any more
+    - READ_DAYS: read notifications still in the list
+    - EXPIRED_REMINDER_DAYS: week/day/hour reminders of one-off events that
+      have ended, read or not; this compacts the up to three rows per event
+    """
+
+    DEFAULTS = {
+        'DISMISSED_DAYS': 7,
+        'READ_DAYS': 90,
+        'EXPIRED_REMINDER_DAYS': 1,
+        'BATCH_SIZE': 1000,
+    }
+
+    @staticmethod
+    def policy():
+        """Return the retention policy: the defaults overridden by settings.NOTIFICATION_RETENTION."""
+        return {**RetentionService.DEFAULTS, **getattr(settings, 'NOTIFICATION_RETENTION', {})}
+
+    @staticmethod
+    def rules(now=None, policy=None):
+        """Return (name, queryset) pairs for the enabled rules."""
+        now = now or timezone.now()
+        policy = policy or RetentionService.policy()
+        rules = []
+        if policy['DISMISSED_DAYS'] is not None:
+            rules.append(('dismissed', Notification.objects.filter(
+                is_dismissed=True, created_at__lt=now - timedelta(days=policy['DISMISSED_DAYS']))))
+        if policy['READ_DAYS'] is not None:
+            rules.append(('read', Notification.objects.filter(
+                is_read=True, is_dismissed=False, created_at__lt=now - timedelta(days=policy['READ_DAYS']))))
+        if policy['EXPIRED_REMINDER_DAYS'] is not None:
+            rules.append(('expired_reminders', Notification.objects.filter(
+                reminder_kind__isnull=False,
+                deadline__recurrence=Event.EventRecurrence.NONE,
+                deadline__end_datetime__lt=now - timedelta(days=policy['EXPIRED_REMINDER_DAYS']))))
+        return rules
+
+    @staticmethod
+    def _delete_batch(queryset, batch_size):
+        """Delete up to batch_size rows of queryset. Returns the number deleted.
+
+        The batch is deleted through the ORM by primary key, so the delete
+        signal takes each unread row off its user's counter; those users'
+        open tabs are then told to refresh.
+        """
+        rows = list(queryset.order_by('pk').values_list('pk', 'user_id', 'is_read', 'is_dismissed')[:batch_size])
+        if not rows:
+            return 0
+        unread_users = {user_id for _, user_id, is_read, is_dismissed in rows if not is_read and not is_dismissed}
+        with transaction.atomic():
+            deleted, _ = Notification.objects.filter(pk__in=[row[0] for row in rows]).delete()
+        if unread_users:
+            NotificationService.push_sync(unread_users)
+        return deleted
+
+    @staticmethod
+    def purge(now=None, policy=None, dry_run=False, max_batches=None):
+        """Apply every rule, batch by batch. Returns a dict of rule name to rows deleted
+        (or that would be, with dry_run). max_batches bounds the batches per rule."""
+        policy = policy or RetentionService.policy()
+        batch_size = policy['BATCH_SIZE']
+        purged = {}
+        for name, queryset in RetentionService.rules(now, policy):
+            if dry_run:
+                purged[name] = queryset.count()
+                continue
+            purged[name] = batches = 0
+            while max_batches is None or batches < max_batches:
+                deleted = RetentionService._delete_batch(queryset, batch_size)
+                purged[name] += deleted
+                batches += 1
+                if deleted < batch_size:
+                    break
+        return purged
@@ -4,25 +4,28 @@ study_planner.py - Provides functions to calculate free time slots for a user ba
 
 
 from datetime import timedelta
-from timeout.models import Event
+from django.db.models import Q
+from timeout.models import EventOccurrence, EventSubscription
+from timeout.services.interval_index import IntervalIndex
 
 
 def get_busy_slots(user, start, end):
-    """Return a list of (start, end) tuples for all events owned by the user
-    that overlap the given time window [start, end)."""
-    events = Event.objects.filter(
-        creator=user,
-        start_datetime__lt=end,
-        end_datetime__gt=start,
-    ).order_by('start_datetime')
-    return [(e.start_datetime, e.end_datetime) for e in events]
+    """Return a list of (start, end) tuples for all event occurrences owned by or subscribed
+    to by the user that overlap the given time window [start, end), including recurring repeats."""
+    occurrences = EventOccurrence.objects.filter(
+        Q(creator=user) | Q(event_id__in=EventSubscription.event_ids(user)),
+        occurrence_start__lt=end,
+        occurrence_end__gt=start,
+    ).order_by('occurrence_start')
+    return list(occurrences.values_list('occurrence_start', 'occurrence_end'))
 
 
 def get_free_slots(user, start, end, min_hours):
-    """Return list of free slot dicts within 8am–10pm each day."""
+    """Return list of free slot dicts within 8am–10pm each day.
+    The busy times are indexed once, so each day costs O(log n + k) rather than a full scan."""
     if end <= start:
         return []
-    busy = get_busy_slots(user, start, end)
+    busy = IntervalIndex(get_busy_slots(user, start, end))
     free = []
     day = start.replace(hour=8, minute=0, second=0, microsecond=0)
     if day < start:
@@ -87,26 +90,10 @@ def _nearest_slot(by_date, target, deadline):
 
 
 def _day_slots(day_start, day_end, busy, min_hours):
-    """Find free gaps within a single day."""
-    slots = []
-    cursor = day_start
-    min_gap = timedelta(hours=min_hours)
-
-    for b_start, b_end in busy:
-        if b_start >= day_end or b_end <= day_start:
-            continue
-        if cursor < b_start and (b_start - cursor) >= min_gap:
-            slots.append({
-                'start': cursor.strftime('%Y-%m-%dT%H:%M'),
-                'end': b_start.strftime('%Y-%m-%dT%H:%M'),
-            })
-        if b_end > cursor:
-            cursor = b_end
-
-    if cursor < day_end and (day_end - cursor) >= min_gap:
-        slots.append({
-            'start': cursor.strftime('%Y-%m-%dT%H:%M'),
-            'end': day_end.strftime('%Y-%m-%dT%H:%M'),
-        })
-
-    return slots
+    """Find free gaps within a single day. busy is an IntervalIndex or a list of (start, end) pairs."""
+    if not isinstance(busy, IntervalIndex):
+        busy = IntervalIndex(busy)
+    return [
+        {'start': gap_start.strftime('%Y-%m-%dT%H:%M'), 'end': gap_end.strftime('%Y-%m-%dT%H:%M')}
+        for gap_start, gap_end in busy.gaps(day_start, day_end, timedelta(hours=min_hours))
+    ]
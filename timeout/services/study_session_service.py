@@ -0,0 +1,146 @@
+"""
+study_session_service.py - Defines StudySessionService for creating and rescheduling batches of
+study sessions. Every session is validated before anything is written, and all writes for a batch
+happen in one transaction with bulk_create or bulk_update.
+"""
+
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from timeout.models import Event
+from timeout.services.event_service import EventService
+from timeout.services.interval_index import IntervalIndex
+from timeout.services.occurrence_service import OccurrenceService
+from timeout.services.reminder_service import ReminderService
+from timeout.utils import parse_aware_dt
+
+
+def _parse_slot(data):
+    """Return the (start, end) aware datetimes of a submitted session dict."""
+    return parse_aware_dt(data['start']), parse_aware_dt(data['end'])
+
+
+def _validate(event, busy_index):
+    """Run model validation without per-row queries, then reserve the event's slot.
+
+    The overlap check in Event.clean reads the shared busy_index, and each
+    accepted session is added to it so sessions in one batch cannot collide.
+    """
+    event.busy_index = busy_index
+    try:
+        event.full_clean(exclude=['creator', 'linked_study_sessions'], validate_unique=False)
+    finally:
+        del event.busy_index
+    busy_index.add(event.start_datetime, event.end_datetime)
+
+
+def _busy_index(user, slots, exclude_ids=()):
+    """Index the user's blocking events across the span of the submitted slots."""
+    if not slots:
+        return IntervalIndex()
+    return IntervalIndex.for_user(
+        user, min(s for s, _ in slots), max(e for _, e in slots),
+        exclude_ids=exclude_ids, event_types=Event.BLOCKING_TYPES)
+
+
+class StudySessionService:
+    """Service for batch writes of study session events."""
+
+    @staticmethod
+    def create_sessions(user, sessions):
+        """Create private study sessions from submitted dicts. Returns the created events.
+
+        Invalid entries are skipped; the valid ones are inserted together.
+        """
+        candidates = []
+        for data in sessions:
+            try:
+                start, end = _parse_slot(data)
+                candidates.append(Event(
+                    creator=user, title=data['title'],
+                    event_type=Event.EventType.STUDY_SESSION,
+                    start_datetime=start, end_datetime=end,
+                    visibility=Event.Visibility.PRIVATE,
+                ))
+            except (KeyError, TypeError, ValueError):
+                continue
+        busy_index = _busy_index(user, [(e.start_datetime, e.end_datetime) for e in candidates])
+        events = []
+        for event in candidates:
+            try:
+                _validate(event, busy_index)
+            except ValidationError:
+                continue
+            events.append(event)
+        if not events:
+            return []
+        with transaction.atomic():
+            created = Event.objects.bulk_create(events)
+            OccurrenceService.materialize_new(created)
+        ReminderService.schedule_events(created)
+        return created
+
+    @staticmethod
+    def apply_schedule(user, sessions):
+        """Move the user's study sessions to new slots. Returns one result dict per entry.
+
+        All referenced sessions are fetched with a single id__in query and every
+        new slot is validated, including overlaps against one prebuilt interval index,
+        before the transaction starts. Entries that fail validation are reported and
+        left as they were; the valid ones are written together. A rejected session
+        keeps its old slot, and when that clashes with an accepted move the rest
+        are revalidated with it back in the index.
+        """
+        results, slots = [], {}
+        for data in sessions:
+            try:
+                pk = int(data['id'])
+                slots[pk] = _parse_slot(data)
+                results.append({'id': pk, 'success': True})
+            except (KeyError, TypeError, ValueError):
+                results.append({'id': data.get('id') if isinstance(data, dict) else None,
+                                'success': False, 'error': 'Invalid session data.'})
+
+        found = Event.objects.filter(
+            creator=user, event_type=Event.EventType.STUDY_SESSION, pk__in=slots,
+        ).in_bulk()
+        old_slots = {pk: (event.start_datetime, event.end_datetime) for pk, event in found.items()}
+        errors = {}
+        while True:
+            moving = [pk for pk in slots if pk in found and pk not in errors]
+            busy_index = _busy_index(user, [slots[pk] for pk in moving], exclude_ids=moving)
+            rejected = {}
+            for pk in moving:
+                event = found[pk]
+                event.start_datetime, event.end_datetime = slots[pk]
+                try:
+                    _validate(event, busy_index)
+                except ValidationError as exc:
+                    rejected[pk] = ' '.join(exc.messages)
+            errors.update(rejected)
+            accepted = IntervalIndex(slots[pk] for pk in moving if pk not in rejected)
+            if not any(accepted.overlaps(*old_slots[pk]) for pk in rejected):
+                break
+
+        changed, now = {}, timezone.now()
+        for result in results:
+            if not result['success']:
+                continue
+            if result['id'] not in found:
+                result.update(success=False, error='Study session not found.')
+            elif result['id'] in errors:
+                result.update(success=False, error=errors[result['id']])
+            else:
+                event = found[result['id']]
+                event.updated_at = now
+                changed[event.pk] = event
+
+        if changed:
+            events = list(changed.values())
+            with transaction.atomic():
+                Event.objects.bulk_update(events, ['start_datetime', 'end_datetime', 'updated_at'])
+                OccurrenceService.regenerate_many(events)
+                EventService.sync_posts([e for e in events if e.visibility == Event.Visibility.PUBLIC])
+            ReminderService.schedule_events(events)
+        return results
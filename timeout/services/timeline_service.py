@@ -0,0 +1,201 @@
+"""
+timeline_service.py - Defines TimelineService for the fan-out-on-write home timelines behind the
+following feed: delivering new posts to followers, with large audiences queued for the
+fan_out_timelines runner, backfilling and pruning on follow changes, and the hybrid read for
+authors with too many followers to fan out to.
+"""
+
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from timeout.models import PendingFanout, Post, TimelineEntry, User
+
+Follow = User.following.through
+
+
+class TimelineService:
+    """Service for the precomputed following feed.
+
+    Every post gets a TimelineEntry for its author and each follower when it
+    is created. The author's row and the first FANOUT_CHUNK followers are
+    written in the request; the rest of a larger audience is queued in
+    PendingFanout and written by the fan_out_timelines runner, one insert per chunk.
+    Authors with more than settings.TIMELINE_FANOUT_LIMIT followers are
+    "heavy": their posts are not fanned out but merged into each follower's
+    feed when it is read.
+    """
+
+    FANOUT_CHUNK = 1000
+    BACKFILL_POSTS = 100
+    DEFAULT_FANOUT_LIMIT = 10000
+    HEAVY_AUTHORS_KEY = 'timeline_heavy_authors'
+    HEAVY_AUTHORS_TIMEOUT = 600
+
+    @staticmethod
+    def fanout_limit():
+        """Return the follower count above which an author's posts are read rather than written."""
+        return getattr(settings, 'TIMELINE_FANOUT_LIMIT', TimelineService.DEFAULT_FANOUT_LIMIT)
+
+    @staticmethod
+    def heavy_author_ids():
+        """Return the ids of the heavy authors, recounted at most every HEAVY_AUTHORS_TIMEOUT seconds."""
+        ids = cache.get(TimelineService.HEAVY_AUTHORS_KEY)
+        if ids is None:
+            ids = frozenset(
+                Follow.objects.values('to_user_id').annotate(n=Count('id'))
+                .filter(n__gt=TimelineService.fanout_limit()).values_list('to_user_id', flat=True))
+            cache.set(TimelineService.HEAVY_AUTHORS_KEY, ids, TimelineService.HEAVY_AUTHORS_TIMEOUT)
+        return ids
+
+    @staticmethod
+    def followed_heavy_ids(user):
+        """Return the heavy authors a user follows; no query when there are none at all."""
+        heavy = TimelineService.heavy_author_ids()
+        if not heavy:
+            return []
+        return list(user.following.filter(pk__in=heavy).values_list('pk', flat=True))
+
+    @staticmethod
+    def _entries(owner_ids, posts):
+        """Return unsaved timeline rows delivering each post to each owner."""
+        return [TimelineEntry(owner_id=owner_id, post_id=post.pk, author_id=post.author_id,
+                              created_at=post.created_at)
+                for owner_id in owner_ids for post in posts]
+
+    @staticmethod
+    def _follower_chunks(author_id, after=0):
+        """Yield the ids of the author's followers above `after` in id order, FANOUT_CHUNK at a time."""
+        followers = (Follow.objects.filter(to_user_id=author_id)
+                     .order_by('from_user_id').values_list('from_user_id', flat=True))
+        while True:
+            ids = list(followers.filter(from_user_id__gt=after)[:TimelineService.FANOUT_CHUNK])
+            if ids:
+                yield ids
+            if len(ids) < TimelineService.FANOUT_CHUNK:
+                return
+            after = ids[-1]
+
+    @staticmethod
+    def _deliver(author_id, posts, after=0, chunks=None):
+        """Write posts to the author's followers with ids above `after`, one insert per chunk.
+
+        Stops after `chunks` inserts when given and returns the last follower id
+        written, or None once every follower has the posts.
+        """
+        for written, ids in enumerate(TimelineService._follower_chunks(author_id, after), 1):
+            TimelineEntry.objects.bulk_create(TimelineService._entries(ids, posts), ignore_conflicts=True)
+            if written == chunks and len(ids) == TimelineService.FANOUT_CHUNK:
+                return ids[-1]
+        return None
+
+    @staticmethod
+    def fan_out(posts):
+        """Deliver new posts to their authors' and followers' timelines.
+
+        Batch writers using bulk_create call this directly; single saves go
+        through the post signal.
+        """
+        by_author = defaultdict(list)
+        for post in posts:
+            if post.pk:
+                by_author[post.author_id].append(post)
+        if not by_author:
+            return
+        banned = set(User.objects.filter(pk__in=by_author, is_banned=True).values_list('pk', flat=True))
+        heavy = TimelineService.heavy_author_ids()
+        for author_id, author_posts in by_author.items():
+            if author_id in banned:
+                continue
+            TimelineEntry.objects.bulk_create(
+                TimelineService._entries([author_id], author_posts), ignore_conflicts=True)
+            if author_id in heavy:
+                continue
+            rest = TimelineService._deliver(author_id, author_posts, chunks=1)
+            if rest is not None:
+                PendingFanout.objects.bulk_create(
+                    [PendingFanout(post=post, after_follower_id=rest) for post in author_posts])
+
+    @staticmethod
+    def drain_fanout():
+        """Deliver the queued posts to the rest of their followers, oldest first. Returns the number finished.
+
+        Each chunk moves the post's cursor, so an interrupted runner resumes
+        where it stopped. Posts by authors banned since are dropped.
+        """
+        finished = 0
+        while True:
+            pending = PendingFanout.objects.select_related('post__author').order_by('pk').first()
+            if pending is None:
+                return finished
+            post = pending.post
+            rest = None
+            if not post.author.is_banned:
+                rest = TimelineService._deliver(post.author_id, [post], after=pending.after_follower_id, chunks=1)
+            if rest is None:
+                pending.delete()
+                finished += 1
+            else:
+                PendingFanout.objects.filter(pk=pending.pk).update(after_follower_id=rest)
+
+    @staticmethod
+    def backfill(owner_ids, author_ids):
+        """Copy the BACKFILL_POSTS latest posts of each author into the owners' timelines, e.g. after a follow.
+        A heavy author's posts only go to their own timeline; their followers read them instead."""
+        heavy = TimelineService.heavy_author_ids()
+        authors = User.objects.filter(pk__in=author_ids, is_banned=False).values_list('pk', flat=True)
+        for author_id in authors:
+            owners = owner_ids
+            if author_id in heavy:
+                owners = [owner_id for owner_id in owner_ids if owner_id == author_id]
+                if not owners:
+                    continue
+            posts = list(Post.objects.filter(author_id=author_id).only('pk', 'author_id', 'created_at')
+                         .order_by('-created_at')[:TimelineService.BACKFILL_POSTS])
+            TimelineEntry.objects.bulk_create(TimelineService._entries(owners, posts),
+                                              batch_size=TimelineService.FANOUT_CHUNK, ignore_conflicts=True)
+
+    @staticmethod
+    def prune(owner_ids, author_ids):
+        """Remove the authors' posts from the owners' timelines, e.g. after an unfollow or a block."""
+        TimelineEntry.objects.filter(owner_id__in=owner_ids, author_id__in=author_ids).delete()
+
+    @staticmethod
+    def clear(owner_id):
+        """Remove every post but the owner's own from their timeline, e.g. after they unfollow everyone."""
+        TimelineEntry.objects.filter(owner_id=owner_id).exclude(author_id=owner_id).delete()
+
+    @staticmethod
+    def drop_author(author_id):
+        """Remove an author's posts from every timeline but their own, e.g. when they are banned."""
+        TimelineEntry.objects.filter(author_id=author_id).exclude(owner_id=author_id).delete()
+
+    @staticmethod
+    def restore_author(author_id):
+        """Backfill an author's recent posts to them and their followers, FANOUT_CHUNK followers at a time."""
+        TimelineService.backfill([author_id], [author_id])
+        for ids in TimelineService._follower_chunks(author_id):
+            TimelineService.backfill(ids, [author_id])
+
+    @staticmethod
+    def rebuild(user_ids=None):
+        """Rebuild the timelines of the given users (everyone when None) from their follows.
+        Returns the number of timelines rebuilt."""
+        users = User.objects.order_by('pk').values_list('pk', flat=True)
+        if user_ids is not None:
+            users = users.filter(pk__in=user_ids)
+        rebuilt, last = 0, 0
+        while True:
+            ids = list(users.filter(pk__gt=last)[:TimelineService.FANOUT_CHUNK])
+            for user_id in ids:
+                followed = list(Follow.objects.filter(from_user_id=user_id).values_list('to_user_id', flat=True))
+                with transaction.atomic():
+                    TimelineEntry.objects.filter(owner_id=user_id).delete()
+                    TimelineService.backfill([user_id], [user_id] + followed)
+            rebuilt += len(ids)
+            if len(ids) < TimelineService.FANOUT_CHUNK:
+                return rebuilt
+            last = ids[-1]
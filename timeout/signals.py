@@ -1,14 +1,34 @@
 """
-signals.py - Defines signal handlers for user-related events, such as linking a social account,
-to provide user feedback via Django's messaging framework.
+signals.py - Signal handlers that tell the user when a social account is linked, that keep the
+event occurrences and the reminder schedule in step with writes to events and event subscriptions,
+that keep the unread counters in step with new and deleted notifications and messages and feed
+those to the realtime hub, that keep the home timelines in step with posts,
+follows, blocks and bans, and that keep the like, comment and bookmark counts on posts. Imported
+by TimeoutConfig.ready().
 """
 
-
+from django.conf import settings
 from django.contrib import messages
+from django.db.models import F, Max
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from allauth.socialaccount.signals import social_account_added
 
+from timeout.models import (Block, Bookmark, Comment, Conversation, ConversationMembership, Event, EventSubscription,
+                            Like, Message, Post, User, UserCounters)
+from timeout.models.notification import Notification
+from timeout.services import realtime
+from timeout.services.notification_service import NotificationService
+from timeout.services.occurrence_service import OccurrenceService
+from timeout.services.reminder_service import ReminderService
+from timeout.services.timeline_service import TimelineService
+
+# The Post counter each kind of interaction moves.
+POST_COUNTERS = {Like: 'like_count', Comment: 'comment_count', Bookmark: 'bookmark_count'}
+
 
 @receiver(social_account_added)
 def on_social_account_linked(request, sociallogin, **kwargs):
@@ -18,3 +38,169 @@ def on_social_account_linked(request, sociallogin, **kwargs):
         request,
         f'Your {provider} account has been linked successfully!',
     )
+
+
+@receiver(post_save, sender=Event)
+def sync_event_occurrences(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """Regenerate the occurrences of an event whenever its schedule may have changed.
+    - Skipped for fixture loading
+    - Skipped when update_fields does not touch any scheduling field
+    - Skipped when a loaded event is saved with its schedule unchanged
+    Connected before the reminder receivers, which read the occurrences."""
+    if raw:
+        return
+    if update_fields is not None and not OccurrenceService.SCHEDULE_FIELDS & set(update_fields):
+        return
+    if not created and not OccurrenceService.schedule_changed(instance):
+        return
+    OccurrenceService.regenerate(instance)
+
+
+@receiver(post_save, sender=Event)
+def schedule_event_reminders(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """Rewrite an event's pending reminders when its due time, type or completion may have changed."""
+    if not raw and ReminderService.needs_reschedule(instance, created, update_fields):
+        ReminderService.schedule_events([instance])
+
+
+@receiver(post_save, sender=EventSubscription)
+def schedule_subscription_reminders(sender, instance, created=False, raw=False, **kwargs):
+    """Schedule a new subscriber's reminders for the event."""
+    if created and not raw:
+        ReminderService.schedule_events([instance.event], user_ids=[instance.user_id])
+
+
+@receiver(post_delete, sender=EventSubscription)
+def drop_subscription_reminders(sender, instance, **kwargs):
+    """Drop the pending reminders of a user who unsubscribed."""
+    ReminderService.unschedule(instance.user_id, instance.event_id)
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """Count a new unread notification and push it to the user's open streams.
+    Read/dismiss changes made through save() recount the user; the views change
+    them with NotificationService, which moves the counter without recounting."""
+    if raw:
+        return
+    if created:
+        if not instance.is_read and not instance.is_dismissed:
+            UserCounters.adjust(instance.user_id, notifications=1)
+        data = NotificationService.summary(instance)
+        data['unread_count'] = NotificationService.unread_count(instance.user_id)
+        realtime.publish([instance.user_id], 'notification', data)
+    elif update_fields is None or {'is_read', 'is_dismissed'} & set(update_fields):
+        UserCounters.recount([instance.user_id])
+        NotificationService.push_unread(instance.user_id)
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    """Take a deleted unread notification off the user's counter."""
+    if not instance.is_read and not instance.is_dismissed:
+        UserCounters.adjust(instance.user_id, notifications=-1)
+
+
+@receiver(post_save, sender=Message)
+def message_saved(sender, instance, created=False, raw=False, **kwargs):
+    """Make a new message the conversation's last one, move the sender's read cursor to it,
+    count it as unread for the other participants and push it to them."""
+    if not created or raw:
+        return
+    Conversation.objects.filter(pk=instance.conversation_id).update(
+        last_message=instance, message_count=F('message_count') + 1, updated_at=timezone.now())
+    ConversationMembership.mark_read(instance.sender_id, [instance.conversation_id])
+    recipients = list(ConversationMembership.objects.filter(conversation_id=instance.conversation_id)
+                      .exclude(user_id=instance.sender_id).values_list('user_id', flat=True))
+    for user_id in recipients:
+        UserCounters.adjust(user_id, messages=1)
+    realtime.publish(recipients, 'message', {
+        'id': instance.id,
+        'conversation_id': instance.conversation_id,
+    })
+
+
+@receiver(post_delete, sender=Message)
+def message_deleted(sender, instance, **kwargs):
+    """Repoint the conversation's last message and count, and take the message off the read
+    counts of participants past it and the unread counters of those before it."""
+    conversation_id = instance.conversation_id
+    last = Message.objects.filter(conversation_id=conversation_id).aggregate(last=Max('id'))['last']
+    Conversation.objects.filter(pk=conversation_id).update(
+        last_message_id=last, message_count=Greatest(F('message_count') - 1, 0))
+    memberships = ConversationMembership.objects.filter(conversation_id=conversation_id)
+    memberships.filter(last_read_message_id__gte=instance.pk).update(read_count=Greatest(F('read_count') - 1, 0))
+    for user_id in memberships.filter(last_read_message_id__lt=instance.pk).exclude(
+            user_id=instance.sender_id).values_list('user_id', flat=True):
+        UserCounters.adjust(user_id, messages=-1)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_post(sender, instance, created=False, raw=False, **kwargs):
+    """Deliver a new post to its author's and followers' timelines."""
+    if created and not raw:
+        TimelineService.fan_out([instance])
+
+
+@receiver(m2m_changed, sender=User.following.through)
+def follows_changed(sender, instance, action, reverse=False, pk_set=None, **kwargs):
+    """Backfill timelines on follow and prune them on unfollow.
+    Forward changes are to instance's followed users, reverse ones to instance's followers."""
+    if action == 'post_add' and pk_set:
+        if reverse:
+            TimelineService.backfill(list(pk_set), [instance.pk])
+        else:
+            TimelineService.backfill([instance.pk], list(pk_set))
+    elif action == 'post_remove' and pk_set:
+        if reverse:
+            TimelineService.prune(list(pk_set), [instance.pk])
+        else:
+            TimelineService.prune([instance.pk], list(pk_set))
+    elif action == 'post_clear':
+        if reverse:
+            TimelineService.drop_author(instance.pk)
+        else:
+            TimelineService.clear(instance.pk)
+
+
+@receiver(post_save, sender=Block)
+def prune_blocked_timelines(sender, instance, created=False, raw=False, **kwargs):
+    """Take each user's posts out of the other's timeline when one blocks the other."""
+    if created and not raw:
+        TimelineService.prune([instance.blocker_id], [instance.blocked_id])
+        TimelineService.prune([instance.blocked_id], [instance.blocker_id])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def ban_changed(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Drop a banned user's posts from other timelines, and deliver them again on unban.
+    Only saves naming is_banned in update_fields, as the moderation views do, are acted on;
+    the feed hides banned authors either way."""
+    if raw or update_fields is None or 'is_banned' not in update_fields:
+        return
+    if instance.is_banned:
+        TimelineService.drop_author(instance.pk)
+    else:
+        TimelineService.restore_author(instance.pk)
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Bookmark)
+def count_post_interaction(sender, instance, created=False, raw=False, **kwargs):
+    """Add a new like, comment or bookmark to its post's count."""
+    if created and not raw:
+        field = POST_COUNTERS[sender]
+        Post.objects.filter(pk=instance.post_id).update(**{field: F(field) + 1})
+
+
+@receiver(post_delete, sender=Like)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Bookmark)
+def uncount_post_interaction(sender, instance, origin=None, **kwargs):
+    """Take a deleted like, comment or bookmark off its post's count.
+    Skipped when the rows go because the post itself is being deleted."""
+    if isinstance(origin, Post) or getattr(origin, 'model', None) is Post:
+        return
+    field = POST_COUNTERS[sender]
+    Post.objects.filter(pk=instance.post_id).update(**{field: Greatest(F(field) - 1, 0)})
@@ -0,0 +1,15 @@
+"""
+Defines a custom template tag to check if the Server-Sent Events push stream is enabled for this deployment.
+"""
+
+
+from django import template
+from django.conf import settings
+
+register = template.Library()
+
+
+@register.simple_tag
+def realtime_stream_enabled():
+    """Return True if pages should open the push stream (only under ASGI)."""
+    return getattr(settings, 'REALTIME_STREAM_ENABLED', False)
@@ -1,20 +1,23 @@
 """
 test_check_notifications.py - Defines CheckNotificationsCommandTests for testing the check_notifications
-management command, covering notification creation for deadlines/events, duplicate prevention, and edge cases
-with completed, far-future events, and no users or events.
+management command, covering notification creation for deadlines/events, duplicate prevention, edge cases
+with completed, far-future events, and no users or events, the fixed query count, and the worker and dry-run options.
 """
 
 
 from io import StringIO
-from unittest.mock import patch, call
 
 from django.core.management import call_command
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
+from timeout.management.commands.check_notifications import user_ranges
 from timeout.models.event import Event
+from timeout.models.event_subscription import EventSubscription
 from timeout.models.notification import Notification
+from timeout.services.notification_service import NotificationService
+from timeout.services.reminder_service import ReminderService
 
 User = get_user_model()
 
@@ -43,6 +46,7 @@ def make_upcoming_event(creator, title='Lecture', event_type=None, hours_until_s
         end_datetime=now + timezone.timedelta(hours=hours_until_start + 1),
         status=Event.EventStatus.UPCOMING,
         is_completed=False,
+        visibility=Event.Visibility.PUBLIC,
     )
 
 
@@ -172,13 +176,72 @@ class CheckNotificationsCommandTests(TestCase):
         self.assertIn('Notifications checked', output)
         self.assertEqual(Notification.objects.count(), 0)
 
-    def test_calls_service_for_every_user(self):
-        """Verify the service is called once per user."""
-        with patch('timeout.management.commands.check_notifications.NotificationService.create_deadline_notifications') as mock_dl, \
-             patch('timeout.management.commands.check_notifications.NotificationService.create_event_notifications') as mock_ev:
+    def test_query_count_independent_of_users(self):
+        """The due reminders of all users are computed in a fixed number of queries."""
+        for i in range(5):
+            user = User.objects.create_user(username=f'extra{i}', password='pass123')
+            make_deadline(user, hours_until_due=12)
+            make_upcoming_event(user, hours_until_start=20)
+        with self.assertNumQueries(10):
             self._run()
-            users = list(User.objects.all())
-            mock_dl.assert_has_calls([call(u) for u in users], any_order=True)
-            mock_ev.assert_has_calls([call(u) for u in users], any_order=True)
-            self.assertEqual(mock_dl.call_count, len(users))
-            self.assertEqual(mock_ev.call_count, len(users))
\ No newline at end of file
+        self.assertEqual(Notification.objects.count(), 10)
+
+    def test_subscribers_are_reminded(self):
+        """Subscribers of a due event get their own reminder."""
+        event = make_upcoming_event(self.user1, title='Open lecture', hours_until_start=20)
+        EventSubscription.objects.create(user=self.user2, event=event)
+        self._run()
+        self.assertTrue(Notification.objects.filter(user=self.user2, deadline=event).exists())
+
+    def test_subscribers_of_private_event_are_not_reminded(self):
+        """Once the owner makes a subscribed event private, only the owner is reminded."""
+        event = make_upcoming_event(self.user1, title='Open lecture', hours_until_start=20)
+        EventSubscription.objects.create(user=self.user2, event=event)
+        Event.objects.filter(pk=event.pk).update(visibility=Event.Visibility.PRIVATE)
+        self._run()
+        self.assertTrue(Notification.objects.filter(user=self.user1, deadline=event).exists())
+        self.assertFalse(Notification.objects.filter(user=self.user2, deadline=event).exists())
+
+    def test_reminder_kind_recorded(self):
+        """Reminders record their window, which is what deduplicates them."""
+        event = make_deadline(self.user1, hours_until_due=12)
+        self._run()
+        self.assertEqual(Notification.objects.get(deadline=event).reminder_kind, 'day')
+
+    def test_already_sent_reminder_is_not_duplicated(self):
+        """A reminder sent by the runner is not inserted again by the batch job."""
+        make_deadline(self.user1, hours_until_due=0.5)
+        ReminderService.fire_due()
+        self._run()
+        self.assertEqual(Notification.objects.filter(user=self.user1).count(), 1)
+
+    def test_dry_run_writes_nothing(self):
+        """--dry-run reports the due reminders and timings without inserting them."""
+        make_deadline(self.user1, hours_until_due=12)
+        make_deadline(self.user2, hours_until_due=12)
+        out = StringIO()
+        call_command('check_notifications', '--dry-run', stdout=out)
+        self.assertIn('Dry run: 2 due reminders', out.getvalue())
+        self.assertFalse(Notification.objects.exists())
+
+    def test_user_ranges_cover_all_users(self):
+        """Splitting for workers covers every user id exactly once."""
+        ranges = user_ranges(3)
+        ids = list(User.objects.values_list('id', flat=True))
+        for user_id in ids:
+            self.assertEqual(sum(lo <= user_id <= hi for lo, hi in ranges), 1)
+
+    def test_user_range_limits_recipients(self):
+        """A worker's range only produces reminders for users inside it."""
+        make_deadline(self.user1, hours_until_due=12)
+        make_deadline(self.user2, hours_until_due=12)
+        NotificationService.create_due_reminders(user_range=(self.user2.pk, self.user2.pk))
+        self.assertEqual(list(Notification.objects.values_list('user_id', flat=True)), [self.user2.pk])
+
+    def test_user_range_reaches_subscribers_of_events_owned_outside_it(self):
+        """A worker reads the events its users subscribe to, but not other users' private events."""
+        shared = make_upcoming_event(self.user1, title='Shared', hours_until_start=20)
+        make_deadline(self.user1, title='Private', hours_until_due=12)
+        EventSubscription.objects.create(user=self.user2, event=shared)
+        reminders = NotificationService.due_reminders(timezone.now(), (self.user2.pk, self.user2.pk))
+        self.assertEqual([(n.user_id, n.deadline_id) for n in reminders], [(self.user2.pk, shared.pk)])
@@ -0,0 +1,86 @@
+"""
+test_conversation_membership.py - Defines tests for the ConversationMembership model, covering read
+cursors, unread counts derived from them, and the single-query inbox.
+"""
+
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from timeout.models import Conversation, ConversationMembership, Message, UserCounters
+
+User = get_user_model()
+
+
+class ConversationMembershipTests(TestCase):
+    """Tests for read cursors and the inbox built from them."""
+
+    def setUp(self):
+        """Create alice with conversations with bob and carol."""
+        self.alice = User.objects.create_user(username='alice', password='pass123')
+        self.bob = User.objects.create_user(username='bob', password='pass123')
+        self.carol = User.objects.create_user(username='carol', password='pass123')
+        self.with_bob = Conversation.objects.create()
+        self.with_bob.participants.add(self.alice, self.bob)
+        self.with_carol = Conversation.objects.create()
+        self.with_carol.participants.add(self.alice, self.carol)
+
+    def _send(self, conversation, sender, count=1):
+        """Send count messages from sender in a conversation."""
+        for i in range(count):
+            Message.objects.create(conversation=conversation, sender=sender, content=f'Message {i}')
+
+    def test_inbox_is_one_query(self):
+        """The inbox costs one query however many conversations and messages there are."""
+        self._send(self.with_bob, self.bob, 20)
+        self._send(self.with_carol, self.carol, 5)
+        with self.assertNumQueries(1):
+            inbox = ConversationMembership.inbox(self.alice)
+            [(item['other'].username, item['last'].content) for item in inbox]
+        self.assertEqual([item['other'] for item in inbox], [self.carol, self.bob])
+        self.assertEqual([item['unread_count'] for item in inbox], [5, 20])
+
+    def test_mark_read_clears_unread(self):
+        """Marking a conversation read zeroes its unread count and the user's counter."""
+        self._send(self.with_bob, self.bob, 3)
+        self._send(self.with_carol, self.carol, 2)
+        self.assertEqual(ConversationMembership.mark_read(self.alice.pk, [self.with_bob.pk]), 3)
+        unread = {item['conv'].pk: item['unread_count'] for item in ConversationMembership.inbox(self.alice)}
+        self.assertEqual(unread, {self.with_bob.pk: 0, self.with_carol.pk: 2})
+        self.assertEqual(UserCounters.get(self.alice.pk).unread_messages, 2)
+
+    def test_replying_reads_the_conversation(self):
+        """Sending a message moves the sender's cursor past the messages before it."""
+        self._send(self.with_bob, self.bob, 2)
+        self._send(self.with_bob, self.alice)
+        self.assertEqual(ConversationMembership.inbox(self.alice)[0]['unread_count'], 0)
+        self.assertEqual(UserCounters.get(self.alice.pk).unread_messages, 0)
+
+    def test_mark_unread_moves_cursor_back(self):
+        """Marking a conversation unread makes its last received message unread again."""
+        self._send(self.with_bob, self.bob, 2)
+        ConversationMembership.mark_read(self.alice.pk)
+        self.client.login(username='alice', password='pass123')
+        self.client.post(reverse('mark_conversation_unread', args=[self.with_bob.pk]))
+        item = next(i for i in ConversationMembership.inbox(self.alice) if i['conv'].pk == self.with_bob.pk)
+        self.assertEqual(item['unread_count'], 1)
+        self.assertEqual(UserCounters.get(self.alice.pk).unread_messages, 1)
+
+    def test_deleting_unread_message_updates_counts(self):
+        """Deleting an unread message takes it off the counts and repoints the last message."""
+        self._send(self.with_bob, self.bob, 2)
+        first, second = self.with_bob.messages.order_by('pk')
+        second.delete()
+        item = next(i for i in ConversationMembership.inbox(self.alice) if i['conv'].pk == self.with_bob.pk)
+        self.assertEqual((item['last'], item['unread_count']), (first, 1))
+        self.assertEqual(UserCounters.get(self.alice.pk).unread_messages, 1)
+
+    def test_recount_matches_cursors(self):
+        """A full recount agrees with the counts kept incrementally."""
+        self._send(self.with_bob, self.bob, 4)
+        ConversationMembership.mark_read(self.alice.pk, [self.with_bob.pk])
+        self._send(self.with_bob, self.bob, 1)
+        self._send(self.with_carol, self.carol, 2)
+        UserCounters.recount([self.alice.pk])
+        self.assertEqual(UserCounters.get(self.alice.pk).unread_messages, 3)
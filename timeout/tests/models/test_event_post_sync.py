@@ -0,0 +1,99 @@
+"""
+test_event_post_sync.py - Tests for Event's dirty-field tracking, checking that the mirrored social
+post is only read or written when a mirrored field changes, and for EventService.sync_posts.
+"""
+
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from timeout.models import Event, Post
+from timeout.services import EventService
+
+User = get_user_model()
+
+
+def _aware(*args):
+    """Helper to build an aware datetime."""
+    return timezone.make_aware(datetime(*args))
+
+
+class EventPostSyncTest(TestCase):
+    """Tests for when Event.save() touches the mirrored post."""
+
+    def setUp(self):
+        """Create a user and a public event."""
+        self.user = User.objects.create_user(username='syncer', password='pass')
+        self.event = Event.objects.create(
+            creator=self.user, title='Talk', visibility=Event.Visibility.PUBLIC,
+            start_datetime=_aware(2025, 3, 3, 9), end_datetime=_aware(2025, 3, 3, 10))
+
+    def test_loaded_event_has_no_changes(self):
+        """A freshly loaded event reports no changed fields."""
+        self.assertEqual(Event.objects.get(pk=self.event.pk).changed_fields(), set())
+
+    def test_changed_fields_tracks_edits(self):
+        """Editing a mirrored field is reported; other fields are not."""
+        event = Event.objects.get(pk=self.event.pk)
+        event.title = 'Renamed'
+        event.location = 'Room 1'
+        self.assertEqual(event.changed_fields(), {'title'})
+
+    def test_mark_completed_skips_post_queries(self):
+        """Saving with update_fields outside the mirrored fields issues only the UPDATE."""
+        event = Event.objects.get(pk=self.event.pk)
+        with self.assertNumQueries(1):
+            event.mark_completed()
+
+    def test_unchanged_save_skips_post_queries(self):
+        """A full save with no mirrored changes does not read the post."""
+        event = Event.objects.get(pk=self.event.pk)
+        event.location = 'Room 1'
+        with CaptureQueriesContext(connection) as ctx:
+            event.save()
+        self.assertFalse(any('timeout_post' in q['sql'] for q in ctx.captured_queries))
+
+    def test_title_change_updates_post(self):
+        """Changing the title rewrites the post content."""
+        event = Event.objects.get(pk=self.event.pk)
+        event.title = 'Renamed'
+        event.save()
+        self.assertIn('Renamed', Post.objects.get(event=event).content)
+
+    def test_partial_save_keeps_other_edits_dirty(self):
+        """Fields left out of update_fields stay changed, so a later full save still syncs the post."""
+        event = Event.objects.get(pk=self.event.pk)
+        event.title = 'Renamed'
+        event.description = 'Moved online'
+        event.save(update_fields=['description'])
+        self.assertEqual(event.changed_fields(), {'title'})
+        event.save()
+        self.assertIn('Renamed', Post.objects.get(event=event).content)
+
+    def test_visibility_change_deletes_post(self):
+        """Making the event private removes its post."""
+        event = Event.objects.get(pk=self.event.pk)
+        event.visibility = Event.Visibility.PRIVATE
+        event.save()
+        self.assertFalse(Post.objects.filter(event=event).exists())
+
+    def test_sync_posts_in_bulk(self):
+        """sync_posts creates, updates and deletes posts for a batch of events."""
+        private = Event.objects.create(
+            creator=self.user, title='Private', start_datetime=_aware(2025, 3, 4, 9),
+            end_datetime=_aware(2025, 3, 4, 10))
+        fresh = Event.objects.bulk_create([Event(
+            creator=self.user, title='Bulk', visibility=Event.Visibility.PUBLIC,
+            start_datetime=_aware(2025, 3, 5, 9), end_datetime=_aware(2025, 3, 5, 10))])[0]
+        Event.objects.filter(pk=self.event.pk).update(
+            title='Moved', visibility=Event.Visibility.PUBLIC)
+        Event.objects.filter(pk=private.pk).update(visibility=Event.Visibility.PRIVATE)
+        events = list(Event.objects.filter(pk__in=[self.event.pk, private.pk, fresh.pk]))
+        EventService.sync_posts(events)
+        self.assertIn('Moved', Post.objects.get(event=self.event).content)
+        self.assertTrue(Post.objects.filter(event=fresh).exists())
+        self.assertFalse(Post.objects.filter(event=private).exists())
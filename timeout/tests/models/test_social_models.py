@@ -4,9 +4,13 @@ constraints, and behavior with authenticated and anonymous users.
 """
 
 
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 from django.contrib.auth import get_user_model
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import AnonymousUser
 
 from timeout.models import Post, Comment, Like, Bookmark
@@ -40,6 +44,7 @@ class SocialModelsTest(TestCase):
         self.assertFalse(self.public_post.is_liked_by(self.u1))
 
         Like.objects.create(user=self.u1, post=self.public_post)
+        self.public_post.refresh_from_db()
         self.assertEqual(self.public_post.get_like_count(), 1)
         self.assertTrue(self.public_post.is_liked_by(self.u1))
 
@@ -110,6 +115,7 @@ class SocialModelsTest(TestCase):
         self.assertFalse(self.public_post.is_bookmarked_by(anon))
 
         Comment.objects.create(post=self.public_post, author=self.u1, content="c")
+        self.public_post.refresh_from_db()
         self.assertEqual(self.public_post.get_comment_count(), 1)
 
         # Anonymous visibility and delete checks
@@ -136,4 +142,55 @@ class SocialModelsTest(TestCase):
     def test_bookmark_str(self):
         """Test the string representation of bookmarks."""
         bm = Bookmark.objects.create(user=self.u1, post=self.public_post)
-        self.assertIn("bookmarked", str(bm))
\ No newline at end of file
+        self.assertIn("bookmarked", str(bm))
+
+class PostCountsTest(TestCase):
+    """Tests for the like, comment and bookmark counts stored on Post."""
+
+    def setUp(self):
+        """Create an author, a reader and a post."""
+        self.author = User.objects.create_user(username="author", password="pass")
+        self.reader = User.objects.create_user(username="reader", password="pass")
+        self.post = Post.objects.create(author=self.author, content="counted")
+
+    def _counts(self):
+        """Return the post's stored (likes, comments, bookmarks)."""
+        self.post.refresh_from_db()
+        return self.post.like_count, self.post.comment_count, self.post.bookmark_count
+
+    def test_interactions_move_counts(self):
+        """Creating and deleting likes, comments and bookmarks moves the matching count."""
+        like = Like.objects.create(user=self.reader, post=self.post)
+        Comment.objects.create(post=self.post, author=self.reader, content="c")
+        bookmark = Bookmark.objects.create(user=self.reader, post=self.post)
+        self.assertEqual(self._counts(), (1, 1, 1))
+        like.delete()
+        bookmark.delete()
+        self.assertEqual(self._counts(), (0, 1, 0))
+
+    def test_deleting_comment_uncounts_replies(self):
+        """Deleting a comment takes its cascaded replies off the count too."""
+        parent = Comment.objects.create(post=self.post, author=self.reader, content="parent")
+        Comment.objects.create(post=self.post, author=self.author, content="reply", parent=parent)
+        parent.delete()
+        self.assertEqual(self._counts(), (0, 0, 0))
+
+    def test_deleting_post_skips_count_updates(self):
+        """Deleting a post does not update its counts once per cascaded like."""
+        for i in range(3):
+            Like.objects.create(user=User.objects.create_user(username=f"fan{i}", password="pass"), post=self.post)
+        with CaptureQueriesContext(connection) as queries:
+            self.post.delete()
+        self.assertFalse([q for q in queries if q['sql'].startswith('UPDATE "timeout_post"')])
+
+    def test_recount_repairs_drift(self):
+        """recount() and the repair_post_counts command rebuild drifted counts."""
+        Like.objects.create(user=self.reader, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(like_count=9, comment_count=4)
+        Post.recount([self.post.pk])
+        self.assertEqual(self._counts(), (1, 0, 0))
+        Post.objects.filter(pk=self.post.pk).update(bookmark_count=2)
+        out = StringIO()
+        call_command("repair_post_counts", stdout=out)
+        self.assertEqual(self._counts(), (1, 0, 0))
+        self.assertIn("Recounted interactions for 1 posts.", out.getvalue())
@@ -0,0 +1,116 @@
+"""
+test_user_counters.py - Defines tests for the UserCounters model, covering the lazy recount, the
+incremental updates made by notification and message writes and views, and the repair command.
+"""
+
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from timeout.models import Conversation, Message, UserCounters
+from timeout.models.notification import Notification
+
+User = get_user_model()
+
+
+def counts(user):
+    """Helper returning (unread_notifications, unread_messages) for a user."""
+    counters = UserCounters.get(user.pk)
+    return counters.unread_notifications, counters.unread_messages
+
+
+class UserCountersTests(TestCase):
+    """Tests for keeping the unread counters in step."""
+
+    def setUp(self):
+        """Create two users in a conversation, both logged-in capable."""
+        self.alice = User.objects.create_user(username='alice', password='pass123')
+        self.bob = User.objects.create_user(username='bob', password='pass123')
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.alice, self.bob)
+
+    def _notify(self, user, **kwargs):
+        """Create a notification for user."""
+        return Notification.objects.create(user=user, title='Hi', message='There', **kwargs)
+
+    def test_missing_row_is_recounted(self):
+        """The first read builds the row from the existing data."""
+        self._notify(self.alice)
+        self._notify(self.alice, is_read=True)
+        Message.objects.create(conversation=self.conversation, sender=self.bob, content='Hello')
+        UserCounters.objects.all().delete()
+        self.assertEqual(counts(self.alice), (1, 1))
+
+    def test_new_notifications_are_counted(self):
+        """Creating unread notifications increments the counter; read or dismissed ones do not."""
+        counts(self.alice)
+        self._notify(self.alice)
+        self._notify(self.alice, is_read=True)
+        self._notify(self.alice, is_dismissed=True)
+        self.assertEqual(counts(self.alice), (1, 0))
+
+    def test_notification_views_move_counter(self):
+        """Read, unread, dismiss and the mark-all views keep the counter exact."""
+        first, second = self._notify(self.alice), self._notify(self.alice)
+        self.client.login(username='alice', password='pass123')
+        self.client.post(reverse('mark_notification_read', args=[first.pk]))
+        self.assertEqual(counts(self.alice)[0], 1)
+        self.client.post(reverse('mark_notification_read', args=[first.pk]))
+        self.assertEqual(counts(self.alice)[0], 1)
+        self.client.post(reverse('mark_all_notifications_unread'))
+        self.assertEqual(counts(self.alice)[0], 2)
+        self.client.post(reverse('delete_notification', args=[second.pk]))
+        self.assertEqual(counts(self.alice)[0], 1)
+        self.client.post(reverse('mark_all_notifications_read'))
+        self.assertEqual(counts(self.alice)[0], 0)
+
+    def test_deleting_unread_notification_decrements(self):
+        """Hard-deleting an unread notification takes it off the counter."""
+        notification = self._notify(self.alice)
+        counts(self.alice)
+        notification.delete()
+        self.assertEqual(counts(self.alice)[0], 0)
+
+    def test_messages_counted_for_recipient_only(self):
+        """A new message counts as unread for the recipient, not the sender."""
+        counts(self.alice), counts(self.bob)
+        Message.objects.create(conversation=self.conversation, sender=self.bob, content='Hello')
+        self.assertEqual(counts(self.alice), (0, 1))
+        self.assertEqual(counts(self.bob), (0, 0))
+
+    def test_opening_conversation_clears_messages(self):
+        """Viewing the conversation marks messages read and clears the counter."""
+        Message.objects.create(conversation=self.conversation, sender=self.bob, content='Hello')
+        Message.objects.create(conversation=self.conversation, sender=self.bob, content='Again')
+        self.assertEqual(counts(self.alice)[1], 2)
+        self.client.login(username='alice', password='pass123')
+        self.client.get(reverse('conversation', args=[self.conversation.pk]))
+        self.assertEqual(counts(self.alice)[1], 0)
+        self.client.post(reverse('mark_conversation_unread', args=[self.conversation.pk]))
+        self.client.post(reverse('mark_conversation_unread', args=[self.conversation.pk]))
+        self.assertEqual(counts(self.alice)[1], 1)
+        self.client.get(reverse('poll_messages', args=[self.conversation.pk]))
+        self.assertEqual(counts(self.alice)[1], 0)
+
+    def test_poll_reads_counter_without_counting(self):
+        """The poll endpoint reads the unread count from the counters row, not with COUNT(*)."""
+        self._notify(self.alice)
+        self.client.login(username='alice', password='pass123')
+        self.client.get(reverse('poll_notifications'))
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('poll_notifications'))
+        self.assertEqual(response.json()['unread_count'], 1)
+
+    def test_repair_command_recounts_drift(self):
+        """repair_counters restores counters that drifted."""
+        self._notify(self.alice)
+        counts(self.alice)
+        UserCounters.objects.filter(user=self.alice).update(unread_notifications=7, unread_messages=3)
+        out = StringIO()
+        call_command('repair_counters', stdout=out)
+        self.assertEqual(counts(self.alice), (1, 0))
+        self.assertIn('Recounted unread counters for 2 users.', out.getvalue())
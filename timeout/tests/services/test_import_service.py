@@ -0,0 +1,191 @@
+"""
+test_import_service.py - Tests for EventImportService and the event_import view, covering .ics
+unfolding, RRULE mapping, VALUE and TZID parameters, CSV parsing, malformed CSV records, per-row
+validation errors, de-duplication against the database and within the file, overlapping exams
+within one file, mirrored posts for public events, and the bounded query count.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from timeout.models import Event, EventOccurrence, Post
+from timeout.services import EventImportService
+from timeout.services.import_service import ImportRowError, parse_ics
+
+User = get_user_model()
+
+ICS = (
+    "BEGIN:VCALENDAR\r\n"
+    "BEGIN:VEVENT\r\n"
+    "DTSTART:20250303T090000Z\r\n"
+    "DTEND:20250303T100000Z\r\n"
+    "SUMMARY:Algorithms\\, Lecture\r\n"
+    "LOCATION:Bush House\r\n"
+    "  S-2.01\r\n"
+    "RRULE:FREQ=WEEKLY;COUNT=10\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "DTSTART;VALUE=DATE:20250310\r\n"
+    "SUMMARY:Reading Week\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+CSV = (
+    "title,start,end,event_type,location,description,recurrence,visibility,is_all_day\n"
+    "Lab,2025-03-04T14:00,2025-03-04T16:00,class,Lab 1,,weekly,public,\n"
+    "Lab,2025-03-04T14:00,2025-03-04T16:00,class,Lab 1,,weekly,public,\n"
+    "Broken,2025-03-05T14:00,2025-03-05T13:00,class,,,,,\n"
+    "Exam,2025-05-01,,exam,,,,,yes\n"
+)
+
+
+def _aware(*args):
+    """Helper to build an aware datetime."""
+    return timezone.make_aware(datetime(*args))
+
+
+def _upload(name, text):
+    """Helper to wrap text as an uploaded file."""
+    return SimpleUploadedFile(name, text.encode('utf-8'))
+
+
+class ImportServiceTests(TestCase):
+    """Tests for parsing and importing timetable files."""
+
+    def setUp(self):
+        """Create the importing user."""
+        self.user = User.objects.create_user(username="importer", password="pass1234")
+
+    def _import(self, name, text):
+        """Parse and import one file."""
+        upload = _upload(name, text)
+        return EventImportService.import_rows(self.user, EventImportService.parse(upload))
+
+    def test_parse_ics_unfolds_and_maps_rrule(self):
+        """Folded lines are joined, text is unescaped and RRULE FREQ becomes the recurrence."""
+        rows = list(parse_ics(ICS.splitlines(keepends=True)))
+        self.assertEqual(rows[0]['title'], 'Algorithms, Lecture')
+        self.assertEqual(rows[0]['location'], 'Bush House S-2.01')
+        self.assertEqual(rows[0]['recurrence'], 'weekly')
+        self.assertEqual(rows[0]['start_datetime'], _aware(2025, 3, 3, 9))
+        self.assertTrue(rows[1]['is_all_day'])
+        self.assertEqual(rows[1]['end_datetime'], _aware(2025, 3, 10, 23, 59))
+
+    def test_explicit_date_time_value_is_not_all_day(self):
+        """VALUE=DATE-TIME is a timed event; only an exact VALUE=DATE makes it all-day."""
+        ics = ("BEGIN:VEVENT\r\nDTSTART;VALUE=DATE-TIME:20250101T090000\r\n"
+               "DTEND;VALUE=DATE-TIME:20250101T100000\r\nSUMMARY:Seminar\r\nEND:VEVENT\r\n")
+        row = next(parse_ics(ics.splitlines(keepends=True)))
+        self.assertFalse(row['is_all_day'])
+        self.assertEqual(row['start_datetime'], _aware(2025, 1, 1, 9))
+
+    def test_tzid_is_resolved_and_unknown_zone_rejected(self):
+        """A TZID local time is read in that zone; a row with an unknown zone is reported."""
+        ics = ("BEGIN:VEVENT\r\nDTSTART;TZID=America/New_York:20250303T090000\r\n"
+               "DTEND;tzid=America/New_York:20250303T100000\r\nSUMMARY:Call\r\nEND:VEVENT\r\n"
+               "BEGIN:VEVENT\r\nDTSTART;TZID=Mars/Olympus:20250303T090000\r\nSUMMARY:Trip\r\nEND:VEVENT\r\n")
+        rows = list(parse_ics(ics.splitlines(keepends=True)))
+        self.assertEqual(rows[0]['start_datetime'], datetime(2025, 3, 3, 14, tzinfo=dt_timezone.utc))
+        self.assertEqual(rows[0]['end_datetime'], datetime(2025, 3, 3, 15, tzinfo=dt_timezone.utc))
+        self.assertIsInstance(rows[1], ImportRowError)
+        self.assertIn('unknown time zone Mars/Olympus', str(rows[1]))
+
+    def test_ics_import_creates_private_events_with_occurrences(self):
+        """Imported events default to private and get their occurrences stored."""
+        result = self._import('timetable.ics', ICS)
+        self.assertEqual(result['created'], 2)
+        lecture = Event.objects.get(title='Algorithms, Lecture')
+        self.assertEqual(lecture.visibility, Event.Visibility.PRIVATE)
+        self.assertGreater(lecture.occurrences.count(), 1)
+        self.assertFalse(Post.objects.exists())
+
+    def test_reimport_skips_duplicates(self):
+        """Importing the same file twice creates nothing the second time."""
+        self._import('timetable.ics', ICS)
+        result = self._import('timetable.ics', ICS)
+        self.assertEqual(result['created'], 0)
+        self.assertEqual(result['duplicates'], 2)
+        self.assertEqual(Event.objects.count(), 2)
+
+    def test_csv_import_reports_errors_and_duplicates(self):
+        """CSV rows are validated, in-file duplicates dropped and public events get posts."""
+        result = self._import('timetable.csv', CSV)
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['duplicates'], 1)
+        self.assertEqual(len(result['errors']), 1)
+        self.assertIn('Line 4', result['errors'][0])
+        lab = Event.objects.get(title='Lab')
+        self.assertEqual(lab.posts.get().content, lab.post_content())
+        exam = Event.objects.get(title='Exam')
+        self.assertTrue(exam.is_all_day)
+        self.assertEqual(EventOccurrence.objects.filter(event=exam).count(), 1)
+
+    def test_overlapping_exams_in_one_file_are_rejected(self):
+        """Rows in the same file are checked against each other, not only against the database."""
+        text = ("title,start,end,event_type\n"
+                "Maths,2025-05-01T09:00,2025-05-01T11:00,exam\n"
+                "Physics,2025-05-01T10:00,2025-05-01T12:00,exam\n"
+                "Chemistry,2025-05-01T11:00,2025-05-01T12:00,exam\n")
+        result = self._import('exams.csv', text)
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(len(result['errors']), 1)
+        self.assertIn('Line 3', result['errors'][0])
+        self.assertFalse(Event.objects.filter(title='Physics').exists())
+
+    def test_malformed_csv_record_is_reported(self):
+        """A record the csv module cannot read is reported as a row error and the rest are imported."""
+        text = ("title,start,end\n" + "x" * 200000 + ",2025-03-04T14:00,2025-03-04T16:00\n"
+                "Lab,2025-03-05T14:00,2025-03-05T16:00\n")
+        result = self._import('timetable.csv', text)
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(len(result['errors']), 1)
+        self.assertIn('field larger than field limit', result['errors'][0])
+
+    def test_unknown_extension_rejected(self):
+        """Only .ics and .csv files are accepted."""
+        with self.assertRaises(ImportRowError):
+            EventImportService.parse(_upload('timetable.txt', ICS))
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """A 300-row import takes a fixed number of queries, not one per row."""
+        lines = ["title,start,end"] + [
+            f"Session {i},2025-03-{1 + i % 28:02d}T09:00,2025-03-{1 + i % 28:02d}T10:00" for i in range(300)]
+        upload = _upload('big.csv', "\n".join(lines) + "\n")
+        rows = EventImportService.parse(upload)
+        with CaptureQueriesContext(connection) as ctx:
+            result = EventImportService.import_rows(self.user, rows)
+        self.assertEqual(result['created'], 300)
+        self.assertLess(len(ctx.captured_queries), 20)
+
+
+class EventImportViewTests(TestCase):
+    """Tests for the event_import view."""
+
+    def setUp(self):
+        """Create and log in a user."""
+        self.user = User.objects.create_user(username="viewimporter", password="pass1234")
+        self.client.login(username="viewimporter", password="pass1234")
+
+    def test_import_redirects_with_summary(self):
+        """A successful upload redirects to the calendar with a summary message."""
+        resp = self.client.post(reverse('event_import'), {'file': _upload('t.ics', ICS)}, follow=True)
+        self.assertRedirects(resp, reverse('calendar'))
+        self.assertContains(resp, 'Imported 2 events')
+
+    def test_bad_csv_header_shows_error(self):
+        """A CSV without the required columns is rejected without creating events."""
+        resp = self.client.post(reverse('event_import'), {'file': _upload('t.csv', "a,b\n1,2\n")}, follow=True)
+        self.assertContains(resp, 'CSV header must include')
+        self.assertFalse(Event.objects.exists())
+
+    def test_requires_post(self):
+        """GET is not allowed."""
+        self.assertEqual(self.client.get(reverse('event_import')).status_code, 405)
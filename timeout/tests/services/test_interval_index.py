@@ -0,0 +1,113 @@
+"""
+test_interval_index.py - Tests for IntervalIndex, covering overlap queries against a brute-force
+scan, gap finding, insertion, the per-user builder, and the overlap check in Event.clean.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from timeout.models import Event
+from timeout.services.interval_index import IntervalIndex
+
+User = get_user_model()
+
+
+def _aware(*args):
+    """Helper to build an aware datetime."""
+    return timezone.make_aware(datetime(*args))
+
+
+class IntervalIndexTests(SimpleTestCase):
+    """Tests for the in-memory index."""
+
+    def test_overlapping_matches_brute_force(self):
+        """Random queries return exactly the intervals a full scan finds, in start order."""
+        rng = random.Random(7)
+        base = _aware(2026, 1, 1)
+        intervals = []
+        for _ in range(300):
+            start = base + timedelta(minutes=rng.randrange(0, 60 * 24 * 30))
+            intervals.append((start, start + timedelta(minutes=rng.randrange(15, 600))))
+        index = IntervalIndex(intervals)
+        for _ in range(200):
+            a = base + timedelta(minutes=rng.randrange(0, 60 * 24 * 30))
+            b = a + timedelta(minutes=rng.randrange(1, 900))
+            expected = sorted(iv for iv in intervals if iv[0] < b and iv[1] > a)
+            self.assertEqual(list(index.overlapping(a, b)), expected)
+            self.assertEqual(index.overlaps(a, b), bool(expected))
+
+    def test_touching_intervals_do_not_overlap(self):
+        """Intervals are half-open, so back-to-back slots do not clash."""
+        index = IntervalIndex([(_aware(2026, 1, 1, 9), _aware(2026, 1, 1, 10))])
+        self.assertFalse(index.overlaps(_aware(2026, 1, 1, 10), _aware(2026, 1, 1, 11)))
+        self.assertTrue(index.overlaps(_aware(2026, 1, 1, 9, 59), _aware(2026, 1, 1, 11)))
+
+    def test_gaps(self):
+        """Gaps shorter than the minimum are dropped and overlapping busy spans are merged."""
+        index = IntervalIndex([
+            (_aware(2026, 1, 1, 9), _aware(2026, 1, 1, 11)),
+            (_aware(2026, 1, 1, 10), _aware(2026, 1, 1, 12)),
+            (_aware(2026, 1, 1, 12, 30), _aware(2026, 1, 1, 14)),
+        ])
+        gaps = list(index.gaps(_aware(2026, 1, 1, 8), _aware(2026, 1, 1, 22), timedelta(hours=1)))
+        self.assertEqual(gaps, [
+            (_aware(2026, 1, 1, 8), _aware(2026, 1, 1, 9)),
+            (_aware(2026, 1, 1, 14), _aware(2026, 1, 1, 22)),
+        ])
+
+    def test_add(self):
+        """Added intervals are found by later queries."""
+        index = IntervalIndex()
+        self.assertFalse(index.overlaps(_aware(2026, 1, 1, 9), _aware(2026, 1, 1, 10)))
+        index.add(_aware(2026, 1, 1, 9), _aware(2026, 1, 1, 10))
+        self.assertTrue(index.overlaps(_aware(2026, 1, 1, 9, 30), _aware(2026, 1, 1, 11)))
+        self.assertEqual(len(index), 1)
+
+
+class EventOverlapValidationTests(TestCase):
+    """Tests for the overlap check in Event.clean."""
+
+    def setUp(self):
+        """Create a user with a class on 2 March 2026, 10:00-12:00."""
+        self.user = User.objects.create_user(username='overlap', password='pass')
+        self.lecture = Event.objects.create(
+            creator=self.user, title='Lecture', event_type=Event.EventType.CLASS,
+            start_datetime=_aware(2026, 3, 2, 10), end_datetime=_aware(2026, 3, 2, 12))
+
+    def _session(self, start, end, **kwargs):
+        """Build an unsaved study session."""
+        return Event(creator=self.user, title='Study', event_type=Event.EventType.STUDY_SESSION,
+                     start_datetime=start, end_datetime=end, **kwargs)
+
+    def test_study_session_cannot_overlap_class(self):
+        """A study session clashing with a class fails validation."""
+        with self.assertRaises(ValidationError):
+            self._session(_aware(2026, 3, 2, 11), _aware(2026, 3, 2, 13)).full_clean()
+
+    def test_free_slot_is_valid(self):
+        """A study session in a free slot validates."""
+        self._session(_aware(2026, 3, 2, 12), _aware(2026, 3, 2, 14)).full_clean()
+
+    def test_other_types_may_overlap(self):
+        """Meetings and other non-exclusive types are not restricted."""
+        Event(creator=self.user, title='Chat', event_type=Event.EventType.MEETING,
+              start_datetime=_aware(2026, 3, 2, 11), end_datetime=_aware(2026, 3, 2, 13)).full_clean()
+
+    def test_weekly_repeat_blocks_later_weeks(self):
+        """Repeats of a recurring class block study sessions in later weeks too."""
+        self.lecture.recurrence = 'weekly'
+        self.lecture.save()
+        with self.assertRaises(ValidationError):
+            self._session(_aware(2026, 3, 16, 11), _aware(2026, 3, 16, 13)).full_clean()
+
+    def test_editing_event_ignores_itself(self):
+        """Re-validating a saved session does not clash with its own occurrence."""
+        session = self._session(_aware(2026, 3, 2, 14), _aware(2026, 3, 2, 16))
+        session.save()
+        session.end_datetime = _aware(2026, 3, 2, 17)
+        session.full_clean()
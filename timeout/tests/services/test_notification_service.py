@@ -1,37 +1,25 @@
 """
-test_notification_service.py - Defines tests for the NotificationService, including mapping of event types to notification types and the deduplication logic of _notify_once.
+test_notification_service.py - Defines tests for the NotificationService, including mapping of event types to notification types and the folding of post activity.
 """
 
 
-from django.test import TestCase
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 from django.utils import timezone
 
+from timeout.models import Bookmark, Comment, Like, PendingActivity, Post
 from timeout.models.notification import Notification
 from timeout.models.event import Event
+from timeout.services import activity_buffer
 from timeout.services.notification_service import NotificationService
 
 User = get_user_model()
 
 
-def make_event(creator, event_type, title='Test Event', delta_start=None, delta_end=None, status=None):
-    """Helper to create an event with timezone-aware datetimes."""
-    now = timezone.now()
-    start = now + (delta_start or timezone.timedelta(days=1))
-    end = now + (delta_end or timezone.timedelta(days=1, hours=1))
-    kwargs = dict(
-        creator=creator,
-        title=title,
-        event_type=event_type,
-        start_datetime=start,
-        end_datetime=end,
-        is_completed=False,
-    )
-    if status:
-        kwargs['status'] = status
-    return Event.objects.create(**kwargs)
-
-
 class GetNotificationTypeTests(TestCase):
     """Tests for _get_notification_type mapping."""
 
@@ -71,290 +59,162 @@ class GetNotificationTypeTests(TestCase):
         self.assertEqual(result, Notification.Type.EVENT)
 
 
-class NotifyOnceTests(TestCase):
-    """Tests for _notify_once deduplication logic."""
-
-    def setUp(self):
-        """Set up test data for NotifyOnceTests."""
-        self.user = User.objects.create_user(username='user', password='pass')
-        self.event = make_event(self.user, Event.EventType.DEADLINE, title='Assignment 1')
-
-    def test_creates_notification_first_time(self):
-        """Test that _notify_once creates a notification the first time."""
-        NotificationService._notify_once(self.user, self.event, '1 day left!')
-        self.assertEqual(Notification.objects.filter(user=self.user).count(), 1)
-
-    def test_does_not_duplicate_same_message(self):
-        """Test that _notify_once does not create duplicate notifications for the same message."""
-        NotificationService._notify_once(self.user, self.event, '1 day left!')
-        NotificationService._notify_once(self.user, self.event, '1 day left!')
-        self.assertEqual(Notification.objects.filter(user=self.user).count(), 1)
-
-    def test_creates_separate_for_different_messages(self):
-        """Test that _notify_once creates separate notifications for different messages."""
-        NotificationService._notify_once(self.user, self.event, '1 week left!')
-        NotificationService._notify_once(self.user, self.event, '1 day left!')
-        self.assertEqual(Notification.objects.filter(user=self.user).count(), 2)
-
-    def test_notification_title_includes_icon_and_label(self):
-        """Test that the notification title includes the correct icon and label."""
-        NotificationService._notify_once(self.user, self.event, '1 day left!')
-        n = Notification.objects.get(user=self.user)
-        self.assertIn('⏰', n.title)
-        self.assertIn('Deadline', n.title)
-        self.assertIn(self.event.title, n.title)
-
-    def test_notification_has_correct_type_for_deadline(self):
-        """Test that the notification has the correct type for DEADLINE events."""
-        NotificationService._notify_once(self.user, self.event, '1 day left!')
-        n = Notification.objects.get(user=self.user)
-        self.assertEqual(n.type, Notification.Type.DEADLINE)
-
-    def test_notification_has_correct_type_for_exam(self):
-        """Test that the notification has the correct type for EXAM events."""
-        exam = make_event(self.user, Event.EventType.EXAM, title='Final Exam')
-        NotificationService._notify_once(self.user, exam, 'starts tomorrow!')
-        n = Notification.objects.get(user=self.user, deadline=exam)
-        self.assertEqual(n.type, Notification.Type.EXAM)
-
-    def test_notification_linked_to_event(self):
-        """Test that the notification is linked to the correct event."""
-        NotificationService._notify_once(self.user, self.event, '1 day left!')
-        n = Notification.objects.get(user=self.user)
-        self.assertEqual(n.deadline, self.event)
-
-    def test_notification_is_unread_by_default(self):
-        """Test that the notification is unread by default."""
-        NotificationService._notify_once(self.user, self.event, '1 day left!')
-        n = Notification.objects.get(user=self.user)
-        self.assertFalse(n.is_read)
-
-
-class CreateDeadlineNotificationsTests(TestCase):
-    """Tests for create_deadline_notifications."""
+class PostActivityAggregationTests(TestCase):
+    """Tests for folding likes, bookmarks and comments into one notification per post and verb."""
 
     def setUp(self):
-        """Set up test data for CreateDeadlineNotificationsTests."""
-        self.user = User.objects.create_user(username='user', password='pass')
-
-    def test_creates_notification_within_one_hour(self):
-        """Test that create_deadline_notifications creates a notification for deadlines within one hour."""
-        make_event(
-            self.user, Event.EventType.DEADLINE, title='Urgent',
-            delta_start=timezone.timedelta(minutes=-30),
-            delta_end=timezone.timedelta(minutes=30),
-        )
-        NotificationService.create_deadline_notifications(self.user)
-        self.assertTrue(Notification.objects.filter(
-            user=self.user, message__icontains='1 hour'
-        ).exists())
-
-    def test_creates_notification_within_one_day(self):
-        """Test that create_deadline_notifications creates a notification for deadlines within one day."""
-        make_event(
-            self.user, Event.EventType.DEADLINE, title='Due Soon',
-            delta_start=timezone.timedelta(hours=-1),
-            delta_end=timezone.timedelta(hours=12),
-        )
-        NotificationService.create_deadline_notifications(self.user)
-        self.assertTrue(Notification.objects.filter(
-            user=self.user, message__icontains='1 day'
-        ).exists())
-
-    def test_creates_notification_within_one_week(self):
-        """Test that create_deadline_notifications creates a notification for deadlines within one week."""
-        make_event(
-            self.user, Event.EventType.DEADLINE, title='Coming Up',
-            delta_start=timezone.timedelta(days=-1),
-            delta_end=timezone.timedelta(days=3),
-        )
-        NotificationService.create_deadline_notifications(self.user)
-        self.assertTrue(Notification.objects.filter(
-            user=self.user, message__icontains='1 week'
-        ).exists())
-
-    def test_no_notification_for_far_future_deadline(self):
-        """Test that create_deadline_notifications does not create a notification for deadlines far in the future."""
-        make_event(
-            self.user, Event.EventType.DEADLINE, title='Far Away',
-            delta_start=timezone.timedelta(days=10),
-            delta_end=timezone.timedelta(days=30),
-        )
-        NotificationService.create_deadline_notifications(self.user)
-        self.assertEqual(Notification.objects.filter(user=self.user).count(), 0)
-
-    def test_no_notification_for_completed_deadline(self):
-        """Test that create_deadline_notifications does not create a notification for completed deadlines."""
-        event = make_event(
-            self.user, Event.EventType.DEADLINE, title='Done',
-            delta_start=timezone.timedelta(hours=-1),
-            delta_end=timezone.timedelta(hours=12),
-        )
-        event.is_completed = True
-        event.save()
-        NotificationService.create_deadline_notifications(self.user)
-        self.assertEqual(Notification.objects.filter(user=self.user).count(), 0)
-
-    def test_no_duplicate_notifications(self):
-        """Test that create_deadline_notifications does not create duplicate notifications."""
-        make_event(
-            self.user, Event.EventType.DEADLINE, title='Due Soon',
-            delta_start=timezone.timedelta(hours=-1),
-            delta_end=timezone.timedelta(hours=12),
-        )
-        NotificationService.create_deadline_notifications(self.user)
-        NotificationService.create_deadline_notifications(self.user)
-        self.assertEqual(Notification.objects.filter(user=self.user).count(), 1)
-
-    def test_no_notification_for_other_users_deadlines(self):
-        """Test that create_deadline_notifications does not create notifications for other users' deadlines."""
-        other = User.objects.create_user(username='other', password='pass')
-        make_event(
-            other, Event.EventType.DEADLINE, title='Other Due',
-            delta_start=timezone.timedelta(hours=-1),
-            delta_end=timezone.timedelta(hours=12),
-        )
-        NotificationService.create_deadline_notifications(self.user)
-        self.assertEqual(Notification.objects.filter(user=self.user).count(), 0)
-
-
-class CreateEventNotificationsTests(TestCase):
-    """Tests for create_event_notifications."""
+        """Create a post author, a post and a few other users."""
+        self.author = User.objects.create_user(username='author', password='pass')
+        self.post = Post.objects.create(author=self.author, content='Hello')
+        self.fans = [User.objects.create_user(username=f'fan{i}', password='pass') for i in range(5)]
+
+    def _activity(self, verb):
+        """Return the author's notifications for the post with the given verb."""
+        return Notification.objects.filter(user=self.author, post=self.post, verb=verb)
+
+    def _like(self, fan):
+        """Like the post as fan and commit, so the buffered notification is written."""
+        with self.captureOnCommitCallbacks(execute=True):
+            return Like.objects.create(user=fan, post=self.post)
+
+    def test_likes_fold_into_one_row(self):
+        """Five likes make one notification naming the latest liker and counting the rest."""
+        for fan in self.fans:
+            self._like(fan)
+        notification = self._activity('liked').get()
+        self.assertEqual(notification.actor_count, 5)
+        self.assertEqual(notification.message, 'fan4 and 4 others liked your post')
+        self.assertEqual(notification.recent_actors, ['fan4', 'fan3', 'fan2'])
+
+    def test_two_actors_are_both_named(self):
+        """Two bookmarks name both users."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for fan in self.fans[:2]:
+                Bookmark.objects.create(user=fan, post=self.post)
+        self.assertEqual(self._activity('bookmarked').get().message, 'fan1 and fan0 bookmarked your post')
+
+    def test_repeat_actor_is_not_counted_twice(self):
+        """Unliking and liking again does not inflate the count."""
+        self._like(self.fans[0]).delete()
+        self._like(self.fans[0])
+        notification = self._activity('liked').get()
+        self.assertEqual(notification.actor_count, 1)
+        self.assertEqual(notification.message, 'fan0 liked your post')
+
+    def test_read_notification_starts_a_new_row(self):
+        """Once the author has read the notification, new activity starts a fresh one."""
+        self._like(self.fans[0])
+        NotificationService.set_read(self.author, True)
+        self._like(self.fans[1])
+        self.assertEqual(self._activity('liked').count(), 2)
+        self.assertEqual(NotificationService.unread_count(self.author.pk), 1)
+
+    def test_old_notification_is_not_folded_into(self):
+        """Activity outside the aggregation window starts a new row."""
+        self._like(self.fans[0])
+        self._activity('liked').update(created_at=timezone.now() - timezone.timedelta(days=2))
+        self._like(self.fans[1])
+        self.assertEqual(self._activity('liked').count(), 2)
+
+    def test_comments_and_replies_fold_separately(self):
+        """Comments fold for the post author, replies for the parent comment's author."""
+        with self.captureOnCommitCallbacks(execute=True):
+            parent = Comment.objects.create(post=self.post, author=self.fans[0], content='First')
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(post=self.post, author=self.fans[1], content='Second', parent=parent)
+            Comment.objects.create(post=self.post, author=self.fans[2], content='Third', parent=parent)
+        comments = self._activity('commented').get()
+        self.assertEqual(comments.title, '💬 fan2 and 2 others commented on your post')
+        self.assertEqual(comments.message, 'Third')
+        reply = Notification.objects.get(user=self.fans[0], verb='replied')
+        self.assertEqual(reply.title, '💬 fan2 and fan1 replied to your comment')
+
+    def test_own_activity_is_not_notified(self):
+        """Liking or commenting on your own post creates nothing."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(user=self.author, post=self.post)
+            Comment.objects.create(post=self.post, author=self.author, content='Mine')
+        self.assertFalse(Notification.objects.filter(user=self.author).exists())
+
+    def test_unread_counter_counts_folded_row_once(self):
+        """The unread counter counts the aggregated row once, however many actors it has."""
+        for fan in self.fans:
+            self._like(fan)
+        self.assertEqual(NotificationService.unread_count(self.author.pk), 1)
+
+
+class ActivityBufferTests(TestCase):
+    """Tests for writing post activity notifications after commit, in batches or through the queue."""
 
     def setUp(self):
-        """Set up test data for CreateEventNotificationsTests."""
-        self.user = User.objects.create_user(username='user', password='pass')
-
-    def test_creates_notification_for_exam_starting_in_one_hour(self):
-        """Test that create_event_notifications creates a notification for exams starting in one hour."""
-        make_event(
-            self.user, Event.EventType.EXAM, title='Finals',
-            delta_start=timezone.timedelta(minutes=30),
-            delta_end=timezone.timedelta(minutes=90),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(self.user)
-        self.assertTrue(Notification.objects.filter(
-            user=self.user, message__icontains='1 hour'
-        ).exists())
-
-    def test_creates_notification_for_class_starting_tomorrow(self):
-        """Test that create_event_notifications creates a notification for classes starting tomorrow."""
-        make_event(
-            self.user, Event.EventType.CLASS, title='Lecture',
-            delta_start=timezone.timedelta(hours=20),
-            delta_end=timezone.timedelta(hours=21),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(self.user)
-        self.assertTrue(Notification.objects.filter(
-            user=self.user, message__icontains='tomorrow'
-        ).exists())
-
-    def test_creates_notification_for_meeting_this_week(self):
-        """Test that create_event_notifications creates a notification for meetings happening this week."""
-        make_event(
-            self.user, Event.EventType.MEETING, title='Supervisor',
-            delta_start=timezone.timedelta(days=3),
-            delta_end=timezone.timedelta(days=3, hours=1),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(self.user)
-        self.assertTrue(Notification.objects.filter(
-            user=self.user, message__icontains='this week'
-        ).exists())
-
-    def test_notification_type_matches_event_type_exam(self):
-        """Test that create_event_notifications sets the correct notification type for exams."""
-        make_event(
-            self.user, Event.EventType.EXAM, title='Midterm',
-            delta_start=timezone.timedelta(minutes=30),
-            delta_end=timezone.timedelta(minutes=90),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(self.user)
-        n = Notification.objects.filter(user=self.user).first()
-        self.assertEqual(n.type, Notification.Type.EXAM)
-
-    def test_notification_type_matches_event_type_meeting(self):
-        """Test that create_event_notifications sets the correct notification type for meetings."""
-        make_event(
-            self.user, Event.EventType.MEETING, title='Standup',
-            delta_start=timezone.timedelta(minutes=30),
-            delta_end=timezone.timedelta(minutes=90),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(self.user)
-        n = Notification.objects.filter(user=self.user).first()
-        self.assertEqual(n.type, Notification.Type.MEETING)
-
-    def test_notification_type_matches_event_type_study_session(self):
-        """Test that create_event_notifications sets the correct notification type for study sessions."""
-        make_event(
-            self.user, Event.EventType.STUDY_SESSION, title='Revision',
-            delta_start=timezone.timedelta(minutes=30),
-            delta_end=timezone.timedelta(minutes=90),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(self.user)
-        n = Notification.objects.filter(user=self.user).first()
-        self.assertEqual(n.type, Notification.Type.STUDY_SESSION)
-
-    def test_does_not_create_notification_for_deadline_type(self):
-        """Deadlines are handled by create_deadline_notifications, not this method."""
-        make_event(
-            self.user, Event.EventType.DEADLINE, title='Assignment',
-            delta_start=timezone.timedelta(minutes=30),
-            delta_end=timezone.timedelta(hours=12),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(self.user)
-        self.assertEqual(Notification.objects.filter(user=self.user).count(), 0)
-
-    def test_does_not_create_notification_for_completed_event(self):
-        """Test that create_event_notifications does not create a notification for completed events."""
-        event = make_event(
-            self.user, Event.EventType.EXAM, title='Old Exam',
-            delta_start=timezone.timedelta(minutes=30),
-            delta_end=timezone.timedelta(minutes=90),
-            status=Event.EventStatus.UPCOMING,
-        )
-        event.is_completed = True
-        event.save()
-        NotificationService.create_event_notifications(self.user)
-        self.assertEqual(Notification.objects.filter(user=self.user).count(), 0)
-
-    def test_no_notification_for_far_future_event(self):
-        """Test that create_event_notifications does not create a notification for events far in the future."""
-        make_event(
-            self.user, Event.EventType.EXAM, title='Far Exam',
-            delta_start=timezone.timedelta(days=14),
-            delta_end=timezone.timedelta(days=14, hours=2),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(self.user)
-        self.assertEqual(Notification.objects.filter(user=self.user).count(), 0)
-
-    def test_no_duplicate_event_notifications(self):
-        """Test that create_event_notifications does not create duplicate notifications."""
-        make_event(
-            self.user, Event.EventType.CLASS, title='Maths',
-            delta_start=timezone.timedelta(minutes=30),
-            delta_end=timezone.timedelta(minutes=90),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(self.user)
-        NotificationService.create_event_notifications(self.user)
-        self.assertEqual(Notification.objects.filter(user=self.user).count(), 1)
-
-    def test_notification_title_contains_event_title(self):
-        """Test that the notification title contains the event title."""
-        make_event(
-            self.user, Event.EventType.EXAM, title='Biology Finals',
-            delta_start=timezone.timedelta(minutes=30),
-            delta_end=timezone.timedelta(minutes=90),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(self.user)
-        n = Notification.objects.filter(user=self.user).first()
-        self.assertIn('Biology Finals', n.message)
\ No newline at end of file
+        """Create a post author, a post and a few other users."""
+        self.author = User.objects.create_user(username='author', password='pass')
+        self.post = Post.objects.create(author=self.author, content='Hello')
+        self.fans = [User.objects.create_user(username=f'fan{i}', password='pass') for i in range(10)]
+
+    def test_nothing_is_written_before_commit(self):
+        """Likes inside collect() write no notification until it commits, then one batch."""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks, activity_buffer.collect():
+            Like.objects.create(user=self.fans[0], post=self.post)
+            Like.objects.create(user=self.fans[1], post=self.post)
+        self.assertFalse(Notification.objects.filter(user=self.author).exists())
+        self.assertEqual(len(callbacks), 1)
+
+    def test_transaction_is_flushed_in_one_batch(self):
+        """Ten likes in one collect() block are folded with a fixed number of queries."""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks, activity_buffer.collect():
+            for fan in self.fans:
+                Like.objects.create(user=fan, post=self.post)
+        with self.assertNumQueries(5):
+            for callback in callbacks:
+                callback()
+        self.assertEqual(Notification.objects.get(user=self.author).actor_count, 10)
+
+    def test_rolled_back_transaction_writes_nothing(self):
+        """Activity discarded by a rollback is not flushed with later activity."""
+        from django.db import transaction
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Like.objects.create(user=self.fans[0], post=self.post)
+                    raise ValueError
+            except ValueError:
+                pass
+            Like.objects.create(user=self.fans[1], post=self.post)
+        self.assertEqual(Notification.objects.get(user=self.author).recent_actors, ['fan1'])
+
+    def test_rolled_back_nested_block_is_dropped_from_batch(self):
+        """Activity from a nested collect() that raised is not written with the outer batch."""
+        with self.captureOnCommitCallbacks(execute=True), activity_buffer.collect():
+            try:
+                with activity_buffer.collect():
+                    Like.objects.create(user=self.fans[0], post=self.post)
+                    raise ValueError
+            except ValueError:
+                pass
+            Like.objects.create(user=self.fans[1], post=self.post)
+        self.assertEqual(Notification.objects.get(user=self.author).recent_actors, ['fan1'])
+
+    def test_like_view_writes_notification_after_commit(self):
+        """The like view runs in one transaction and writes the notification once it commits."""
+        self.client.force_login(self.fans[0])
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.client.post(reverse('like_post', args=[self.post.pk]))
+        self.assertFalse(Notification.objects.filter(user=self.author).exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(Notification.objects.get(user=self.author).message, 'fan0 liked your post')
+
+    @override_settings(NOTIFICATION_FANOUT='queue')
+    def test_queue_mode_defers_to_runner(self):
+        """In queue mode the commit only queues the activity; flush_activity writes it."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for fan in self.fans[:3]:
+                Like.objects.create(user=fan, post=self.post)
+        self.assertFalse(Notification.objects.filter(user=self.author).exists())
+        self.assertEqual(PendingActivity.objects.count(), 3)
+        out = StringIO()
+        call_command('flush_activity', stdout=out)
+        self.assertIn('Flushed 3 activities.', out.getvalue())
+        self.assertEqual(Notification.objects.get(user=self.author).message, 'fan2 and 2 others liked your post')
+        self.assertFalse(PendingActivity.objects.exists())
@@ -0,0 +1,128 @@
+"""
+test_occurrence_service.py - Tests for OccurrenceService and the EventOccurrence table, covering
+regeneration on save and edit, cascade on delete, rolling-horizon extension, the trusted-window
+read path used by the calendar, and busy slots for recurring events.
+"""
+
+from datetime import date, datetime, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from timeout.models import Event, EventOccurrence
+from timeout.services.occurrence_service import OccurrenceService
+from timeout.services.study_planner import get_busy_slots
+
+User = get_user_model()
+
+
+def _aware(*args):
+    """Helper to build an aware datetime."""
+    return timezone.make_aware(datetime(*args))
+
+
+class OccurrenceSyncTests(TestCase):
+    """Tests for keeping occurrences in step with Event writes."""
+
+    def setUp(self):
+        """Create a user and a weekly series starting today."""
+        self.user = User.objects.create_user(username="occ", password="pass1234")
+        start = timezone.now().replace(hour=9, minute=0, second=0, microsecond=0)
+        self.event = Event.objects.create(
+            creator=self.user, title="Lecture", recurrence="weekly",
+            start_datetime=start, end_datetime=start + timedelta(hours=1))
+
+    def test_one_off_event_has_single_occurrence(self):
+        """A non-recurring event is stored as exactly one occurrence."""
+        ev = Event.objects.create(
+            creator=self.user, title="Once",
+            start_datetime=_aware(2025, 3, 3, 9), end_datetime=_aware(2025, 3, 3, 10))
+        self.assertEqual(list(ev.occurrences.values_list('occurrence_start', flat=True)), [ev.start_datetime])
+
+    def test_recurring_event_materialised_up_to_horizon(self):
+        """A weekly series is stored weekly up to the horizon, with the creator copied."""
+        occurrences = list(self.event.occurrences.all())
+        self.assertEqual(len(occurrences), OccurrenceService.HORIZON_DAYS // 7 + 1)
+        self.assertTrue(all(o.creator_id == self.user.id for o in occurrences))
+        self.assertEqual(occurrences[1].occurrence_start - occurrences[0].occurrence_start, timedelta(weeks=1))
+
+    def test_editing_schedule_regenerates(self):
+        """Changing the recurrence replaces the stored occurrences."""
+        self.event.recurrence = "none"
+        self.event.save()
+        self.assertEqual(self.event.occurrences.count(), 1)
+
+    def test_update_fields_without_schedule_skips_regeneration(self):
+        """Saving only non-scheduling fields leaves occurrences untouched."""
+        ids = set(self.event.occurrences.values_list('id', flat=True))
+        self.event.mark_completed()
+        self.assertEqual(set(self.event.occurrences.values_list('id', flat=True)), ids)
+
+    def test_delete_cascades(self):
+        """Deleting an event removes its occurrences."""
+        self.event.delete()
+        self.assertFalse(EventOccurrence.objects.exists())
+
+    def test_extend_appends_missing_dates_only(self):
+        """extend only adds occurrences after the last stored one."""
+        before = self.event.occurrences.count()
+        later = OccurrenceService.horizon() + timedelta(weeks=4)
+        created = OccurrenceService.extend(until=later)
+        self.assertEqual(created, 4)
+        self.assertEqual(self.event.occurrences.count(), before + 4)
+        self.assertEqual(OccurrenceService.extend(until=later), 0)
+
+    def test_extend_command(self):
+        """The extend_occurrences command reports how many rows it created."""
+        EventOccurrence.objects.all().delete()
+        out = StringIO()
+        call_command('extend_occurrences', stdout=out)
+        self.assertIn("Created", out.getvalue())
+        self.assertTrue(self.event.occurrences.exists())
+
+    def test_rebuild_command(self):
+        """The --rebuild flag regenerates every event."""
+        EventOccurrence.objects.all().delete()
+        out = StringIO()
+        call_command('extend_occurrences', '--rebuild', stdout=out)
+        self.assertIn("Rebuilt occurrences for 1 events", out.getvalue())
+        self.assertTrue(self.event.occurrences.exists())
+
+
+class OccurrenceReadTests(TestCase):
+    """Tests for range reads served from the occurrence table."""
+
+    def setUp(self):
+        """Create a user with a daily series."""
+        self.user = User.objects.create_user(username="reader", password="pass1234")
+        Event.objects.create(
+            creator=self.user, title="Daily", recurrence="daily",
+            start_datetime=_aware(2026, 4, 1, 9), end_datetime=_aware(2026, 4, 1, 10))
+
+    def test_busy_slots_include_recurring_repeats(self):
+        """get_busy_slots sees repeats of a recurring event, not just the original."""
+        busy = get_busy_slots(self.user, _aware(2026, 4, 5, 8), _aware(2026, 4, 5, 22))
+        self.assertEqual(busy, [(_aware(2026, 4, 5, 9), _aware(2026, 4, 5, 10))])
+
+    def test_visible_in_window_matches_on_the_fly_expansion(self):
+        """Reads beyond the trusted horizon fall back to expansion with the same result."""
+        first, last = date(2026, 4, 3), date(2026, 4, 6)
+        stored = [(e.id, s) for e, s, _ in OccurrenceService.visible_in_window(self.user, first, last)]
+        with patch.object(OccurrenceService, 'TRUSTED_DAYS', -100000):
+            expanded = [(e.id, s) for e, s, _ in OccurrenceService.visible_in_window(self.user, first, last)]
+        self.assertEqual(len(stored), 4)
+        self.assertEqual(stored, expanded)
+
+    def test_global_events_visible_to_everyone(self):
+        """Global events show up in another user's window."""
+        other = User.objects.create_user(username="other", password="pass1234")
+        Event.objects.create(
+            creator=other, title="Holiday", is_global=True,
+            start_datetime=_aware(2026, 4, 4, 0), end_datetime=_aware(2026, 4, 4, 23))
+        titles = [e.title for e, _, _ in OccurrenceService.visible_in_window(
+            self.user, date(2026, 4, 4), date(2026, 4, 4))]
+        self.assertIn("Holiday", titles)
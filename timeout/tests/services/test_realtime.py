@@ -0,0 +1,115 @@
+"""
+test_realtime.py - Defines tests for the realtime hub, covering the local backend's subscribe/publish
+cycle, publishing only after commit, and the notification and message hooks that feed it.
+"""
+
+
+import asyncio
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from timeout.models import Conversation, Message
+from timeout.models.notification import Notification
+from timeout.services import realtime
+
+User = get_user_model()
+
+
+class LocalBackendTests(SimpleTestCase):
+    """Tests for the in-process backend."""
+
+    def test_publish_reaches_only_the_users_queues(self):
+        """Events go to every queue of the target user and to nobody else."""
+        async def scenario():
+            backend = realtime.LocalBackend()
+            first, second, other = backend.subscribe(1), backend.subscribe(1), backend.subscribe(2)
+            backend.publish(1, 'unread', {'unread_count': 3})
+            await asyncio.sleep(0)
+            return first.get_nowait(), second.get_nowait(), other.empty()
+
+        first, second, other_empty = asyncio.run(scenario())
+        self.assertEqual(first, ('unread', {'unread_count': 3}))
+        self.assertEqual(second, first)
+        self.assertTrue(other_empty)
+
+    def test_unsubscribed_queue_receives_nothing(self):
+        """After unsubscribe the queue is no longer fed."""
+        async def scenario():
+            backend = realtime.LocalBackend()
+            queue = backend.subscribe(1)
+            backend.unsubscribe(1, queue)
+            backend.publish(1, 'sync', {})
+            await asyncio.sleep(0)
+            return queue.empty(), backend._subscribers
+
+        empty, subscribers = asyncio.run(scenario())
+        self.assertTrue(empty)
+        self.assertEqual(dict(subscribers), {})
+
+    def test_full_queue_drops_overflow(self):
+        """A stream that falls behind drops events instead of growing without bound."""
+        async def scenario():
+            backend = realtime.LocalBackend()
+            queue = backend.subscribe(1)
+            for i in range(realtime.QUEUE_SIZE + 5):
+                backend.publish(1, 'sync', {'n': i})
+            await asyncio.sleep(0)
+            return queue.qsize()
+
+        self.assertEqual(asyncio.run(scenario()), realtime.QUEUE_SIZE)
+
+    def test_format_event(self):
+        """Events are encoded in the text/event-stream format."""
+        self.assertEqual(realtime.format_event('unread', {'unread_count': 1}),
+                         'event: unread\ndata: {"unread_count": 1}\n\n')
+
+
+class RealtimeHookTests(TestCase):
+    """Tests for the hooks publishing notifications and messages."""
+
+    def setUp(self):
+        """Create two users in a conversation."""
+        self.alice = User.objects.create_user(username='alice', password='pass')
+        self.bob = User.objects.create_user(username='bob', password='pass')
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.alice, self.bob)
+
+    def _published(self, action):
+        """Run action, commit, and return the (user_id, event, data) calls made on the backend."""
+        with patch.object(realtime.get_backend(), 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                action()
+        return [c.args for c in publish.call_args_list]
+
+    def test_new_notification_is_pushed_with_unread_count(self):
+        """Creating a notification pushes it with the user's unread count."""
+        calls = self._published(lambda: Notification.objects.create(user=self.alice, title='Hi', message='There'))
+        self.assertEqual(len(calls), 1)
+        user_id, event, data = calls[0]
+        self.assertEqual((user_id, event, data['title'], data['unread_count']), (self.alice.pk, 'notification', 'Hi', 1))
+
+    def test_marking_read_pushes_unread_count(self):
+        """Marking a notification read pushes the new unread count."""
+        notification = Notification.objects.create(user=self.alice, title='Hi', message='There')
+
+        def mark_read():
+            notification.is_read = True
+            notification.save(update_fields=['is_read'])
+
+        self.assertEqual(self._published(mark_read), [(self.alice.pk, 'unread', {'unread_count': 0})])
+
+    def test_nothing_is_pushed_before_commit(self):
+        """Events wait for the transaction to commit."""
+        with patch.object(realtime.get_backend(), 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=False):
+                Notification.objects.create(user=self.alice, title='Hi', message='There')
+            publish.assert_not_called()
+
+    def test_new_message_is_pushed_to_the_other_participant(self):
+        """A message is pushed to the recipient, not the sender."""
+        calls = self._published(lambda: Message.objects.create(
+            conversation=self.conversation, sender=self.alice, content='Hello'))
+        self.assertEqual([(user_id, event) for user_id, event, _ in calls], [(self.bob.pk, 'message')])
+        self.assertEqual(calls[0][2]['conversation_id'], self.conversation.pk)
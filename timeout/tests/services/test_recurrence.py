@@ -0,0 +1,106 @@
+"""
+test_recurrence.py - Tests for the window-bounded recurrence engine, covering direct jumps to the
+first visible occurrence for daily, weekly and monthly series, month-end clamping, and the
+window query used by the calendar.
+"""
+
+from datetime import date, datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from timeout.models import Event
+from timeout.services.recurrence import (
+    expand_event,
+    first_index_on_or_after,
+    occurrence_dates,
+    shift_months,
+    window_q,
+)
+
+User = get_user_model()
+
+
+def _aware(*args):
+    """Helper to build an aware datetime."""
+    return timezone.make_aware(datetime(*args))
+
+
+class OccurrenceDateTests(TestCase):
+    """Tests for occurrence_dates and its index helpers."""
+
+    def test_daily_jumps_to_window(self):
+        """A two-year-old daily series only yields dates inside the window."""
+        dates = list(occurrence_dates(date(2023, 1, 1), 'daily', date(2025, 3, 1), date(2025, 3, 5)))
+        self.assertEqual(dates, [date(2025, 3, d) for d in range(1, 6)])
+
+    def test_weekly_keeps_weekday(self):
+        """Weekly occurrences stay on the anchor's weekday."""
+        dates = list(occurrence_dates(date(2024, 1, 1), 'weekly', date(2025, 3, 1), date(2025, 3, 31)))
+        self.assertEqual(dates, [date(2025, 3, d) for d in (3, 10, 17, 24, 31)])
+
+    def test_monthly_clamps_without_drift(self):
+        """A series on the 31st clamps in short months but returns to the 31st."""
+        dates = list(occurrence_dates(date(2025, 1, 31), 'monthly', date(2025, 2, 1), date(2025, 3, 31)))
+        self.assertEqual(dates, [date(2025, 2, 28), date(2025, 3, 31)])
+
+    def test_window_before_anchor(self):
+        """A window ending before the anchor yields nothing."""
+        self.assertEqual(list(occurrence_dates(date(2025, 5, 1), 'daily', date(2025, 3, 1), date(2025, 3, 31))), [])
+
+    def test_non_recurring_inside_and_outside(self):
+        """Non-recurring events yield their own date only when it is visible."""
+        self.assertEqual(list(occurrence_dates(date(2025, 3, 2), 'none', date(2025, 3, 1), date(2025, 3, 31))), [date(2025, 3, 2)])
+        self.assertEqual(list(occurrence_dates(date(2025, 2, 2), 'none', date(2025, 3, 1), date(2025, 3, 31))), [])
+
+    def test_first_index_monthly(self):
+        """The monthly index skips a clamped occurrence that falls before the window."""
+        self.assertEqual(first_index_on_or_after(date(2025, 1, 15), 'monthly', date(2025, 3, 16)), 3)
+        self.assertEqual(first_index_on_or_after(date(2025, 1, 15), 'monthly', date(2025, 3, 15)), 2)
+
+    def test_shift_months_crosses_year(self):
+        """shift_months wraps into the next year."""
+        self.assertEqual(shift_months(date(2024, 12, 15), 1), date(2025, 1, 15))
+        self.assertEqual(shift_months(date(2024, 1, 31), 13), date(2025, 2, 28))
+
+
+class ExpandEventTests(TestCase):
+    """Tests for expand_event and window_q against stored events."""
+
+    def setUp(self):
+        """Create a user owning the events."""
+        self.user = User.objects.create_user(username="recur", password="pass1234")
+
+    def _make(self, start, end, recurrence='none', title="Series"):
+        """Helper to create an event."""
+        return Event.objects.create(
+            creator=self.user, title=title, start_datetime=start,
+            end_datetime=end, recurrence=recurrence)
+
+    def test_repeats_keep_duration(self):
+        """Repeated occurrences keep the original duration, even across midnight."""
+        ev = self._make(_aware(2025, 1, 1, 23, 0), _aware(2025, 1, 2, 1, 0), 'weekly')
+        occurrences = list(expand_event(ev, date(2025, 1, 8), date(2025, 1, 8)))
+        self.assertEqual(occurrences, [(_aware(2025, 1, 8, 23, 0), _aware(2025, 1, 9, 1, 0))])
+
+    def test_anchor_keeps_stored_datetimes(self):
+        """The original occurrence is yielded with its stored datetimes."""
+        ev = self._make(_aware(2025, 3, 3, 9, 0), _aware(2025, 3, 3, 10, 0), 'daily')
+        first = next(expand_event(ev, date(2025, 3, 1), date(2025, 3, 31)))
+        self.assertEqual(first, (ev.start_datetime, ev.end_datetime))
+
+    def test_window_q_excludes_old_one_off_events(self):
+        """Old one-off events are excluded while old recurring series are kept."""
+        self._make(_aware(2023, 1, 1, 9, 0), _aware(2023, 1, 1, 10, 0), title="Old")
+        self._make(_aware(2023, 1, 1, 9, 0), _aware(2023, 1, 1, 10, 0), 'weekly', title="Weekly")
+        self._make(_aware(2025, 3, 10, 9, 0), _aware(2025, 3, 10, 10, 0), title="Inside")
+        self._make(_aware(2025, 5, 10, 9, 0), _aware(2025, 5, 10, 10, 0), 'daily', title="Later")
+        titles = set(Event.objects.filter(window_q(date(2025, 3, 1), date(2025, 3, 31)))
+                     .values_list('title', flat=True))
+        self.assertEqual(titles, {"Weekly", "Inside"})
+
+    def test_window_q_keeps_overlapping_one_off(self):
+        """A one-off event that started before the window but ends inside it is kept."""
+        self._make(_aware(2025, 2, 27, 9, 0), _aware(2025, 3, 2, 10, 0), title="Overlap")
+        self.assertTrue(Event.objects.filter(window_q(date(2025, 3, 1), date(2025, 3, 31))).exists())
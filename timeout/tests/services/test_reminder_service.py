@@ -0,0 +1,218 @@
+"""
+test_reminder_service.py - Defines tests for ReminderService, covering which reminder rows are written
+when events are saved or subscribed to, how the runner turns due rows into notifications, and how
+recurring events are re-armed for their next occurrence.
+"""
+
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from timeout.models import Event, EventSubscription, ReminderSchedule, UserCounters
+from timeout.models.notification import Notification
+from timeout.services.notification_service import NotificationService
+from timeout.services.reminder_service import ReminderService
+
+User = get_user_model()
+
+
+def make_event(creator, event_type=Event.EventType.DEADLINE, due_in=timedelta(days=3), **kwargs):
+    """Helper to create an event due (ending for deadlines, starting otherwise) after due_in."""
+    now = timezone.now()
+    if event_type == Event.EventType.DEADLINE:
+        start, end = now - timedelta(hours=1), now + due_in
+    else:
+        start, end = now + due_in, now + due_in + timedelta(hours=1)
+    return Event.objects.create(creator=creator, title='Essay', event_type=event_type,
+                                start_datetime=start, end_datetime=end, **kwargs)
+
+
+def kinds(event, user):
+    """Helper returning the pending reminder kinds of an event for a user."""
+    return set(ReminderSchedule.objects.filter(event=event, user=user).values_list('kind', flat=True))
+
+
+class ReminderScheduleTests(TestCase):
+    """Tests for writing the reminder schedule."""
+
+    def setUp(self):
+        """Create a user for testing."""
+        self.user = User.objects.create_user(username='student', password='pass')
+
+    def test_saving_event_schedules_remaining_windows(self):
+        """An event due in three days gets a day reminder, an hour reminder and one firing now for the week."""
+        event = make_event(self.user)
+        self.assertEqual(kinds(event, self.user), {'week', 'day', 'hour'})
+        week = ReminderSchedule.objects.get(event=event, kind='week')
+        self.assertLessEqual(week.fire_at, timezone.now())
+        day = ReminderSchedule.objects.get(event=event, kind='day')
+        self.assertEqual(day.fire_at, event.end_datetime - timedelta(days=1))
+
+    def test_far_event_schedules_all_windows_in_future(self):
+        """An event a month away gets all three reminders, none due yet."""
+        event = make_event(self.user, Event.EventType.EXAM, due_in=timedelta(days=30))
+        self.assertEqual(kinds(event, self.user), {'week', 'day', 'hour'})
+        self.assertFalse(ReminderSchedule.objects.filter(fire_at__lte=timezone.now()).exists())
+
+    def test_event_inside_day_window_skips_week(self):
+        """An event due in five hours only gets the day and hour reminders."""
+        event = make_event(self.user, due_in=timedelta(hours=5))
+        self.assertEqual(kinds(event, self.user), {'day', 'hour'})
+
+    def test_moving_event_rewrites_schedule(self):
+        """Editing the due time replaces the old rows."""
+        event = make_event(self.user, due_in=timedelta(days=30))
+        event.end_datetime = timezone.now() + timedelta(minutes=30)
+        event.save()
+        self.assertEqual(kinds(event, self.user), {'hour'})
+
+    def test_completed_and_past_events_have_no_reminders(self):
+        """Completed deadlines and events already due are not scheduled."""
+        done = make_event(self.user, is_completed=True)
+        past = make_event(self.user, Event.EventType.MEETING, due_in=timedelta(hours=-2))
+        self.assertFalse(ReminderSchedule.objects.filter(event__in=[done, past]).exists())
+
+    def test_subscription_schedules_and_unschedules_subscriber(self):
+        """Subscribing adds the subscriber's reminders; unsubscribing removes only theirs."""
+        other = User.objects.create_user(username='other', password='pass')
+        event = make_event(other, Event.EventType.EXAM, visibility=Event.Visibility.PUBLIC)
+        link = EventSubscription.objects.create(user=self.user, event=event)
+        self.assertEqual(kinds(event, self.user), {'week', 'day', 'hour'})
+        link.delete()
+        self.assertEqual(kinds(event, self.user), set())
+        self.assertEqual(kinds(event, other), {'week', 'day', 'hour'})
+
+
+class FireDueTests(TestCase):
+    """Tests for the reminder runner."""
+
+    def setUp(self):
+        """Create a user for testing."""
+        self.user = User.objects.create_user(username='student', password='pass')
+
+    def test_fires_due_reminder_once(self):
+        """A due row becomes one notification and is removed; a second run sends nothing."""
+        event = make_event(self.user, due_in=timedelta(minutes=30))
+        self.assertEqual(ReminderService.fire_due(), 1)
+        notification = Notification.objects.get(user=self.user, deadline=event)
+        self.assertEqual(notification.message, '1 hour left to complete your deadline!')
+        self.assertEqual(ReminderService.fire_due(), 0)
+        self.assertFalse(ReminderSchedule.objects.filter(event=event).exists())
+
+    def test_future_rows_are_left_alone(self):
+        """Rows whose fire_at is ahead are neither sent nor deleted."""
+        event = make_event(self.user, Event.EventType.CLASS, due_in=timedelta(days=30))
+        self.assertEqual(ReminderService.fire_due(), 0)
+        self.assertEqual(kinds(event, self.user), {'week', 'day', 'hour'})
+
+    def test_later_run_sends_the_next_window(self):
+        """Once the day window opens, the day reminder fires with the event's own wording."""
+        event = make_event(self.user, Event.EventType.EXAM, due_in=timedelta(days=3))
+        ReminderService.fire_due()
+        ReminderService.fire_due(now=event.start_datetime - timedelta(hours=20))
+        messages = set(Notification.objects.filter(deadline=event).values_list('message', flat=True))
+        self.assertEqual(messages, {'Your Exam "Essay" is coming up this week!', 'Your Exam "Essay" starts tomorrow!'})
+
+    def test_superseded_window_is_skipped(self):
+        """If the runner was down through the week window, only the tighter reminder is sent."""
+        event = make_event(self.user, Event.EventType.EXAM, due_in=timedelta(days=3))
+        ReminderService.fire_due(now=event.start_datetime - timedelta(minutes=30))
+        messages = list(Notification.objects.filter(deadline=event).values_list('message', flat=True))
+        self.assertEqual(messages, ['Your Exam "Essay" starts in 1 hour!'])
+
+    def test_recurring_event_is_rearmed_for_next_occurrence(self):
+        """After an occurrence's hour reminder fires, the next occurrence gets its own hour reminder."""
+        event = make_event(self.user, Event.EventType.CLASS, due_in=timedelta(minutes=30),
+                           recurrence=Event.EventRecurrence.WEEKLY)
+        self.assertEqual(ReminderService.fire_due(), 1)
+        second = event.start_datetime + timedelta(weeks=1)
+        self.assertEqual(set(ReminderSchedule.objects.filter(event=event).values_list('due_at', flat=True)), {second})
+        self.assertEqual(ReminderService.fire_due(now=second - timedelta(minutes=30)), 1)
+        hours = Notification.objects.filter(deadline=event, reminder_kind='hour')
+        self.assertEqual(sorted(hours.values_list('reminder_due_at', flat=True)), [event.start_datetime, second])
+        self.assertTrue(ReminderSchedule.objects.filter(event=event, due_at=second + timedelta(weeks=1)).exists())
+
+    def test_rearm_skips_windows_longer_than_the_recurrence(self):
+        """A daily class is re-armed an hour ahead only, a weekly one a day and an hour ahead."""
+        daily = make_event(self.user, Event.EventType.CLASS, due_in=timedelta(minutes=30),
+                           recurrence=Event.EventRecurrence.DAILY)
+        weekly = make_event(self.user, Event.EventType.CLASS, due_in=timedelta(minutes=30),
+                            recurrence=Event.EventRecurrence.WEEKLY)
+        ReminderService.fire_due()
+        self.assertEqual(kinds(daily, self.user), {ReminderSchedule.Kind.HOUR})
+        self.assertEqual(kinds(weekly, self.user), {ReminderSchedule.Kind.HOUR, ReminderSchedule.Kind.DAY})
+        ReminderService.fire_due(now=daily.start_datetime + timedelta(hours=23, minutes=30))
+        self.assertFalse(Notification.objects.filter(deadline=daily, reminder_kind__in=['day', 'week']).exists())
+
+    def test_completed_before_firing_is_skipped(self):
+        """Deadlines completed after scheduling send nothing."""
+        event = make_event(self.user, due_in=timedelta(minutes=30))
+        Event.objects.filter(pk=event.pk).update(is_completed=True)
+        self.assertEqual(ReminderService.fire_due(), 0)
+
+    def test_batch_uses_constant_queries(self):
+        """Firing many reminders costs the same handful of queries, counter recount included."""
+        for _ in range(10):
+            make_event(self.user, due_in=timedelta(minutes=30))
+        with self.assertNumQueries(9):
+            self.assertEqual(ReminderService.fire_due(), 10)
+
+    def test_command_fires_and_rebuilds(self):
+        """send_reminders --rebuild reschedules existing events, then fires the due ones."""
+        event = make_event(self.user, due_in=timedelta(minutes=30))
+        ReminderSchedule.objects.all().delete()
+        out = StringIO()
+        call_command('send_reminders', '--rebuild', stdout=out)
+        self.assertIn('Sent 1 reminders.', out.getvalue())
+        self.assertTrue(Notification.objects.filter(deadline=event).exists())
+
+
+class BroadcastTests(TestCase):
+    """Tests for reminders of global events, broadcast to every user."""
+
+    def setUp(self):
+        """Create an admin announcing a global exam and a few students."""
+        self.admin = User.objects.create_user(username='admin', password='pass')
+        self.students = [User.objects.create_user(username=f'student{i}', password='pass') for i in range(5)]
+
+    def test_global_event_gets_one_row_per_window(self):
+        """A global event is scheduled once per window with no user, not once per user."""
+        event = make_event(self.admin, Event.EventType.EXAM, due_in=timedelta(days=30), is_global=True)
+        rows = ReminderSchedule.objects.filter(event=event)
+        self.assertEqual(rows.count(), 3)
+        self.assertFalse(rows.filter(user__isnull=False).exists())
+
+    def test_fires_to_every_active_user_in_chunks(self):
+        """The broadcast reaches every active user, chunk by chunk, and then its row is removed."""
+        inactive = User.objects.create_user(username='gone', password='pass', is_active=False)
+        event = make_event(self.admin, Event.EventType.EXAM, due_in=timedelta(minutes=30), is_global=True)
+        with patch.object(NotificationService, 'INSERT_CHUNK', 2):
+            self.assertEqual(ReminderService.fire_due(), 6)
+        recipients = set(Notification.objects.filter(deadline=event).values_list('user_id', flat=True))
+        self.assertEqual(recipients, {self.admin.pk, *(s.pk for s in self.students)})
+        self.assertNotIn(inactive.pk, recipients)
+        self.assertFalse(ReminderSchedule.objects.filter(event=event).exists())
+        self.assertEqual(UserCounters.get(self.students[0].pk).unread_notifications, 1)
+
+    def test_interrupted_broadcast_resumes_without_duplicates(self):
+        """Users reached before an interruption are not notified twice when the row fires again."""
+        event = make_event(self.admin, Event.EventType.EXAM, due_in=timedelta(minutes=30), is_global=True)
+        NotificationService.build_reminder(self.students[0].pk, event, 'hour', event.start_datetime).save()
+        ReminderService.fire_due()
+        self.assertEqual(Notification.objects.filter(user=self.students[0], deadline=event).count(), 1)
+        self.assertEqual(Notification.objects.filter(deadline=event).count(), 6)
+
+    def test_making_event_global_reschedules(self):
+        """Turning an event global replaces the creator's rows with broadcast rows."""
+        event = make_event(self.admin, Event.EventType.EXAM, due_in=timedelta(days=30))
+        self.assertEqual(kinds(event, self.admin), {'week', 'day', 'hour'})
+        event.is_global = True
+        event.save()
+        self.assertEqual(kinds(event, self.admin), set())
+        self.assertEqual(ReminderSchedule.objects.filter(event=event, user__isnull=True).count(), 3)
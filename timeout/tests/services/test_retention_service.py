@@ -0,0 +1,91 @@
+"""
+test_retention_service.py - Defines tests for RetentionService and the purge_notifications command,
+covering each retention rule, batching, the unread counter and the dry run.
+"""
+
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from timeout.models import Event, UserCounters
+from timeout.models.notification import Notification
+from timeout.services.retention_service import RetentionService
+
+User = get_user_model()
+
+
+class RetentionServiceTests(TestCase):
+    """Tests for purging notifications."""
+
+    def setUp(self):
+        """Create a user for testing."""
+        self.user = User.objects.create_user(username='student', password='pass')
+
+    def _notify(self, age_days=0, **kwargs):
+        """Create a notification created age_days ago."""
+        notification = Notification.objects.create(user=self.user, title='Hi', message='There', **kwargs)
+        Notification.objects.filter(pk=notification.pk).update(created_at=timezone.now() - timedelta(days=age_days))
+        return notification
+
+    def _remaining(self):
+        """Return the ids of the notifications left."""
+        return set(Notification.objects.values_list('pk', flat=True))
+
+    def test_dismissed_and_old_read_rows_are_deleted(self):
+        """Dismissed and old read rows go; recent and unread rows stay."""
+        self._notify(age_days=10, is_read=True, is_dismissed=True)
+        self._notify(age_days=100, is_read=True)
+        recent_dismissed = self._notify(age_days=1, is_read=True, is_dismissed=True)
+        recent_read = self._notify(age_days=10, is_read=True)
+        old_unread = self._notify(age_days=400)
+        purged = RetentionService.purge()
+        self.assertEqual(purged['dismissed'], 1)
+        self.assertEqual(purged['read'], 1)
+        self.assertEqual(self._remaining(), {recent_dismissed.pk, recent_read.pk, old_unread.pk})
+
+    def test_expired_reminders_are_compacted(self):
+        """Reminders of a one-off event that ended are deleted and the unread counter follows."""
+        now = timezone.now()
+        ended = Event.objects.create(creator=self.user, title='Essay', event_type=Event.EventType.DEADLINE,
+                                     start_datetime=now - timedelta(days=5), end_datetime=now - timedelta(days=2))
+        upcoming = Event.objects.create(creator=self.user, title='Exam', event_type=Event.EventType.DEADLINE,
+                                        start_datetime=now, end_datetime=now + timedelta(days=2))
+        Notification.objects.all().delete()
+        self._notify(deadline=ended, reminder_kind='week', is_read=True)
+        self._notify(deadline=ended, reminder_kind='day')
+        kept = self._notify(deadline=upcoming, reminder_kind='day')
+        self.assertEqual(UserCounters.get(self.user.pk).unread_notifications, 2)
+        self.assertEqual(RetentionService.purge()['expired_reminders'], 2)
+        self.assertEqual(self._remaining(), {kept.pk})
+        self.assertEqual(UserCounters.get(self.user.pk).unread_notifications, 1)
+
+    def test_deletes_in_bounded_batches(self):
+        """Each batch deletes at most BATCH_SIZE rows; max_batches stops early."""
+        for _ in range(5):
+            self._notify(age_days=10, is_read=True, is_dismissed=True)
+        policy = {**RetentionService.policy(), 'BATCH_SIZE': 2}
+        self.assertEqual(RetentionService.purge(policy=policy, max_batches=2)['dismissed'], 4)
+        self.assertEqual(RetentionService.purge(policy=policy)['dismissed'], 1)
+
+    @override_settings(NOTIFICATION_RETENTION={'READ_DAYS': None})
+    def test_disabled_rule_keeps_rows(self):
+        """A rule set to None in settings deletes nothing."""
+        old_read = self._notify(age_days=1000, is_read=True)
+        self.assertNotIn('read', RetentionService.purge())
+        self.assertEqual(self._remaining(), {old_read.pk})
+
+    def test_command_dry_run_deletes_nothing(self):
+        """--dry-run reports the counts and leaves the rows in place."""
+        self._notify(age_days=10, is_read=True, is_dismissed=True)
+        out = StringIO()
+        call_command('purge_notifications', '--dry-run', stdout=out)
+        self.assertIn('Would delete 1 dismissed notifications.', out.getvalue())
+        self.assertEqual(Notification.objects.count(), 1)
+        call_command('purge_notifications', '--batch-size', '1', stdout=out)
+        self.assertIn('Deleted 1 notifications in total.', out.getvalue())
+        self.assertEqual(Notification.objects.count(), 0)
@@ -0,0 +1,193 @@
+"""
+test_timeline_service.py - Defines tests for TimelineService and the rebuild_timelines command,
+covering fan-out on post, backfill and pruning on follow changes, blocks and bans, chunked
+delivery through the fan_out_timelines runner, heavy authors and the following feed read.
+"""
+
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from timeout.models import Block, PendingFanout, Post, TimelineEntry
+from timeout.services.feed_service import FeedService
+from timeout.services.timeline_service import TimelineService
+
+User = get_user_model()
+
+
+class TimelineServiceTests(TestCase):
+    """Tests for writing and pruning home timelines."""
+
+    def setUp(self):
+        """Create an author with one follower and a bystander."""
+        cache.delete(TimelineService.HEAVY_AUTHORS_KEY)
+        self.author = User.objects.create_user(username='author', password='pass')
+        self.follower = User.objects.create_user(username='follower', password='pass')
+        self.other = User.objects.create_user(username='other', password='pass')
+        self.follower.following.add(self.author)
+
+    def _timeline(self, user):
+        """Return the post ids in a user's timeline."""
+        return set(TimelineEntry.objects.filter(owner=user).values_list('post_id', flat=True))
+
+    def _post(self, author=None, **kwargs):
+        """Create a post by author (the test author by default)."""
+        return Post.objects.create(author=author or self.author, content='Hello', **kwargs)
+
+    def test_new_post_reaches_author_and_followers(self):
+        """A post is written to its author's and each follower's timeline, and nobody else's."""
+        post = self._post()
+        self.assertEqual(self._timeline(self.author), {post.pk})
+        self.assertEqual(self._timeline(self.follower), {post.pk})
+        self.assertEqual(self._timeline(self.other), set())
+
+    def test_entry_copies_post_author_and_time(self):
+        """Entries carry the post's author and created_at for pruning and paging."""
+        post = self._post()
+        entry = TimelineEntry.objects.get(owner=self.follower, post=post)
+        self.assertEqual((entry.author_id, entry.created_at), (self.author.pk, post.created_at))
+
+    def test_follow_backfills_recent_posts(self):
+        """Following an author copies their existing posts into the new follower's timeline."""
+        post = self._post()
+        self.other.following.add(self.author)
+        self.assertEqual(self._timeline(self.other), {post.pk})
+
+    def test_backfill_is_limited(self):
+        """Only the BACKFILL_POSTS latest posts are copied on follow."""
+        posts = [self._post() for _ in range(3)]
+        with patch.object(TimelineService, 'BACKFILL_POSTS', 2):
+            self.other.following.add(self.author)
+        self.assertEqual(self._timeline(self.other), {posts[1].pk, posts[2].pk})
+
+    def test_reverse_follow_add_backfills(self):
+        """Adding followers from the author's side backfills them too."""
+        post = self._post()
+        self.author.followers.add(self.other)
+        self.assertEqual(self._timeline(self.other), {post.pk})
+
+    def test_unfollow_prunes_author_posts(self):
+        """Unfollowing removes the author's posts and leaves the follower's own."""
+        self._post()
+        own = self._post(author=self.follower)
+        self.follower.following.remove(self.author)
+        self.assertEqual(self._timeline(self.follower), {own.pk})
+
+    def test_clearing_follows_keeps_own_posts(self):
+        """Unfollowing everyone at once leaves only the user's own posts."""
+        self._post()
+        own = self._post(author=self.follower)
+        self.follower.following.clear()
+        self.assertEqual(self._timeline(self.follower), {own.pk})
+
+    def test_block_prunes_both_directions(self):
+        """A block removes each user's posts from the other's timeline."""
+        post = self._post()
+        Block.objects.create(blocker=self.author, blocked=self.follower)
+        self.assertNotIn(post.pk, self._timeline(self.follower))
+
+    def test_ban_drops_and_unban_restores(self):
+        """Banning drops an author's posts from followers' timelines; unbanning brings them back."""
+        post = self._post()
+        self.author.is_banned = True
+        self.author.save(update_fields=['is_banned'])
+        self.assertEqual(self._timeline(self.follower), set())
+        self.author.is_banned = False
+        self.author.save(update_fields=['is_banned'])
+        self.assertEqual(self._timeline(self.follower), {post.pk})
+
+    def test_banned_author_is_not_fanned_out(self):
+        """Posts by a banned author are not delivered."""
+        User.objects.filter(pk=self.author.pk).update(is_banned=True)
+        self._post()
+        self.assertEqual(self._timeline(self.follower), set())
+
+    def test_large_audience_is_queued_for_runner(self):
+        """Creating a post writes only the first chunk of followers; fan_out_timelines writes the rest."""
+        self.other.following.add(self.author)
+        self.client.force_login(self.author)
+        with patch.object(TimelineService, 'FANOUT_CHUNK', 1):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('create_post'), {'content': 'Big news', 'privacy': 'public'})
+            post = Post.objects.get(author=self.author)
+            self.assertEqual(TimelineEntry.objects.filter(post=post).count(), 2)
+            self.assertEqual(PendingFanout.objects.get().post, post)
+            out = StringIO()
+            call_command('fan_out_timelines', stdout=out)
+        self.assertIn('Fanned out 1 posts.', out.getvalue())
+        self.assertEqual(TimelineEntry.objects.filter(post=post).count(), 3)
+        self.assertFalse(PendingFanout.objects.exists())
+
+    def test_runner_drops_posts_of_banned_authors(self):
+        """A queued post whose author was banned meanwhile is not delivered further."""
+        self.other.following.add(self.author)
+        with patch.object(TimelineService, 'FANOUT_CHUNK', 1):
+            post = self._post()
+            User.objects.filter(pk=self.author.pk).update(is_banned=True)
+            self.assertEqual(TimelineService.drain_fanout(), 1)
+        self.assertEqual(TimelineEntry.objects.filter(post=post).count(), 2)
+        self.assertFalse(PendingFanout.objects.exists())
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=0)
+    def test_heavy_author_is_read_not_written(self):
+        """A heavy author's post only lands in their own timeline but still shows in followers' feeds."""
+        cache.delete(TimelineService.HEAVY_AUTHORS_KEY)
+        self.addCleanup(cache.delete, TimelineService.HEAVY_AUTHORS_KEY)
+        post = self._post()
+        self.assertEqual(self._timeline(self.follower), set())
+        self.assertEqual(self._timeline(self.author), {post.pk})
+        self.assertEqual([p.pk for p in FeedService.get_following_feed(self.follower)], [post.pk])
+
+    def test_bulk_fan_out(self):
+        """fan_out delivers posts written with bulk_create."""
+        posts = Post.objects.bulk_create([Post(author=self.author, content='Bulk')])
+        TimelineService.fan_out(posts)
+        self.assertEqual(self._timeline(self.follower), {posts[0].pk})
+
+    def test_rebuild_command(self):
+        """rebuild_timelines recreates timelines from follows and posts."""
+        post = self._post()
+        TimelineEntry.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_timelines', stdout=out)
+        self.assertIn('Rebuilt 3 timelines', out.getvalue())
+        self.assertEqual(self._timeline(self.follower), {post.pk})
+        self.assertEqual(self._timeline(self.author), {post.pk})
+
+
+class FollowingFeedTimelineTests(TestCase):
+    """Tests for reading the following feed from the timeline."""
+
+    def setUp(self):
+        """Create a reader following an author."""
+        cache.delete(TimelineService.HEAVY_AUTHORS_KEY)
+        self.reader = User.objects.create_user(username='reader', password='pass')
+        self.author = User.objects.create_user(username='writer', password='pass')
+        self.reader.following.add(self.author)
+
+    def test_feed_pages_by_cursor(self):
+        """The feed returns the newest posts first and the cursor continues below the last one."""
+        posts = [Post.objects.create(author=self.author, content=str(i)) for i in range(3)]
+        with patch('timeout.services.feed_service.PAGE_SIZE', 1):
+            first = FeedService.get_following_feed(self.reader)
+            second = FeedService.get_following_feed(self.reader, cursor=first[0].pk)
+        self.assertEqual([p.pk for p in first], [posts[2].pk, posts[1].pk])
+        self.assertEqual([p.pk for p in second], [posts[1].pk, posts[0].pk])
+
+    def test_followers_only_posts_are_shown(self):
+        """Followers-only posts reach followers without a per-post visibility query."""
+        post = Post.objects.create(author=self.author, content='Hi', privacy=Post.Privacy.FOLLOWERS_ONLY)
+        self.assertEqual([p.pk for p in FeedService.get_following_feed(self.reader)], [post.pk])
+
+    def test_feed_query_count_is_bounded(self):
+        """The feed costs the same number of queries however many posts it shows."""
+        for i in range(5):
+            Post.objects.create(author=self.author, content=str(i))
+        with self.assertNumQueries(3):
+            FeedService.get_following_feed(self.reader)
@@ -1,7 +1,7 @@
 """
-Tests for pages, notifications, notes, deadline list filters,
+Tests for pages, notes, deadline list filters,
 dashboard greetings, study planner, management commands,
-message notifications, sitemaps, and OAuth tags.
+sitemaps, and OAuth tags.
 """
 import json
 from datetime import timedelta
@@ -13,7 +13,6 @@ from django.urls import reverse
 from django.utils import timezone
 
 from timeout.models import Event
-from timeout.models.message import Conversation, Message
 from timeout.tests import make_user
 
 User = get_user_model()
@@ -38,138 +37,6 @@ class PagesViewTests(TestCase):
         resp = self.client.get(reverse('dashboard'))
         self.assertEqual(resp.status_code, 200)
 
-class NotificationServiceTests(TestCase):
-    """Tests for the NotificationService helper functions."""
-
-    def test_create_deadline_notifications_within_hour(self):
-        """Test that create_deadline_notifications creates notifications for deadlines within the next hour."""
-        from timeout.services.notification_service import NotificationService
-        from timeout.models.notification import Notification
-        user = make_user()
-        now = timezone.now()
-        Event.objects.create(
-            creator=user, title='Urgent DL',
-            event_type=Event.EventType.DEADLINE,
-            start_datetime=now - timedelta(days=1),
-            end_datetime=now + timedelta(minutes=30),
-            is_completed=False,
-        )
-        NotificationService.create_deadline_notifications(user)
-        self.assertTrue(Notification.objects.filter(user=user).exists())
-
-    def test_create_deadline_notifications_within_day(self):
-        """Test that create_deadline_notifications creates notifications for deadlines within the next day."""
-        from timeout.services.notification_service import NotificationService
-        from timeout.models.notification import Notification
-        user = make_user()
-        now = timezone.now()
-        Event.objects.create(
-            creator=user, title='Tomorrow DL',
-            event_type=Event.EventType.DEADLINE,
-            start_datetime=now - timedelta(days=1),
-            end_datetime=now + timedelta(hours=12),
-            is_completed=False,
-        )
-        NotificationService.create_deadline_notifications(user)
-        self.assertTrue(Notification.objects.filter(user=user).exists())
-
-    def test_create_deadline_notifications_within_week(self):
-        """Test that create_deadline_notifications creates notifications for deadlines within the next week."""
-        from timeout.services.notification_service import NotificationService
-        from timeout.models.notification import Notification
-        user = make_user()
-        now = timezone.now()
-        Event.objects.create(
-            creator=user, title='This Week DL',
-            event_type=Event.EventType.DEADLINE,
-            start_datetime=now - timedelta(days=1),
-            end_datetime=now + timedelta(days=3),
-            is_completed=False,
-        )
-        NotificationService.create_deadline_notifications(user)
-        self.assertTrue(Notification.objects.filter(user=user).exists())
-
-    def test_create_event_notifications_within_hour(self):
-        """Test that create_event_notifications creates notifications for events starting within the next hour."""
-        from timeout.services.notification_service import NotificationService
-        from timeout.models.notification import Notification
-        user = make_user()
-        now = timezone.now()
-        Event.objects.create(
-            creator=user, title='Soon Meeting',
-            event_type=Event.EventType.MEETING,
-            start_datetime=now + timedelta(minutes=30),
-            end_datetime=now + timedelta(hours=1),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(user)
-        self.assertTrue(Notification.objects.filter(user=user).exists())
-
-    def test_create_event_notifications_tomorrow(self):
-        """Test that create_event_notifications creates notifications for events starting tomorrow."""
-        from timeout.services.notification_service import NotificationService
-        from timeout.models.notification import Notification
-        user = make_user()
-        now = timezone.now()
-        Event.objects.create(
-            creator=user, title='Tomorrow Exam',
-            event_type=Event.EventType.EXAM,
-            start_datetime=now + timedelta(hours=12),
-            end_datetime=now + timedelta(hours=14),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(user)
-        self.assertTrue(Notification.objects.filter(user=user).exists())
-
-    def test_create_event_notifications_this_week(self):
-        """Test that create_event_notifications creates notifications for events starting within the next week."""
-        from timeout.services.notification_service import NotificationService
-        from timeout.models.notification import Notification
-        user = make_user()
-        now = timezone.now()
-        Event.objects.create(
-            creator=user, title='This Week Class',
-            event_type=Event.EventType.CLASS,
-            start_datetime=now + timedelta(days=3),
-            end_datetime=now + timedelta(days=3, hours=1),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(user)
-        self.assertTrue(Notification.objects.filter(user=user).exists())
-
-    def test_create_event_notifications_far_future_ignored(self):
-        """Test that create_event_notifications does not create notifications for events starting far in the future."""
-        from timeout.services.notification_service import NotificationService
-        from timeout.models.notification import Notification
-        user = make_user()
-        now = timezone.now()
-        Event.objects.create(
-            creator=user, title='Far Away',
-            event_type=Event.EventType.MEETING,
-            start_datetime=now + timedelta(days=30),
-            end_datetime=now + timedelta(days=30, hours=1),
-            status=Event.EventStatus.UPCOMING,
-        )
-        NotificationService.create_event_notifications(user)
-        self.assertFalse(Notification.objects.filter(user=user).exists())
-
-    def test_notify_once_no_duplicate(self):
-        """Test that _notify_once does not create duplicate notifications."""
-        from timeout.services.notification_service import NotificationService
-        from timeout.models.notification import Notification
-        user = make_user()
-        now = timezone.now()
-        event = Event.objects.create(
-            creator=user, title='DL',
-            event_type=Event.EventType.DEADLINE,
-            start_datetime=now - timedelta(days=1),
-            end_datetime=now + timedelta(minutes=30),
-            is_completed=False,
-        )
-        NotificationService._notify_once(user, event, "Test msg")
-        NotificationService._notify_once(user, event, "Test msg")
-        self.assertEqual(Notification.objects.filter(user=user, message="Test msg").count(), 1)
-
 class NoteAutosaveTests(TestCase):
     """Tests for the note autosave functionality."""
 
@@ -370,27 +237,3 @@ class CheckSiteCommandTests(TestCase):
         out = StringIO()
         call_command('check_site', stdout=out)
         self.assertIn('SITE_ID', out.getvalue())
-
-class MessageNotificationTests(TestCase):
-    """Tests for the NotificationService's create_message_notification function."""
-
-    def test_create_message_notification(self):
-        """Test that the create_message_notification function creates a notification for the recipient."""
-        from timeout.services.notification_service import NotificationService
-        from timeout.models.notification import Notification
-        alice = make_user('alice')
-        bob = make_user('bob')
-        conv = Conversation.objects.create()
-        conv.participants.add(alice, bob)
-        msg = Message.objects.create(conversation=conv, sender=alice, content='Hi')
-        NotificationService.create_message_notification(bob, msg)
-        self.assertTrue(Notification.objects.filter(user=bob).exists())
-
-    def test_create_message_notification_no_recipient(self):
-        """Test that the create_message_notification function does not create a notification if there is no recipient."""
-        from timeout.services.notification_service import NotificationService
-        alice = make_user('alice')
-        conv = Conversation.objects.create()
-        conv.participants.add(alice)
-        msg = Message.objects.create(conversation=conv, sender=alice, content='Solo')
-        NotificationService.create_message_notification(alice, msg)
\ No newline at end of file
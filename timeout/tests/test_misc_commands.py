@@ -30,31 +30,21 @@ class CheckNotificationsCommandTests(TestCase):
         self.user = make_user()
 
     @patch('timeout.management.commands.check_notifications.NotificationService')
-    def test_check_notifications_calls_services_for_each_user(self, mock_svc):
-        """Test that the check_notifications command calls the notification service methods for each user."""
-        out = StringIO()
-        call_command('check_notifications', stdout=out)
-        mock_svc.create_deadline_notifications.assert_called_once_with(self.user)
-        mock_svc.create_event_notifications.assert_called_once_with(self.user)
-        self.assertIn('Notifications checked', out.getvalue())
-
-    @patch('timeout.management.commands.check_notifications.NotificationService')
-    def test_check_notifications_multiple_users(self, mock_svc):
-        """Test that the check_notifications command calls the notification service methods for multiple users."""
+    def test_check_notifications_runs_one_batch(self, mock_svc):
+        """Test that the check_notifications command computes reminders for all users in one batch."""
         make_user('user2')
         out = StringIO()
         call_command('check_notifications', stdout=out)
-        self.assertEqual(mock_svc.create_deadline_notifications.call_count, 2)
-        self.assertEqual(mock_svc.create_event_notifications.call_count, 2)
+        mock_svc.create_due_reminders.assert_called_once()
+        self.assertIn('Notifications checked', out.getvalue())
 
     @patch('timeout.management.commands.check_notifications.NotificationService')
     def test_check_notifications_no_users(self, mock_svc):
-        """Test that the check_notifications command does not call the notification service methods when there are no users."""
+        """Test that the check_notifications command does not call the notification service when there are no users."""
         User.objects.all().delete()
         out = StringIO()
         call_command('check_notifications', stdout=out)
-        mock_svc.create_deadline_notifications.assert_not_called()
-        mock_svc.create_event_notifications.assert_not_called()
+        mock_svc.create_due_reminders.assert_not_called()
 
 
 class InitSiteCommandTests(TestCase):
@@ -124,6 +124,24 @@ class RescheduleStudySessionsTests(TestCase):
         self.assertIn('start', original[0])
         self.assertIn('end', original[0])
 
+    def test_suggestions_flag_clashes_with_fixed_events(self):
+        """Suggestions overlapping a fixed event, or an earlier suggestion, are flagged as conflicts."""
+        session = make_session(self.user)
+        lecture_start = (timezone.now() + timedelta(days=3)).replace(hour=10, minute=0, second=0, microsecond=0)
+        Event.objects.create(
+            creator=self.user, title='Lecture', event_type=Event.EventType.CLASS,
+            start_datetime=lecture_start, end_datetime=lecture_start + timedelta(hours=2))
+        day = lecture_start.strftime('%Y-%m-%d')
+        ai_suggestions = json.dumps([
+            {'id': session.pk, 'title': 'A', 'start': f'{day}T11:00', 'end': f'{day}T12:30'},
+            {'id': session.pk, 'title': 'B', 'start': f'{day}T14:00', 'end': f'{day}T16:00'},
+            {'id': session.pk, 'title': 'C', 'start': f'{day}T15:00', 'end': f'{day}T17:00'},
+        ])
+        self.client.login(username='testuser', password='pass1234')
+        with patch('openai.OpenAI', make_mock_openai(ai_suggestions)):
+            response = self.client.post(self.url)
+        self.assertEqual([s['conflict'] for s in response.json()['suggestions']], [True, False, True])
+
     def test_invalid_json_returns_500(self):
         """Non-JSON AI response returns 500 with an appropriate error message."""
         make_session(self.user)
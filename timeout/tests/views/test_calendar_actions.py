@@ -2,19 +2,23 @@
 Tests for the calendar-related views in the timeout app, including event creation, applying session schedules, and subscribing to events.
 Includes tests for:
 - Event creation: normal events, recurring events, all-day events, validation errors, optional fields, authentication and method guards
-- Applying session schedules: successful updates, invalid JSON, non-existent events, wrong event types, missing keys, empty sessions list, authentication and method guards
-- Subscribing to events: successful subscription, owner cannot subscribe, already subscribed, private event 404, nonexistent event 404, authentication and method guards
+- Applying session schedules: successful updates, invalid JSON, non-existent events, wrong event types, missing keys, empty sessions list, per-session results, rejected sessions keeping their slot, constant query count, authentication and method guards
+- Subscribing to events: successful subscription, edits reaching subscribers, events made private hidden from subscribers, unsubscribing, owner cannot subscribe, already subscribed, private event 404, nonexistent event 404, authentication and method guards
 """
 import json
-from datetime import timedelta
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
-from timeout.models import Event
+from timeout.models import Event, EventSubscription, ReminderSchedule
+from timeout.services import DeadlineService
+from timeout.services.occurrence_service import OccurrenceService
 
 User = get_user_model()
 
@@ -177,6 +181,55 @@ class ApplySessionScheduleTests(TestCase):
         resp = self.client.post(self.url, {"sessions": json.dumps([{"id": session.pk}])})
         self.assertEqual(resp.json()["count"], 0)
 
+    def test_per_session_results(self):
+        """Each submitted session gets a result, with invalid slots reported and left unchanged."""
+        good, bad = self._create_session("Good"), self._create_session("Bad")
+        original_start = bad.start_datetime
+        resp = self.client.post(self.url, {"sessions": json.dumps([
+            {"id": good.pk, "start": "2025-05-01T10:00", "end": "2025-05-01T12:00"},
+            {"id": bad.pk, "start": "2025-05-01T12:00", "end": "2025-05-01T10:00"},
+            {"id": 99999, "start": "2025-05-01T10:00", "end": "2025-05-01T12:00"},
+        ])})
+        results = resp.json()["results"]
+        self.assertEqual([r["success"] for r in results], [True, False, False])
+        good.refresh_from_db()
+        bad.refresh_from_db()
+        self.assertEqual(good.start_datetime, timezone.make_aware(datetime(2025, 5, 1, 10)))
+        self.assertEqual(bad.start_datetime, original_start)
+        self.assertEqual(
+            list(good.occurrences.values_list("occurrence_start", flat=True)), [good.start_datetime])
+
+    def test_rejected_session_keeps_blocking_its_slot(self):
+        """A session moved onto the slot of one whose move was rejected is rejected too."""
+        stays, mover = self._create_session("Stays"), self._create_session("Mover", start_offset=timedelta(days=3))
+        original_start = mover.start_datetime
+        target = stays.start_datetime.replace(tzinfo=None).isoformat()
+        target_end = stays.end_datetime.replace(tzinfo=None).isoformat()
+        resp = self.client.post(self.url, {"sessions": json.dumps([
+            {"id": stays.pk, "start": "2025-05-01T12:00", "end": "2025-05-01T10:00"},
+            {"id": mover.pk, "start": target, "end": target_end},
+        ])})
+        self.assertEqual([r["success"] for r in resp.json()["results"]], [False, False])
+        mover.refresh_from_db()
+        self.assertEqual(mover.start_datetime, original_start)
+
+    def test_query_count_does_not_grow_with_sessions(self):
+        """Rescheduling twenty sessions costs the same number of queries as rescheduling two."""
+        def run(n):
+            sessions = [self._create_session(f"S{i}") for i in range(n)]
+            payload = json.dumps([
+                {"id": s.pk, "start": f"2025-05-{i + 1:02d}T10:00", "end": f"2025-05-{i + 1:02d}T12:00"}
+                for i, s in enumerate(sessions)])
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.post(self.url, {"sessions": payload})
+            return len(ctx.captured_queries)
+        self.assertEqual(run(2), run(20))
+
+    def test_non_list_payload_returns_400(self):
+        """A JSON object instead of a list is rejected."""
+        resp = self.client.post(self.url, {"sessions": json.dumps({"id": 1})})
+        self.assertEqual(resp.status_code, 400)
+
     def test_empty_sessions_list(self):
         """Posting an empty list of sessions should succeed with count=0 and not cause any errors."""
         resp = self.client.post(self.url, {"sessions": json.dumps([])})
@@ -216,11 +269,48 @@ class SubscribeEventTests(TestCase):
         return reverse("subscribe_event", kwargs={"pk": pk})
 
     def test_subscribe_success(self):
-        """A user should be able to subscribe to a public event they don't own, resulting in a new event created for the subscriber with the same details."""
+        """A user should be able to subscribe to a public event they don't own, resulting in a link to the original event rather than a copy."""
         resp = self.client.post(self._url(self.public_event.pk))
         self.assertEqual(resp.status_code, 200)
         self.assertTrue(resp.json()["success"])
-        self.assertTrue(Event.objects.filter(creator=self.subscriber, title="Public Lecture").exists())
+        self.assertTrue(EventSubscription.objects.filter(user=self.subscriber, event=self.public_event).exists())
+        self.assertFalse(Event.objects.filter(creator=self.subscriber).exists())
+
+    def test_subscribed_event_follows_edits(self):
+        """Edits to the original event show up for the subscriber without any copy to update."""
+        self.client.post(self._url(self.public_event.pk))
+        self.public_event.title = "Moved Lecture"
+        self.public_event.save()
+        day = timezone.localtime(self.public_event.start_datetime).date()
+        titles = [e.title for e, _, _ in OccurrenceService.visible_in_window(self.subscriber, day, day)]
+        self.assertEqual(titles, ["Moved Lecture"])
+        upcoming = DeadlineService.get_filtered_deadlines(self.subscriber)
+        self.assertEqual([d["event"].pk for d in upcoming], [self.public_event.pk])
+
+    def test_event_made_private_is_hidden_from_subscriber(self):
+        """An event the owner makes private drops out of the subscriber's calendar, details, feed and reminders until it is public again."""
+        self.client.post(self._url(self.public_event.pk))
+        self.public_event.visibility = Event.Visibility.PRIVATE
+        self.public_event.title = "Staff Only"
+        self.public_event.save()
+        day = timezone.localtime(self.public_event.start_datetime).date()
+        self.assertEqual(list(OccurrenceService.visible_in_window(self.subscriber, day, day)), [])
+        self.assertEqual(self.client.get(reverse("event_details", args=[self.public_event.pk])).status_code, 404)
+        feed = self.client.get(reverse("calendar_feed", args=[self.subscriber.get_calendar_token()]))
+        self.assertNotIn(b"Staff Only", b"".join(feed.streaming_content))
+        self.assertFalse(ReminderSchedule.objects.filter(user=self.subscriber).exists())
+        self.public_event.visibility = Event.Visibility.PUBLIC
+        self.public_event.save()
+        self.assertEqual(self.client.get(reverse("event_details", args=[self.public_event.pk])).status_code, 200)
+        self.assertTrue(ReminderSchedule.objects.filter(user=self.subscriber).exists())
+
+    def test_delete_by_subscriber_only_unsubscribes(self):
+        """Deleting a subscribed event removes the subscription and leaves the original intact."""
+        self.client.post(self._url(self.public_event.pk))
+        resp = self.client.get(reverse("event_delete", kwargs={"pk": self.public_event.pk}))
+        self.assertRedirects(resp, reverse("calendar"), fetch_redirect_response=False)
+        self.assertFalse(EventSubscription.objects.exists())
+        self.assertTrue(Event.objects.filter(pk=self.public_event.pk).exists())
 
     def test_owner_cannot_subscribe(self):
         """Event creators should not be able to subscribe to their own events; the view should return a 400 Bad Request in this case."""
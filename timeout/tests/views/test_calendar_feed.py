@@ -0,0 +1,112 @@
+"""
+Tests for the iCalendar subscription feed, including token lookup, RRULE output for recurring
+events, text escaping and line folding, conditional GET handling, and resetting the feed token.
+"""
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from timeout.models import Event
+from timeout.services.ical_service import escape_text, fold, rrule
+
+User = get_user_model()
+
+
+def _aware(*args):
+    """Helper to build an aware datetime."""
+    return timezone.make_aware(datetime(*args))
+
+
+class IcalHelperTests(TestCase):
+    """Tests for the pure iCalendar formatting helpers."""
+
+    def test_escape_text(self):
+        """Commas, semicolons, backslashes and newlines are escaped."""
+        self.assertEqual(escape_text('a,b;c\\d\ne'), 'a\\,b\\;c\\\\d\\ne')
+
+    def test_fold_long_lines(self):
+        """Lines longer than 75 octets are folded with a leading space."""
+        folded = fold('SUMMARY:' + 'é' * 80)
+        for part in folded.rstrip('\r\n').split('\r\n'):
+            self.assertLessEqual(len(part.encode('utf-8')), 75)
+        self.assertEqual(folded.replace('\r\n ', ''), 'SUMMARY:' + 'é' * 80 + '\r\n')
+
+    def test_rrule(self):
+        """Recurrences map to RRULEs, clamping monthly series past the 28th."""
+        self.assertIsNone(rrule(Event(recurrence='none', start_datetime=_aware(2025, 1, 31, 9))))
+        self.assertEqual(rrule(Event(recurrence='weekly', start_datetime=_aware(2025, 1, 31, 9))), 'FREQ=WEEKLY')
+        self.assertEqual(
+            rrule(Event(recurrence='monthly', start_datetime=_aware(2025, 1, 30, 9))),
+            'FREQ=MONTHLY;BYMONTHDAY=28,29,30;BYSETPOS=-1')
+
+
+class CalendarFeedViewTests(TestCase):
+    """Tests for the calendar_feed view."""
+
+    def setUp(self):
+        """Create a user with a weekly class and store the feed URL."""
+        self.client = Client()
+        self.user = User.objects.create_user(username="feeduser", password="pass1234")
+        self.event = Event.objects.create(
+            creator=self.user, title="Algorithms, Lecture", recurrence="weekly",
+            start_datetime=_aware(2025, 3, 3, 9), end_datetime=_aware(2025, 3, 3, 10))
+        self.url = reverse("calendar_feed", args=[self.user.get_calendar_token()])
+
+    def _body(self, resp):
+        """Join a streamed response body."""
+        return b''.join(resp.streaming_content).decode('utf-8')
+
+    def test_streams_calendar_with_rrule(self):
+        """The feed streams one VEVENT per series with an RRULE instead of instances."""
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp['Content-Type'], 'text/calendar; charset=utf-8')
+        body = self._body(resp)
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertEqual(body.count('BEGIN:VEVENT'), 1)
+        self.assertIn('RRULE:FREQ=WEEKLY\r\n', body)
+        self.assertIn('DTSTART:20250303T090000Z\r\n', body)
+        self.assertIn('SUMMARY:Algorithms\\, Lecture\r\n', body)
+
+    def test_unknown_token_404(self):
+        """An unknown token is a 404 and needs no login."""
+        self.assertEqual(self.client.get(reverse("calendar_feed", args=["nope"])).status_code, 404)
+
+    def test_if_none_match_returns_304(self):
+        """A matching ETag short-circuits to 304 and repeats the ETag."""
+        etag = self.client.get(self.url)['ETag']
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+
+    def test_if_modified_since_returns_304(self):
+        """A client replaying Last-Modified gets a 304."""
+        last_modified = self.client.get(self.url)['Last-Modified']
+        resp = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(resp.status_code, 304)
+
+    def test_delete_changes_etag(self):
+        """Deleting an event changes the ETag even though no row was updated."""
+        Event.objects.create(
+            creator=self.user, title="Extra",
+            start_datetime=_aware(2025, 3, 4, 9), end_datetime=_aware(2025, 3, 4, 10))
+        etag = self.client.get(self.url)['ETag']
+        Event.objects.get(title="Extra").delete()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_reset_token_invalidates_old_url(self):
+        """Resetting the token from settings makes the old URL 404."""
+        self.client.login(username="feeduser", password="pass1234")
+        resp = self.client.post(reverse("reset_calendar_token"))
+        self.assertRedirects(resp, reverse("settings"))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_settings_page_shows_feed_url(self):
+        """The settings page shows the subscription URL."""
+        self.client.login(username="feeduser", password="pass1234")
+        resp = self.client.get(reverse("settings"))
+        self.assertContains(resp, self.url)
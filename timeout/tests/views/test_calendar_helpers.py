@@ -6,7 +6,8 @@ from django.test import TestCase
 from django.utils import timezone
 from datetime import timedelta
 
-from timeout.views.calendar import advance_date, event_status
+from timeout.services.recurrence import advance_date
+from timeout.views.calendar import event_status
 
 
 class AdvanceDateTests(TestCase):
@@ -1,12 +1,14 @@
 """
-Tests for the calendar view in the timeout app, including navigation (month/year parsing, wrapping, prev/next links), the weeks grid context (today flag and in_month flag), and recurring event expansion.
+Tests for the calendar view in the timeout app, including navigation (month/year parsing, wrapping, prev/next links), the weeks grid context (today flag and in_month flag), recurring event expansion, and the cached month grid.
 """
 from datetime import date, datetime
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
-from timeout.models import Event
+from timeout.models import Event, EventSubscription
 
 User = get_user_model()
 
@@ -184,3 +186,142 @@ class CalendarViewRecurringEventTests(TestCase):
         self.assertEqual(len(march_16["events"]), 0)
 
 
+
+
+class CalendarEventsApiTests(TestCase):
+    """Tests for the JSON range endpoint and its ETag handling."""
+
+    def setUp(self):
+        """Create a user with one event, log in, and store the endpoint URL."""
+        self.client = Client()
+        self.user = User.objects.create_user(username="apiuser", password="pass1234")
+        self.client.login(username="apiuser", password="pass1234")
+        self.url = reverse("calendar_events")
+        self.params = {"start": "2025-03-01", "end": "2025-03-31"}
+        self.event = Event.objects.create(
+            creator=self.user, title="Weekly", recurrence="weekly",
+            start_datetime=timezone.make_aware(datetime(2025, 3, 3, 9, 0)),
+            end_datetime=timezone.make_aware(datetime(2025, 3, 3, 10, 0)),
+        )
+
+    def test_returns_occurrences_in_range(self):
+        """Every occurrence inside the range is returned as a compact record."""
+        resp = self.client.get(self.url, self.params)
+        self.assertEqual(resp.status_code, 200)
+        events = resp.json()["events"]
+        self.assertEqual([e["date"] for e in events], ["2025-03-03", "2025-03-10", "2025-03-17", "2025-03-24", "2025-03-31"])
+        self.assertEqual(events[0]["start"], "2025-03-03 09:00")
+        self.assertEqual(events[0]["start_utc"], "2025-03-03T09:00:00+00:00")
+        self.assertEqual(events[0]["title"], "Weekly")
+
+    def test_sends_strong_etag_and_answers_304(self):
+        """A matching If-None-Match gets a 304 with no body."""
+        resp = self.client.get(self.url, self.params)
+        etag = resp["ETag"]
+        self.assertFalse(etag.startswith("W/"))
+        resp = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, b"")
+
+    def test_etag_changes_after_edit_and_delete(self):
+        """Editing or deleting an event invalidates the ETag."""
+        etag = self.client.get(self.url, self.params)["ETag"]
+        self.event.title = "Renamed"
+        self.event.save()
+        resp = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        etag = resp["ETag"]
+        self.event.delete()
+        resp = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["events"], [])
+
+    def test_etag_differs_per_range(self):
+        """Different ranges never share an ETag."""
+        march = self.client.get(self.url, self.params)["ETag"]
+        april = self.client.get(self.url, {"start": "2025-04-01", "end": "2025-04-30"})["ETag"]
+        self.assertNotEqual(march, april)
+
+    def test_invalid_range_returns_400(self):
+        """Missing, malformed, reversed or oversized ranges are rejected."""
+        for params in ({}, {"start": "x", "end": "y"},
+                       {"start": "2025-03-31", "end": "2025-03-01"},
+                       {"start": "2025-01-01", "end": "2025-12-31"}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+    def test_other_users_events_hidden(self):
+        """Another user's private events are not returned."""
+        other = User.objects.create_user(username="other_api", password="pass1234")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(self.url, self.params).json()["events"], [])
+
+
+class CalendarGridCacheTests(TestCase):
+    """Tests for the cached month grid and the calendar versions that invalidate it."""
+
+    def setUp(self):
+        """Create a user with one event in June 2025, log in, and store the month URL."""
+        self.client = Client()
+        self.user = User.objects.create_user(username="cacheuser", password="pass1234")
+        self.client.login(username="cacheuser", password="pass1234")
+        self.event = Event.objects.create(
+            creator=self.user, title="Seminar",
+            start_datetime=timezone.make_aware(datetime(2025, 6, 10, 9)),
+            end_datetime=timezone.make_aware(datetime(2025, 6, 10, 10)))
+        self.url = reverse("calendar") + "?year=2025&month=6"
+
+    def _occurrence_queries(self):
+        """Render the month and return how many occurrence queries it ran."""
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url)
+        return sum('timeout_eventoccurrence' in q['sql'] for q in ctx.captured_queries)
+
+    def test_repeat_view_skips_occurrence_query(self):
+        """The second view of an unchanged month is served from the cache."""
+        self.assertEqual(self._occurrence_queries(), 1)
+        self.assertEqual(self._occurrence_queries(), 0)
+        self.assertContains(self.client.get(self.url), "Seminar")
+
+    def test_edit_invalidates_grid(self):
+        """Editing an event changes the user's version so the new title is shown."""
+        self.client.get(self.url)
+        self.event.title = "Workshop"
+        self.event.save()
+        resp = self.client.get(self.url)
+        self.assertContains(resp, "Workshop")
+        self.assertNotContains(resp, "Seminar")
+
+    def test_edit_from_another_process_invalidates_grid(self):
+        """The version is read from the database, so a write that sent no signal in this process is seen."""
+        self.client.get(self.url)
+        Event.objects.filter(pk=self.event.pk).update(title="Workshop", updated_at=timezone.now())
+        self.assertContains(self.client.get(self.url), "Workshop")
+
+    def test_delete_invalidates_grid(self):
+        """Deleting an event removes it from the cached grid."""
+        self.client.get(self.url)
+        self.event.delete()
+        self.assertNotContains(self.client.get(self.url), "Seminar")
+
+    def test_global_event_invalidates_every_grid(self):
+        """A new global event created by someone else changes every user's version."""
+        self.client.get(self.url)
+        admin = User.objects.create_user(username="admin", password="pass1234")
+        Event.objects.create(
+            creator=admin, title="Bank Holiday", is_global=True,
+            start_datetime=timezone.make_aware(datetime(2025, 6, 16, 0)),
+            end_datetime=timezone.make_aware(datetime(2025, 6, 16, 23)))
+        self.assertContains(self.client.get(self.url), "Bank Holiday")
+
+    def test_source_edit_reaches_subscriber_grid(self):
+        """Editing a subscribed event changes the subscriber's version too."""
+        owner = User.objects.create_user(username="owner", password="pass1234")
+        public = Event.objects.create(
+            creator=owner, title="Club Night", visibility=Event.Visibility.PUBLIC,
+            start_datetime=timezone.make_aware(datetime(2025, 6, 20, 19)),
+            end_datetime=timezone.make_aware(datetime(2025, 6, 20, 21)))
+        EventSubscription.objects.create(user=self.user, event=public)
+        self.assertContains(self.client.get(self.url), "Club Night")
+        public.title = "Quiz Night"
+        public.save()
+        self.assertContains(self.client.get(self.url), "Quiz Night")
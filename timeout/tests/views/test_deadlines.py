@@ -13,7 +13,7 @@ from django.test import TestCase, Client
 from django.urls import reverse
 from django.utils import timezone
 
-from timeout.models import Event
+from timeout.models import Event, EventSubscription
 
 User = get_user_model()
 
@@ -136,6 +136,26 @@ class DeadlineMarkCompleteViewTests(TestCase):
         resp = self.client.post(self._url(self.deadline.pk))
         self.assertEqual(resp.status_code, 404)
 
+    def test_subscriber_cannot_complete_and_sees_no_checkbox(self):
+        """A subscriber gets no checkbox for a shared deadline and cannot complete it for the owner."""
+        self.deadline.visibility = Event.Visibility.PUBLIC
+        self.deadline.save()
+        subscriber = User.objects.create_user(username="follower", password="pass1234")
+        EventSubscription.objects.create(user=subscriber, event=self.deadline)
+        self.client.login(username="follower", password="pass1234")
+        page = self.client.get(reverse("deadline_list"))
+        self.assertContains(page, "Essay")
+        self.assertNotContains(page, f'id="dl-check-{self.deadline.pk}"')
+        resp = self.client.post(self._url(self.deadline.pk))
+        self.assertEqual(resp.status_code, 404)
+        self.deadline.refresh_from_db()
+        self.assertFalse(self.deadline.is_completed)
+
+    def test_owner_sees_checkbox(self):
+        """The owner of a deadline gets the completion checkbox."""
+        page = self.client.get(reverse("deadline_list"))
+        self.assertContains(page, f'id="dl-check-{self.deadline.pk}"')
+
     def test_mark_complete_non_deadline_event(self):
         """Completing a non-deadline event type succeeds."""
         event = Event.objects.create(
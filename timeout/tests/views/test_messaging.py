@@ -1,9 +1,11 @@
 """
 Tests for the messaging views in the timeout app, including delete_message, send_message, and poll_messages.
 """
+from django.db import IntegrityError, transaction
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from timeout.models import ConversationMembership
 from timeout.models.message import Conversation, Message
 User = get_user_model()
 def make_user(username, password="testpass123"):
@@ -28,6 +30,24 @@ class ConversationModelTest(TestCase):
         self.assertEqual(self.conv.get_other_participant(self.alice), self.bob)
         self.assertEqual(self.conv.get_other_participant(self.bob), self.alice)
 
+    def test_between_returns_same_conversation_either_way(self):
+        """between() should create one conversation per pair whichever user comes first."""
+        conv = Conversation.between(self.alice, self.bob)
+        self.assertEqual(Conversation.between(self.bob, self.alice), conv)
+        self.assertEqual(Conversation.objects.filter(pair_key__isnull=False).count(), 1)
+
+    def test_pair_key_is_unique(self):
+        """A second conversation with the same pair key should be rejected by the database."""
+        conv = Conversation.between(self.alice, self.bob)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Conversation.objects.create(pair_key=conv.pair_key)
+
+    def test_get_other_participant_reads_pair_key(self):
+        """get_other_participant should answer from the pair key with one user lookup."""
+        conv = Conversation.between(self.alice, self.bob)
+        with self.assertNumQueries(1):
+            self.assertEqual(conv.get_other_participant(self.alice), self.bob)
+
     def test_get_last_message_none_when_empty(self):
         """get_last_message should return None if there are no messages in the conversation."""
         self.assertIsNone(self.conv.get_last_message())
@@ -57,7 +77,7 @@ class MessageModelTest(TestCase):
         self.conv.participants.add(self.alice, self.bob)
 
     def test_message_creation(self):
-        """A message should be created with the correct content, sender, and default is_read value."""
+        """A message should be created with the correct content and sender."""
         msg = Message.objects.create(
             conversation=self.conv,
             sender=self.alice,
@@ -65,7 +85,6 @@ class MessageModelTest(TestCase):
         )
         self.assertEqual(msg.content, "Hello Bob!")
         self.assertEqual(msg.sender, self.alice)
-        self.assertFalse(msg.is_read)
 
     def test_message_str(self):
         """The string representation of a message should include the sender's username and a snippet of the content."""
@@ -76,14 +95,26 @@ class MessageModelTest(TestCase):
         )
         self.assertIsInstance(str(msg), str)
 
-    def test_message_default_is_read_false(self):
-        """When a message is created, is_read should default to False."""
+    def test_new_message_is_unread_for_recipient_only(self):
+        """A new message is unread for the other participant and read for its sender."""
         msg = Message.objects.create(
             conversation=self.conv,
             sender=self.alice,
             content="unread",
         )
-        self.assertFalse(msg.is_read)
+        memberships = {m.user_id: m for m in ConversationMembership.objects.filter(conversation=self.conv)}
+        self.assertEqual(memberships[self.alice.pk].last_read_message_id, msg.pk)
+        self.assertLess(memberships[self.bob.pk].last_read_message_id, msg.pk)
+
+    def test_conversation_tracks_last_message_and_count(self):
+        """Creating and deleting messages keeps last_message and message_count in step."""
+        first = Message.objects.create(conversation=self.conv, sender=self.alice, content="one")
+        second = Message.objects.create(conversation=self.conv, sender=self.bob, content="two")
+        self.conv.refresh_from_db()
+        self.assertEqual((self.conv.last_message_id, self.conv.message_count), (second.pk, 2))
+        second.delete()
+        self.conv.refresh_from_db()
+        self.assertEqual((self.conv.last_message_id, self.conv.message_count), (first.pk, 1))
 
 class InboxViewTest(TestCase):
     """Tests for the inbox view."""
@@ -145,8 +176,7 @@ class StartConversationViewTest(TestCase):
 
     def test_reuses_existing_conversation(self):
         """If a conversation already exists between the two users, it should reuse it instead of creating a new one."""
-        conv = Conversation.objects.create()
-        conv.participants.add(self.alice, self.bob)
+        Conversation.between(self.bob, self.alice)
 
         self.client.login(username="alice", password="testpass123")
         self.client.get(reverse("start_conversation", args=["bob"]))
@@ -171,6 +201,15 @@ class StartConversationViewTest(TestCase):
         response = self.client.get(reverse("start_conversation", args=["nobody"]))
         self.assertEqual(response.status_code, 404)
 
+    def test_created_conversation_is_keyed_by_pair(self):
+        """A started conversation should carry the sorted pair key and both participants."""
+        self.client.login(username="alice", password="testpass123")
+        self.client.get(reverse("start_conversation", args=["bob"]))
+        conv = Conversation.objects.get()
+        low, high = sorted((self.alice.pk, self.bob.pk))
+        self.assertEqual(conv.pair_key, f"{low}:{high}")
+        self.assertEqual(set(conv.participants.all()), {self.alice, self.bob})
+
 class ConversationViewTest(TestCase):
     """Tests for the conversation view."""
     def setUp(self):
@@ -198,4 +237,70 @@ class ConversationViewTest(TestCase):
         make_user("charlie")
         self.client.login(username="charlie", password="testpass123")
         response = self.client.get(reverse("conversation", args=[self.conv.id]))
-        self.assertIn(response.status_code, [403, 404])
\ No newline at end of file
+        self.assertIn(response.status_code, [403, 404])
+
+class MessageHistoryTest(TestCase):
+    """Tests for paging through a conversation's history."""
+    def setUp(self):
+        """Create a conversation with five messages and log in a participant."""
+        self.alice = make_user("alice")
+        self.bob   = make_user("bob")
+        self.conv  = Conversation.objects.create()
+        self.conv.participants.add(self.alice, self.bob)
+        self.msgs = [Message.objects.create(conversation=self.conv, sender=self.bob, content=f"m{i}")
+                     for i in range(5)]
+        self.client.login(username="alice", password="testpass123")
+
+    def test_history_returns_latest_page_oldest_first(self):
+        """history() should return the newest page in thread order with a cursor to older messages."""
+        messages, cursor = self.conv.history(page_size=2)
+        self.assertEqual([m.content for m in messages], ["m3", "m4"])
+        self.assertIsNotNone(cursor)
+
+    def test_history_walks_back_to_the_start(self):
+        """Following the cursors should visit every message once and end with no cursor."""
+        seen, cursor = [], None
+        while True:
+            messages, cursor = self.conv.history(cursor=cursor, page_size=2)
+            seen = [m.content for m in messages] + seen
+            if cursor is None:
+                break
+        self.assertEqual(seen, ["m0", "m1", "m2", "m3", "m4"])
+
+    def test_history_breaks_created_at_ties_by_id(self):
+        """Messages sharing a timestamp should be split across pages without loss."""
+        Message.objects.filter(conversation=self.conv).update(created_at=self.msgs[0].created_at)
+        first, cursor = self.conv.history(page_size=3)
+        second, cursor = self.conv.history(cursor=cursor, page_size=3)
+        self.assertEqual([m.content for m in second + first], ["m0", "m1", "m2", "m3", "m4"])
+        self.assertIsNone(cursor)
+
+    def test_conversation_view_renders_one_page(self):
+        """The conversation page should render only the latest page and expose the older cursor."""
+        Conversation.HISTORY_PAGE_SIZE = 2
+        self.addCleanup(setattr, Conversation, "HISTORY_PAGE_SIZE", 50)
+        response = self.client.get(reverse("conversation", args=[self.conv.id]))
+        self.assertEqual([m.content for m in response.context["messages"]], ["m3", "m4"])
+        self.assertContains(response, f'data-older-cursor="{response.context["older_cursor"]}"')
+
+    def test_history_endpoint_pages_backwards(self):
+        """The history endpoint should return the messages before the cursor."""
+        _, cursor = self.conv.history(page_size=2)
+        response = self.client.get(reverse("message_history", args=[self.conv.id]), {"cursor": cursor})
+        data = response.json()
+        self.assertEqual([m["content"] for m in data["messages"]], ["m0", "m1", "m2"])
+        self.assertFalse(data["has_older"])
+        self.assertFalse(data["messages"][0]["is_me"])
+
+    def test_history_endpoint_page_query_count(self):
+        """A history page should take a bounded number of queries however long the thread is."""
+        _, cursor = self.conv.history(page_size=1)
+        with self.assertNumQueries(4):
+            self.client.get(reverse("message_history", args=[self.conv.id]), {"cursor": cursor})
+
+    def test_history_endpoint_rejects_non_participant(self):
+        """A user outside the conversation should get a 404 from the history endpoint."""
+        make_user("charlie")
+        self.client.login(username="charlie", password="testpass123")
+        response = self.client.get(reverse("message_history", args=[self.conv.id]))
+        self.assertEqual(response.status_code, 404)
@@ -5,6 +5,7 @@ import json
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from timeout.models import ConversationMembership
 from timeout.models.message import Conversation, Message
 User = get_user_model()
 
@@ -66,24 +67,21 @@ class DeleteMessageViewTest(TestCase):
         self.assertEqual(response.status_code, 404)
 
     def test_messages_marked_as_read_on_view(self):
-        """When a conversation is viewed, any messages from the other user that were previously unread should be marked as read."""
+        """When a conversation is viewed, the viewer's read cursor moves to the last message."""
         self.client.login(username="alice", password="testpass123")
         self.client.get(reverse("conversation", args=[self.conv.id]))
-        unread = Message.objects.filter(
-            conversation=self.conv,
-            sender=self.bob,
-            is_read=False,
-        ).count()
-        self.assertEqual(unread, 0)
+        membership = ConversationMembership.objects.get(conversation=self.conv, user=self.alice)
+        self.conv.refresh_from_db()
+        self.assertEqual(membership.last_read_message_id, self.conv.last_message_id)
+        self.assertEqual(membership.read_count, self.conv.message_count)
 
     def test_messages_from_self_not_marked_read(self):
-        """When a conversation is viewed, messages sent by the logged-in user should not be marked as read."""
-        msg = Message.objects.create(
-            conversation=self.conv, sender=self.alice, content="hi", is_read=False)
+        """Viewing a conversation moves only the viewer's cursor, not the other participant's."""
+        Message.objects.create(conversation=self.conv, sender=self.alice, content="hi")
         self.client.login(username="alice", password="testpass123")
         self.client.get(reverse("conversation", args=[self.conv.id]))
-        msg.refresh_from_db()
-        self.assertFalse(msg.is_read)
+        bob = ConversationMembership.objects.get(conversation=self.conv, user=self.bob)
+        self.assertLess(bob.last_read_message_id, self.conv.messages.latest('pk').pk)
 
     def test_shows_other_users_username(self):
         """When viewing a conversation, the username of the other participant should be displayed on the page."""
@@ -200,13 +198,11 @@ class PollMessagesViewTest(TestCase):
             self.assertFalse(msg["is_me"])
 
     def test_polled_messages_marked_as_read(self):
-        """When messages are polled, any messages from the other participant that were previously unread should be marked as read in the database."""
+        """When messages are polled, the poller's read cursor moves past them."""
         self.client.login(username="alice", password="testpass123")
         self.client.get(self._url(), {"last_id": 0})
-        unread = Message.objects.filter(
-            conversation=self.conv, sender=self.bob, is_read=False
-        ).count()
-        self.assertEqual(unread, 0)
+        membership = ConversationMembership.objects.get(conversation=self.conv, user=self.alice)
+        self.assertEqual(membership.last_read_message_id, self.conv.messages.latest('pk').pk)
 
     def test_non_participant_cannot_poll(self):
         """A user who is not a participant in the conversation should not be able to poll messages and should receive a 403 or 404 error."""
@@ -214,3 +210,45 @@ class PollMessagesViewTest(TestCase):
         self.client.login(username="charlie", password="testpass123")
         response = self.client.get(self._url(), {"last_id": 0})
         self.assertIn(response.status_code, [403, 404])
+
+    def test_up_to_date_poll_returns_204_with_one_query(self):
+        """A poll at the conversation's last message should be answered by the membership lookup alone."""
+        self.client.login(username="alice", password="testpass123")
+        self.client.get(self._url(), {"last_id": 0})
+        with self.assertNumQueries(3):
+            response = self.client.get(self._url(), {"last_id": self.m2.id})
+        self.assertEqual(response.status_code, 204)
+
+    def test_up_to_date_poll_does_not_write_reads(self):
+        """A poll with nothing new should leave the read cursor where it was."""
+        self.client.login(username="alice", password="testpass123")
+        response = self.client.get(self._url(), {"last_id": self.m2.id})
+        self.assertEqual(response.status_code, 204)
+        membership = ConversationMembership.objects.get(conversation=self.conv, user=self.alice)
+        self.assertEqual(membership.last_read_message_id, 0)
+
+    def test_new_message_after_204_is_returned(self):
+        """A message sent after a 204 poll should be returned by the next poll."""
+        self.client.login(username="alice", password="testpass123")
+        self.client.get(self._url(), {"last_id": self.m2.id})
+        m3 = Message.objects.create(conversation=self.conv, sender=self.bob, content="msg 3")
+        data = json.loads(self.client.get(self._url(), {"last_id": self.m2.id}).content)
+        self.assertEqual([m["id"] for m in data["messages"]], [m3.id])
+
+    def test_message_written_without_signals_is_returned(self):
+        """The head is read from the conversation row, so a message written by another process is seen."""
+        self.client.login(username="alice", password="testpass123")
+        self.client.get(self._url(), {"last_id": self.m2.id})
+        m3 = Message.objects.bulk_create([Message(conversation=self.conv, sender=self.bob, content="msg 3")])[0]
+        Conversation.objects.filter(pk=self.conv.pk).update(last_message=m3)
+        response = self.client.get(self._url(), {"last_id": self.m2.id})
+        self.assertEqual(response.status_code, 200)
+
+    def test_non_participant_rejected_after_participant_poll(self):
+        """A poll by a participant should not let users outside the conversation in."""
+        make_user("charlie")
+        self.client.login(username="alice", password="testpass123")
+        self.client.get(self._url(), {"last_id": self.m2.id})
+        self.client.login(username="charlie", password="testpass123")
+        response = self.client.get(self._url(), {"last_id": self.m2.id})
+        self.assertEqual(response.status_code, 404)
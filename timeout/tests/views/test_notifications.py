@@ -120,7 +120,7 @@ class NotificationsViewTests(TestCase):
         data = response.json()
         self.assertIn('notifications', data)
         self.assertIn('has_next', data)
-        self.assertIn('next_page', data)
+        self.assertIn('next_cursor', data)
 
     def test_ajax_notification_fields(self):
         """The JSON response for AJAX requests should include the expected fields for each notification."""
@@ -146,20 +146,62 @@ class NotificationsViewTests(TestCase):
         response = self.client.get(self.url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertTrue(response.json()['has_next'])
 
-    def test_ajax_next_page_is_none_when_no_next(self):
-        """If there are no more notifications to load, next_page should be None."""
+    def test_ajax_next_cursor_is_none_when_no_next(self):
+        """If there are no more notifications to load, next_cursor should be None."""
         make_notification(self.user, title='Only one')
         self.client.login(username='user', password='pass123')
         response = self.client.get(self.url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
-        self.assertIsNone(response.json()['next_page'])
+        self.assertIsNone(response.json()['next_cursor'])
 
-    def test_ajax_next_page_number_when_has_next(self):
-        """If there are more notifications to load, next_page should be the number of the next page (e.g. 2)."""
+    def test_ajax_cursor_walks_every_notification_once(self):
+        """Following next_cursor returns every notification exactly once, newest first."""
+        created = [make_notification(self.user, title=f'N{i}') for i in range(32)]
+        self.client.login(username='user', password='pass123')
+        seen, cursor = [], ''
+        for _ in range(5):
+            data = self.client.get(self.url, {'cursor': cursor}, HTTP_X_REQUESTED_WITH='XMLHttpRequest').json()
+            seen.extend(n['id'] for n in data['notifications'])
+            if not data['has_next']:
+                break
+            cursor = data['next_cursor']
+        self.assertEqual(seen, [n.pk for n in reversed(created)])
+
+    def test_same_timestamp_is_ordered_by_id(self):
+        """Rows sharing created_at are split across pages by id without gaps or repeats."""
+        created = [make_notification(self.user, title=f'N{i}') for i in range(20)]
+        Notification.objects.filter(user=self.user).update(created_at=created[0].created_at)
+        self.client.login(username='user', password='pass123')
+        first = self.client.get(self.url)
+        second = self.client.get(self.url, {'cursor': first.context['next_cursor']},
+                                 HTTP_X_REQUESTED_WITH='XMLHttpRequest').json()
+        ids = [n.pk for n in first.context['notifications']] + [n['id'] for n in second['notifications']]
+        self.assertEqual(ids, [n.pk for n in reversed(created)])
+
+    def test_page_costs_no_count(self):
+        """A page is one query for the rows; no COUNT(*) is run and the page is capped."""
+        for i in range(40):
+            make_notification(self.user, title=f'N{i}')
+        self.client.login(username='user', password='pass123')
+        self.client.get(self.url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(len(response.json()['notifications']), 15)
+
+    def test_html_page_is_paginated(self):
+        """The full page renders only the first page and hands the cursor to the script."""
         for i in range(20):
             make_notification(self.user, title=f'N{i}')
         self.client.login(username='user', password='pass123')
-        response = self.client.get(self.url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
-        self.assertEqual(response.json()['next_page'], 2)
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['notifications']), 15)
+        self.assertContains(response, f'data-next-cursor="{response.context["next_cursor"]}"')
+
+    def test_malformed_cursor_returns_first_page(self):
+        """A cursor that cannot be parsed falls back to the first page."""
+        make_notification(self.user, title='Only one')
+        self.client.login(username='user', password='pass123')
+        response = self.client.get(self.url, {'cursor': 'nonsense'}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(len(response.json()['notifications']), 1)
 
 
 class MarkNotificationReadTests(TestCase):
@@ -4,7 +4,9 @@ Tests for the notification views in the timeout app, including delete_notificati
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
+from timeout.models.event import Event
 from timeout.models.notification import Notification
 
 User = get_user_model()
@@ -246,3 +248,14 @@ class PollNotificationsTests(TestCase):
         self.client.login(username='user', password='pass123')
         response = self.client.get(self.url + '?last_id=0')
         self.assertEqual(response.json()['unread_count'], 1)
+
+    def test_poll_does_not_create_reminders(self):
+        """Polling is a pure read: due reminders are left to the send_reminders runner."""
+        now = timezone.now()
+        Event.objects.create(
+            creator=self.user, title='Essay', event_type=Event.EventType.DEADLINE,
+            start_datetime=now - timezone.timedelta(hours=1), end_datetime=now + timezone.timedelta(minutes=30))
+        self.client.login(username='user', password='pass123')
+        response = self.client.get(self.url + '?last_id=0')
+        self.assertEqual(response.json()['notifications'], [])
+        self.assertFalse(Notification.objects.filter(user=self.user).exists())
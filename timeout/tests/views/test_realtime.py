@@ -0,0 +1,54 @@
+"""
+Tests for the Server-Sent Events stream view: login requirement, the REALTIME_STREAM_ENABLED gate on
+the endpoint and the page script, response headers, and delivery of events published to the logged-in user.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from timeout.services import realtime
+
+User = get_user_model()
+
+
+@override_settings(REALTIME_STREAM_ENABLED=True)
+class EventStreamViewTests(TestCase):
+    """Tests for the notification_stream endpoint."""
+
+    def setUp(self):
+        """Create a user and the stream URL."""
+        self.user = User.objects.create_user(username='streamer', password='pass123')
+        self.url = reverse('notification_stream')
+
+    def test_login_required(self):
+        """Anonymous users are redirected to the login page."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/login/', response['Location'])
+
+    async def test_streams_published_events(self):
+        """The stream opens with a retry hint and then carries events published to the user."""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        chunks = aiter(response.streaming_content)
+        first = await anext(chunks)
+        self.assertIn(b'retry:', first)
+        realtime.get_backend().publish(self.user.pk, 'unread', {'unread_count': 2})
+        event = await anext(chunks)
+        self.assertEqual(event, b'event: unread\ndata: {"unread_count": 2}\n\n')
+        await chunks.aclose()
+
+    @override_settings(REALTIME_STREAM_ENABLED=False)
+    def test_disabled_stream_is_not_found(self):
+        """Without ASGI the endpoint answers 404 instead of holding a worker open."""
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_page_loads_stream_script_only_when_enabled(self):
+        """Pages include realtime.js only while the stream is enabled."""
+        self.client.force_login(self.user)
+        self.assertContains(self.client.get(reverse('dashboard')), 'data-stream-url')
+        with self.settings(REALTIME_STREAM_ENABLED=False):
+            self.assertNotContains(self.client.get(reverse('dashboard')), 'data-stream-url')
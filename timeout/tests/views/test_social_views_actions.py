@@ -86,6 +86,13 @@ class SocialViewsActionsTest(TestCase):
             0,
         )
 
+    def test_like_toggle_returns_stored_count(self):
+        """Test that the like toggle reports the post's stored like count after each toggle."""
+        self.login(self.other)
+        url = reverse("like_post", args=[self.post_public.id])
+        self.assertEqual(json.loads(self.client.post(url).content)["like_count"], 1)
+        self.assertEqual(json.loads(self.client.post(url).content)["like_count"], 0)
+
     def test_bookmark_toggle_public_post(self):
         """Test that bookmarking a public post toggles the bookmark state and returns the correct JSON response."""
         self.login(self.other)
@@ -220,4 +227,4 @@ class SocialViewsActionsTest(TestCase):
         """Test that accessing the feed with an unknown tab parameter defaults to the main feed view without errors, ensuring that the social_feed view can handle unexpected tab values gracefully and still render the page successfully."""
         self.login(self.other)
         res = self.client.get(reverse("social_feed") + "?tab=wtf")
-        self.assertEqual(res.status_code, 200)
\ No newline at end of file
+        self.assertEqual(res.status_code, 200)
\ No newline at end of file
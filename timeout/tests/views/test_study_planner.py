@@ -11,7 +11,9 @@ from datetime import date, datetime, timedelta
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -339,6 +341,20 @@ class ConfirmSessionsViewTests(TestCase):
         self.assertEqual(event.event_type, Event.EventType.STUDY_SESSION)
         self.assertEqual(event.visibility, Event.Visibility.PRIVATE)
 
+    def test_sessions_inserted_in_one_batch(self):
+        """Confirming many sessions costs the same number of queries as confirming one."""
+        self.client.login(username='confirmer', password='pass')
+
+        def run(n, day):
+            sessions = json.dumps([
+                {'title': f'S{i}', 'start': f'2026-04-{day:02d}T{8 + i:02d}:00', 'end': f'2026-04-{day:02d}T{8 + i:02d}:30'}
+                for i in range(n)])
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.post(self.url, {'sessions': sessions})
+            return len(ctx.captured_queries)
+        self.assertEqual(run(1, 5), run(10, 6))
+        self.assertEqual(Event.objects.filter(creator=self.user).count(), 11)
+
     def test_missing_keys_skipped(self):
         """If some session dictionaries in the list provided in the POST data are missing required keys (e.g. title, start, or end), the view should skip those sessions and still create events for the valid ones rather than failing the entire request."""
         self.client.login(username='confirmer', password='pass')
@@ -4,6 +4,8 @@ Calendar and event management related URL patterns for the timeout app.
 from django.urls import path
 from timeout.views import calendar as cal_views
 from timeout.views import event_actions
+from timeout.views import calendar_feed as feed_views
+from timeout.views import event_import as import_views
 from timeout.views import deadlines as deadline_views
 from timeout.views import ai_calendar as ai_cal_views
 from timeout.views import ai_reschedule as ai_reschedule_views
@@ -14,6 +16,10 @@ from timeout.views.notifications import delete_notification, mark_notification_r
 
 urlpatterns = [
     path('calendar/', cal_views.calendar_view, name='calendar'),
+    path('calendar/events/', cal_views.calendar_events, name='calendar_events'),
+    path('calendar/feed/<str:token>.ics', feed_views.calendar_feed, name='calendar_feed'),
+    path('calendar/feed/reset/', feed_views.reset_calendar_token, name='reset_calendar_token'),
+    path('calendar/import/', import_views.event_import, name='event_import'),
     path('calendar/add/', event_actions.event_create, name='event_create'),
     path('calendar/event/<int:pk>/subscribe/', event_actions.subscribe_event, name='subscribe_event'),
     path('calendar/ai-add/', ai_cal_views.ai_create_event, name='ai_event_create'),
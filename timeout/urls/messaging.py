@@ -11,6 +11,7 @@ urlpatterns = [
     path('conversation/<int:conversation_id>/', messaging.conversation, name='conversation'),
     path('conversation/start/<str:username>/', messaging.start_conversation, name='start_conversation'),
     path('conversation/<int:conversation_id>/send/', messaging.send_message, name='send_message'),
+    path('conversation/<int:conversation_id>/history/', messaging.message_history, name='message_history'),
     path('conversation/<int:conversation_id>/poll/', messaging.poll_messages, name='poll_messages'),
     path('conversation/<int:conversation_id>/mark-unread/', messaging.mark_conversation_unread, name='mark_conversation_unread'),
     path('message/<int:message_id>/delete/', messaging.delete_message, name='delete_message'),
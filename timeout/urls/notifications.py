@@ -12,6 +12,7 @@ from timeout.views.notifications import (
     mark_all_notifications_unread,
     delete_all_notifications,
 )
+from timeout.views.realtime import stream
  
 urlpatterns = [ 
     path('', notifications_view, name='notifications'), 
@@ -22,4 +23,5 @@ urlpatterns = [
     path('unread/<int:notification_id>/', mark_notification_unread, name='mark_notification_unread'),
     path('unread-all/', mark_all_notifications_unread, name='mark_all_notifications_unread'),
     path('delete-all/', delete_all_notifications, name='delete_all_notifications'),
+    path('stream/', stream, name='notification_stream'),
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Utility functions for Timeout views and services.
 """
-from datetime import datetime, date
+from datetime import datetime, date, timezone as dt_timezone
 from django.utils import timezone
 
 
@@ -10,6 +10,22 @@ def parse_aware_dt(dt_str):
     return timezone.make_aware(datetime.fromisoformat(dt_str))
 
 
+def encode_cursor(obj):
+    """Return the opaque keyset cursor of a row: its created_at in microseconds and its id."""
+    stamp = int(obj.created_at.timestamp()) * 1_000_000 + obj.created_at.microsecond
+    return f"{stamp}-{obj.id}"
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) from a keyset cursor, or None when it is missing or malformed."""
+    try:
+        stamp, pk = (int(part) for part in cursor.split('-'))
+        seconds, micros = divmod(stamp, 1_000_000)
+        return datetime.fromtimestamp(seconds, tz=dt_timezone.utc).replace(microsecond=micros), pk
+    except (AttributeError, ValueError, OverflowError, OSError):
+        return None
+
+
 def ai_cache_key(kind, user_id):
     """Build a daily per-user cache key for AI features."""
     return f"ai_{kind}_{user_id}_{date.today()}"
@@ -13,6 +13,8 @@ from django.views.decorators.http import require_POST
 
 from timeout.models import Event
 from timeout.services import DeadlineService
+from timeout.services.interval_index import IntervalIndex
+from timeout.utils import parse_aware_dt
 
 
 
@@ -125,6 +127,28 @@ def _suggestion_response(event, data):
     })
 
 
+def _flag_conflicts(user, suggestions, sessions, now, lookahead):
+    """Mark each AI suggestion with whether it clashes with a fixed event or an earlier suggestion.
+    The user's blocking events are indexed once, so each check is O(log n) rather than a scan."""
+    if not isinstance(suggestions, list):
+        return
+    index = IntervalIndex.for_user(
+        user, now, lookahead + timedelta(days=1),
+        exclude_ids=[s.pk for s in sessions], event_types=Event.BLOCKING_TYPES)
+    for suggestion in suggestions:
+        if not isinstance(suggestion, dict):
+            continue
+        try:
+            start = parse_aware_dt(suggestion['start'])
+            end = parse_aware_dt(suggestion['end'])
+        except (KeyError, TypeError, ValueError):
+            suggestion['conflict'] = True
+            continue
+        suggestion['conflict'] = end <= start or index.overlaps(start, end)
+        if not suggestion['conflict']:
+            index.add(start, end)
+
+
 @login_required
 @require_POST
 def reschedule_study_sessions(request):
@@ -147,6 +171,7 @@ def reschedule_study_sessions(request):
     except Exception as e:
         return JsonResponse({'success': False, 'error': f'AI error: {str(e)}'}, status=500)
 
+    _flag_conflicts(request.user, suggestions, sessions, now, lookahead)
     original = [
         {'id': s.pk, 'title': s.title, 'start': s.start_datetime.strftime('%Y-%m-%dT%H:%M'), 'end': s.end_datetime.strftime('%Y-%m-%dT%H:%M')}
         for s in sessions
@@ -2,20 +2,28 @@
 View for rendering the main calendar page, including logic to fetch and display events, handle month navigation, and provide data for AI-generated workload warnings and suggestions. Accessible only to logged-in users.
 """
 import calendar as cal
-from datetime import timedelta, date, datetime, time
+import hashlib
+from datetime import date, timezone as dt_timezone
+from django.core.cache import cache
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from django.utils import timezone
-from timeout.models import Event, DismissedAlert
-from django.db.models import Q
+from django.views.decorators.http import condition, require_GET
+from timeout.models import DismissedAlert
 from timeout.views.deadline_warning import get_deadline_study_warnings
-from timeout.services import DeadlineService, AIService
+from timeout.services import DeadlineService, AIService, calendar_cache
+from timeout.services.occurrence_service import OccurrenceService
 
 MONTH_NAMES = [
     "", "January", "February", "March", "April", "May", "June",
     "July", "August", "September", "October", "November", "December",
 ]
 
+MAX_RANGE_DAYS = 62
+
 @login_required
 def calendar_view(request):
     """Renders a monthly calendar grid with events in day cells, including recurring events."""
@@ -23,22 +31,94 @@ def calendar_view(request):
     year, month = check_month_year(*get_date(request, today))
     nav = get_months(year, month) # get previous and next month/year for navigation links
 
-    cal_obj = cal.Calendar(firstweekday=0)
-    weeks_raw = cal_obj.monthdatescalendar(year, month)
-    last_visible = weeks_raw[-1][-1]
+    grid, weeks, today_events = month_grid(request.user, year, month, today)
+    context = calendar_context(year, month, nav)
+    context["calendar_grid"] = grid
+    context["weeks"] = weeks
+    context.update(get_data(request, {today: today_events}))
+    return render(request, "pages/calendar.html", context)
 
-    events_qs = visible_events(request.user, last_visible)
-    events_by_date = index_events(events_qs, last_visible)
+def month_grid(user, year, month, today):
+    """Helper function to return the rendered month grid, its weeks and today's event dicts.
+    Served from the cache while the user's calendar version is unchanged;
+    otherwise the occurrences are read, indexed and rendered, then cached"""
+    key = calendar_cache.grid_key(user, year, month, today)
+    cached = cache.get(key)
+    if cached is not None:
+        return mark_safe(cached[0]), cached[1], cached[2]
+    weeks_raw = cal.Calendar(firstweekday=0).monthdatescalendar(year, month)
+    occurrences = list(OccurrenceService.visible_in_window(user, weeks_raw[0][0], weeks_raw[-1][-1]))
+    events_by_date = index_events(occurrences)
     weeks = build_weeks(weeks_raw, month, today, events_by_date)
-    context = calendar_context(year, month, nav, weeks)
-    context.update(get_data(request, events_by_date))
-    return render(request, "pages/calendar.html", context)
+    grid = render_to_string("pages/_calendar_grid.html", grid_context(year, month, weeks))
+    today_events = events_by_date.get(today, [])
+    cache.set(key, (grid, weeks, today_events), calendar_cache.grid_timeout(occurrences, timezone.now()))
+    return mark_safe(grid), weeks, today_events
+
+def parse_range(request):
+    """Helper function to parse the start/end dates of a range request.
+    Returns None when they are missing, malformed, reversed or too far apart"""
+    try:
+        start = date.fromisoformat(request.GET["start"])
+        end = date.fromisoformat(request.GET["end"])
+    except (KeyError, ValueError):
+        return None
+    if end < start or (end - start).days > MAX_RANGE_DAYS:
+        return None
+    return start, end
+
+def calendar_etag(request):
+    """Strong ETag for a range request, derived from the user's calendar version and the range.
+    Any create, edit, delete, subscribe or unsubscribe visible to the user changes it"""
+    window = parse_range(request)
+    if window is None or not request.user.is_authenticated:
+        return None
+    raw = f"{calendar_cache.version(request.user)}:{window[0]}:{window[1]}"
+    return hashlib.sha1(raw.encode()).hexdigest()
 
-def calendar_context(year, month, nav, weeks):
+@login_required
+@require_GET
+@condition(etag_func=calendar_etag)
+def calendar_events(request):
+    """JSON endpoint returning compact occurrence records for ?start=&end= (inclusive dates).
+    Unchanged ranges are answered with 304 Not Modified via the ETag"""
+    window = parse_range(request)
+    if window is None:
+        return JsonResponse({"error": "Invalid date range."}, status=400)
+    occurrences = OccurrenceService.visible_in_window(request.user, *window)
+    response = JsonResponse({
+        "start": window[0].isoformat(),
+        "end": window[1].isoformat(),
+        "events": [occurrence_record(*occ) for occ in occurrences],
+    })
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+def occurrence_record(ev, start_dt, end_dt):
+    """Helper function to build the compact JSON record for one occurrence.
+    Status is left to the client so the record only changes when the event does;
+    start_utc/end_utc are the instants it compares against, whatever the browser's zone"""
+    return {
+        "id": ev.id,
+        "date": start_dt.date().isoformat(),
+        "title": ev.title,
+        "start": timezone.localtime(start_dt).strftime("%Y-%m-%d %H:%M"),
+        "end": timezone.localtime(end_dt).strftime("%Y-%m-%d %H:%M"),
+        "start_utc": start_dt.astimezone(dt_timezone.utc).isoformat(),
+        "end_utc": end_dt.astimezone(dt_timezone.utc).isoformat(),
+        "type": ev.event_type,
+        "type_display": ev.get_event_type_display(),
+        "recurrence_display": ev.get_recurrence_display(),
+        "location": ev.location,
+        "description": ev.description,
+        "all_day": ev.is_all_day,
+        "visibility": ev.visibility,
+    }
+
+def calendar_context(year, month, nav):
     """Helper function to build the context dict for the calendar template"""
     prev_month, prev_year, next_month, next_year = nav
     return {
-        "weeks": weeks,
         "month": month,
         "year": year,
         "month_name": MONTH_NAMES[month],
@@ -46,6 +126,14 @@ def calendar_context(year, month, nav, weeks):
         "prev_month": prev_month,
         "next_year": next_year,
         "next_month": next_month,
+    }
+
+def grid_context(year, month, weeks):
+    """Helper function to build the context dict for the month grid fragment"""
+    return {
+        "weeks": weeks,
+        "month": month,
+        "year": year,
         "weekdays": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
     }
 
@@ -80,26 +168,14 @@ def get_months(year, month):
         next_year = year + 1
     return prev_month, prev_year, next_month, next_year
 
-def visible_events(user, last_visible):
-    """Helper function to fetch events for the visible date range, including recurring events"""
-    last_day = timezone.make_aware(datetime.combine(last_visible, time.max))
-    events_qs = Event.objects.filter(
-        Q(creator=user) | Q(is_global=True),
-        start_datetime__lte=last_day,
-    ).order_by("start_datetime")
-    return events_qs # return the queryset
-
-def index_events(events_qs, last_visible):
-    """Helper function to index events by date
-    Maps each date to a list of events as dicts """
+def index_events(occurrences):
+    """Helper function to index event occurrences by date
+    Maps each visible date to a list of occurrences as dicts """
     now_date = timezone.now()
     events_by_date = {} # dict to hold lists of events for each date
-    for ev in events_qs:
-        data = create_dict(ev, ev.start_datetime, ev.end_datetime, now_date) # create a consistent dict for the event
-        events_by_date.setdefault(ev.start_datetime.date(), []).append(data) # add the event to the list for its start date
-
-        if ev.recurrence != 'none':
-            create_recurrence(ev, last_visible, now_date, events_by_date)
+    for ev, start_dt, end_dt in occurrences:
+        data = create_dict(ev, start_dt, end_dt, now_date) # create a consistent dict for the occurrence
+        events_by_date.setdefault(start_dt.date(), []).append(data)
 
     return events_by_date
 
@@ -121,39 +197,6 @@ def create_dict(ev, start_dt, end_dt, now_date):
         'status_display': event_status(start_dt, end_dt, now_date),
     }
 
-def create_recurrence(ev, last_visible, now_date, events_by_date):
-    """Generate pseudo-event dicts for recurring occurrences within the visible range."""
-    current_date = ev.start_datetime.date()
-
-    while True:
-        current_date = advance_date(current_date, ev.recurrence)
-        if current_date is None or current_date > last_visible:
-            break
-
-        start_dt = timezone.make_aware(
-            datetime.combine(current_date, ev.start_datetime.time()),
-        )
-        end_dt = timezone.make_aware(
-            datetime.combine(current_date, ev.end_datetime.time()),
-        )
-        data = create_dict(ev, start_dt, end_dt, now_date)
-        events_by_date.setdefault(current_date, []).append(data)
-
-def advance_date(current_date, recurrence):
-    """Return the next occurrence date. Returns None if the recurrence is not recognized."""
-    if recurrence == 'daily':
-        return current_date + timedelta(days=1)
-    if recurrence == 'weekly':
-        return current_date + timedelta(weeks=1)
-    if recurrence == 'monthly':
-        month_num = current_date.month + 1
-        year_num = current_date.year
-        if month_num > 12:
-            month_num, year_num = 1, year_num + 1
-        day_num = min(current_date.day, cal.monthrange(year_num, month_num)[1])
-        return date(year_num, month_num, day_num)
-    return None
-
 def build_weeks(weeks_raw, month, today, events_by_date):
     """Helper function to convert raw weeks from calendar into a structure for the template"""
     return[
@@ -0,0 +1,52 @@
+"""
+Views for the per-user iCalendar (.ics) subscription feed polled by phone and desktop calendar apps,
+and for resetting the secret token embedded in the feed URL.
+"""
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_GET, require_POST
+
+from timeout.models import User
+from timeout.services.ical_service import feed_chunks, feed_validators
+
+FEED_MAX_AGE = 300
+
+
+@require_GET
+def calendar_feed(request, token):
+    """Stream the user's events as an .ics document.
+
+    Polls carrying a matching If-None-Match or If-Modified-Since end in a 304
+    after one user lookup and two index-only aggregates.
+    """
+    user = User.objects.filter(calendar_token=token, is_active=True).first()
+    if user is None:
+        raise Http404("Unknown calendar feed.")
+    etag, last_modified = feed_validators(user)
+    etag = quote_etag(etag)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        return not_modified
+    response = StreamingHttpResponse(feed_chunks(user), content_type='text/calendar; charset=utf-8')
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    response['Content-Disposition'] = 'inline; filename="timeout.ics"'
+    patch_cache_control(response, private=True, max_age=FEED_MAX_AGE)
+    return response
+
+
+@login_required
+@require_POST
+def reset_calendar_token(request):
+    """Replace the feed token so previously shared subscription URLs stop working."""
+    request.user.get_calendar_token(reset=True)
+    messages.success(request, 'Your calendar subscription link has been reset.')
+    return redirect('settings')
@@ -6,7 +6,6 @@ from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.http import require_POST
 from timeout.services.deadline_service import DeadlineService
-from timeout.services.notification_service import NotificationService
 
 
 def _parse_deadline_filters(request):
@@ -33,7 +32,6 @@ def deadline_list_view(request):
         sort_order=sort_order,
         event_type=event_type or None,
     )
-    NotificationService.create_deadline_notifications(request.user)
     context = build_context(request, deadlines, status_filter, sort_order, event_type)
     return render(request, 'pages/deadlines.html', context)
 
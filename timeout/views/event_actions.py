@@ -10,8 +10,8 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.views.decorators.http import require_POST
 
-from timeout.models import DismissedAlert, Event
-from timeout.services import EventService
+from timeout.models import DismissedAlert, Event, EventSubscription
+from timeout.services import EventService, StudySessionService
 from timeout.utils import parse_aware_dt
 
 
@@ -70,28 +70,13 @@ def event_create(request):
 @login_required
 @require_POST
 def subscribe_event(request, pk):
-    """Subscribe to a public event by creating a private copy for the user."""
+    """Subscribe to a public event by linking it into the user's calendar."""
     original = get_object_or_404(Event, pk=pk, visibility=Event.Visibility.PUBLIC)
     if original.creator == request.user:
         return JsonResponse({'success': False, 'error': 'You own this event.'}, status=400)
-    already = Event.objects.filter(
-        creator=request.user,
-        title=original.title,
-        start_datetime=original.start_datetime).exists()
-    if already:
+    _, created = EventSubscription.objects.get_or_create(user=request.user, event=original)
+    if not created:
         return JsonResponse({'success': False, 'error': 'Already subscribed.'}, status=400)
-    Event.objects.create(
-        creator=request.user,
-        title=original.title,
-        event_type=original.event_type,
-        start_datetime=original.start_datetime,
-        end_datetime=original.end_datetime,
-        location=original.location,
-        description=original.description,
-        visibility=Event.Visibility.PRIVATE,
-        is_all_day=original.is_all_day,
-        recurrence=original.recurrence,
-    )
     return JsonResponse({'success': True})
 
 
@@ -101,25 +86,14 @@ def apply_session_schedule(request):
     """Bulk-update study session times after AI reschedule confirmation."""
     try:
         sessions = json.loads(request.POST.get('sessions', '[]'))
-    except json.JSONDecodeError:
+        if not isinstance(sessions, list):
+            raise ValueError
+    except (json.JSONDecodeError, ValueError):
         return JsonResponse({'success': False, 'error': 'Invalid data.'}, status=400)
 
-    updated = 0
-    for s in sessions:
-        try:
-            event = Event.objects.get(
-                pk=s['id'],
-                creator=request.user,
-                event_type=Event.EventType.STUDY_SESSION,
-            )
-            event.start_datetime = parse_aware_dt(s['start'])
-            event.end_datetime = parse_aware_dt(s['end'])
-            event.save()
-            updated += 1
-        except (Event.DoesNotExist, KeyError):
-            continue
-
-    return JsonResponse({'success': True, 'count': updated})
+    results = StudySessionService.apply_schedule(request.user, sessions)
+    updated = sum(1 for r in results if r['success'])
+    return JsonResponse({'success': True, 'count': updated, 'results': results})
 
 
 @login_required
@@ -1,17 +1,22 @@
 """
 View for deleting an existing event. Handles the deletion of related objects and ensures database integrity.
+For a subscribed event only the user's subscription is removed.
 """
 
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db import connection
-from timeout.models import Event
+from timeout.models import Event, EventSubscription
 from timeout.models.notification import Notification
 
 @login_required
 def event_delete(request, pk):
     """Delete an event and redirect to calendar."""
+    removed, _ = EventSubscription.objects.filter(user=request.user, event_id=pk).delete()
+    if removed:
+        messages.success(request, 'Event removed from your calendar.')
+        return redirect('calendar')
     event = get_object_or_404(Event, pk=pk, creator=request.user)
     title = event.title
 
@@ -1,18 +1,19 @@
 """
-View for displaying details of a specific event, including its status (past, ongoing, upcoming) and related information. Accessible only to the event creator.#
+View for displaying details of a specific event, including its status (past, ongoing, upcoming) and related information. Accessible to the event creator and its subscribers.#
 """
-from timeout.models import Event
+from timeout.services import EventService
 from django.shortcuts import get_object_or_404, render
 from django.contrib.auth.decorators import login_required
 
 @login_required
 def event_details(request, event_id):
     """View to display details of a specific event."""
-    event = get_object_or_404(Event, id=event_id, creator=request.user)
+    event = get_object_or_404(EventService.owned_or_subscribed(request.user), id=event_id)
     context = {
         'event': event,
         'is_past': event.is_past,
         'is_ongoing': event.is_ongoing,
-        'is_upcoming': event.is_upcoming
+        'is_upcoming': event.is_upcoming,
+        'is_owner': event.creator_id == request.user.id,
     }
     return render(request, 'pages/event_details.html', context)
\ No newline at end of file
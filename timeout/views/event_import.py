@@ -0,0 +1,39 @@
+"""
+View for importing a term timetable into the calendar from an uploaded .ics or CSV file.
+"""
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect
+from django.views.decorators.http import require_POST
+
+from timeout.services import EventImportService
+from timeout.services.import_service import ImportRowError
+
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+
+
+@login_required
+@require_POST
+def event_import(request):
+    """Import events from the uploaded file and report a summary."""
+    upload = request.FILES.get("file")
+    if upload is None:
+        messages.error(request, "Please choose a file to import.")
+        return redirect("calendar")
+    if upload.size > MAX_UPLOAD_BYTES:
+        messages.error(request, "That file is too large to import.")
+        return redirect("calendar")
+    try:
+        result = EventImportService.import_rows(request.user, EventImportService.parse(upload))
+    except ImportRowError as exc:
+        messages.error(request, str(exc))
+        return redirect("calendar")
+
+    summary = f"Imported {result['created']} events"
+    if result['duplicates']:
+        summary += f", skipped {result['duplicates']} already in your calendar"
+    messages.success(request, summary + ".")
+    for error in result['errors']:
+        messages.warning(request, error)
+    return redirect("calendar")
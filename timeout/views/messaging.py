@@ -3,11 +3,12 @@ Views for the messaging system, allowing users to have private conversations wit
 """
 
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.db import transaction
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.http import require_POST
 
-from timeout.models import User, Conversation, Message
+from timeout.models import User, Conversation, ConversationMembership, Message, UserCounters
 from timeout.services.social_service import are_blocked
 from timeout.services.notification_service import NotificationService
 
@@ -15,23 +16,8 @@ from timeout.services.notification_service import NotificationService
 @login_required
 def inbox(request):
     """Show all conversations for the current user."""
-    conversations = request.user.conversations.prefetch_related(
-        'participants', 'messages'
-    ).order_by('-updated_at')
-
-    conversation_data = []
-    for conv in conversations:
-        unread_count = conv.messages.filter(
-            is_read=False
-        ).exclude(sender=request.user).count()
-        conversation_data.append({
-            'conv': conv,
-            'other': conv.get_other_participant(request.user),
-            'last': conv.get_last_message(),
-            'unread_count': unread_count,
-        })
-
-    context = {'conversations': conversation_data, 'total_unread': sum(c['unread_count'] for c in conversation_data)}
+    context = {'conversations': ConversationMembership.inbox(request.user),
+               'total_unread': UserCounters.get(request.user.pk).unread_messages}
     return render(request, 'messaging/inbox.html', context)
 
 
@@ -46,17 +32,7 @@ def start_conversation(request, username):
     if are_blocked(request.user, other_user):
         return redirect('inbox')
 
-    # Check if conversation already exists between these two users
-    conversation = Conversation.objects.filter(
-        participants=request.user
-    ).filter(
-        participants=other_user
-    ).first()
-
-    if not conversation:
-        conversation = Conversation.objects.create()
-        conversation.participants.add(request.user, other_user)
-
+    conversation = Conversation.between(request.user, other_user)
     return redirect('conversation', conversation_id=conversation.id)
 
 
@@ -73,18 +49,33 @@ def conversation(request, conversation_id):
     if are_blocked(request.user, other_user):
         return redirect('inbox')
 
-    conv.messages.exclude(sender=request.user).update(is_read=True)
+    ConversationMembership.mark_read(request.user.pk, [conv.pk])
 
-    messages = conv.messages.select_related('sender').order_by('created_at')
+    messages, older_cursor = conv.history()
 
     context = {
         'conversation': conv,
         'messages': messages,
+        'older_cursor': older_cursor,
         'other_user': other_user,
     }
     return render(request, 'messaging/conversation.html', context)
 
 
+@login_required
+def message_history(request, conversation_id):
+    """Return the page of messages older than a history cursor, oldest first."""
+    conv = get_object_or_404(
+        Conversation,
+        id=conversation_id,
+        participants=request.user
+    )
+    messages, older_cursor = conv.history(cursor=request.GET.get('cursor'))
+    return JsonResponse({
+        'messages': [_serialize_thread_message(m, request.user) for m in messages],
+        'has_older': older_cursor is not None,
+        'older_cursor': older_cursor,
+    })
 
 
 def _notify_receiver(receiver, sender, content, conv):
@@ -104,6 +95,17 @@ def _serialize_message(message):
     }
 
 
+def _serialize_thread_message(message, user):
+    """Return a JSON-serializable dict for a message shown to a participant."""
+    return {
+        'id': message.id,
+        'content': message.content,
+        'sender': message.sender.username,
+        'created_at': message.created_at.strftime('%H:%M'),
+        'is_me': message.sender_id == user.id,
+    }
+
+
 @login_required
 @require_POST
 def send_message(request, conversation_id):
@@ -116,9 +118,9 @@ def send_message(request, conversation_id):
     content = request.POST.get('content', '').strip()
     if not content:
         return JsonResponse({'error': 'Empty message'}, status=400)
+    # The message signal moves the conversation's last message, count and updated_at.
     message = Message.objects.create(
         conversation=conv, sender=request.user, content=content)
-    conv.save()
     _notify_receiver(receiver, request.user, content, conv)
     return JsonResponse(_serialize_message(message))
 
@@ -127,29 +129,36 @@ def send_message(request, conversation_id):
 @require_POST
 def mark_all_conversations_read(request):
     """Mark all received messages across all conversations as read."""
-    conv_ids = request.user.conversations.values_list('id', flat=True)
-    Message.objects.filter(
-        conversation_id__in=conv_ids
-    ).exclude(sender=request.user).update(is_read=True)
+    ConversationMembership.mark_read(request.user.pk)
     return JsonResponse({'success': True})
 
 
 @login_required
 @require_POST
 def mark_conversation_unread(request, conversation_id):
-    """Mark the most recent received message in a conversation as unread."""
-    conv = get_object_or_404(
-        Conversation, id=conversation_id, participants=request.user
+    """Mark the most recent received message in a conversation as unread by moving the
+    user's read cursor back to just before it."""
+    membership = get_object_or_404(
+        ConversationMembership.objects.select_related('conversation'),
+        conversation_id=conversation_id, user=request.user,
     )
     last_received = (
-        conv.messages
+        membership.conversation.messages
         .exclude(sender=request.user)
-        .order_by('-created_at', '-pk')
+        .order_by('-pk')
+        .values_list('pk', flat=True)
         .first()
     )
-    if last_received:
-        last_received.is_read = False
-        last_received.save(update_fields=['is_read'])
+    if last_received and membership.last_read_message_id >= last_received:
+        with transaction.atomic():
+            # Messages from last_received on become unread; own messages after it stay read.
+            unread = membership.conversation.messages.filter(pk__gte=last_received).exclude(
+                sender=request.user).count()
+            if ConversationMembership.objects.filter(
+                    pk=membership.pk, last_read_message_id=membership.last_read_message_id,
+            ).update(last_read_message_id=last_received - 1,
+                     read_count=max(membership.conversation.message_count - unread, 0)):
+                UserCounters.adjust(request.user.pk, messages=unread)
     return JsonResponse({'success': True})
 
 
@@ -166,27 +175,32 @@ def delete_message(request, message_id):
 
 @login_required
 def poll_messages(request, conversation_id):
-    """Return messages newer than a given message ID for polling."""
-    conv = get_object_or_404(
-        Conversation,
-        id=conversation_id,
-        participants=request.user
-    )
-
-    last_id = request.GET.get('last_id', 0)
-
-    new_messages = conv.messages.filter(
+    """Return messages newer than a given message ID for polling.
+
+    One indexed lookup of the poller's membership reads the conversation's
+    last_message_id and answers an up-to-date poll with 204; only a poll that
+    is behind reads the new messages and moves the poller's read cursor."""
+    try:
+        last_id = int(request.GET.get('last_id', 0))
+    except (ValueError, TypeError):
+        last_id = 0
+
+    head = ConversationMembership.objects.filter(
+        conversation_id=conversation_id, user=request.user,
+    ).values_list('conversation__last_message_id', flat=True)[:1]
+    if not head:
+        raise Http404
+    if last_id >= (head[0] or 0):
+        return HttpResponse(status=204)
+
+    new_messages = list(Message.objects.filter(
+        conversation_id=conversation_id,
         id__gt=last_id
-    ).select_related('sender').order_by('created_at')
+    ).select_related('sender').order_by('created_at', 'id'))
 
-    new_messages.exclude(sender=request.user).update(is_read=True)
+    if new_messages:
+        ConversationMembership.mark_read(request.user.pk, [conversation_id])
 
-    data = [{
-        'id': m.id,
-        'content': m.content,
-        'sender': m.sender.username,
-        'created_at': m.created_at.strftime('%H:%M'),
-        'is_me': m.sender == request.user,
-    } for m in new_messages]
+    data = [_serialize_thread_message(m, request.user) for m in new_messages]
 
-    return JsonResponse({'messages': data})
\ No newline at end of file
+    return JsonResponse({'messages': data})
@@ -6,37 +6,28 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
 from timeout.models.notification import Notification
 from django.http import JsonResponse
-from django.core.paginator import Paginator
 from timeout.services.notification_service import NotificationService
 
 
 @login_required
 def notifications_view(request):
-    """Display user notifications with pagination and filtering."""
-    notifications_qs = Notification.objects.filter(user=request.user, is_dismissed=False).order_by('-created_at')
-    unread_count = notifications_qs.filter(is_read=False).count()
+    """Display user notifications with keyset pagination and filtering."""
     filter_param = request.GET.get('filter')
-    if filter_param == 'unread': notifications_qs = notifications_qs.filter(is_read=False)
+    notifications, next_cursor = NotificationService.page(
+        request.user, unread_only=filter_param == 'unread', cursor=request.GET.get('cursor'))
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        return _notifications_ajax(notifications_qs, request.GET.get('page', 1))
+        return JsonResponse({
+            'notifications': [_serialize_notification(n) for n in notifications],
+            'has_next': next_cursor is not None,
+            'next_cursor': next_cursor,
+        })
     return render(request, 'pages/notifications.html', {
-        'notifications': notifications_qs,
-        'unread_count': unread_count,
+        'notifications': notifications,
+        'next_cursor': next_cursor,
+        'unread_count': NotificationService.unread_count(request.user.id),
         'current_filter': filter_param})
 
 
-def _notifications_ajax(queryset, page_number):
-    """Return paginated notifications as JSON."""
-    paginator = Paginator(queryset, 15)
-    page_obj = paginator.get_page(page_number)
-    data = [_serialize_notification(n) for n in page_obj]
-    return JsonResponse({
-        'notifications': data,
-        'has_next': page_obj.has_next(),
-        'next_page': page_obj.next_page_number() if page_obj.has_next() else None,
-    })
-
-
 def _serialize_notification(n):
     """Convert a Notification instance to a JSON-safe dict."""
     return {
@@ -51,82 +42,68 @@ def _serialize_notification(n):
         'post_id': n.post_id,
     }
 
+def _own_notification(request, notification_id):
+    """Return the user's notification id, or None if it is not theirs."""
+    return Notification.objects.filter(
+        id=notification_id, user=request.user).values_list('id', flat=True).first()
+
 @login_required
 def mark_notification_read(request, notification_id):
     """Mark a notification as read."""
-    try: 
-        n = Notification.objects.get(id=notification_id, user=request.user)
-        n.is_read = True
-        n.save(update_fields=['is_read'])
-        return JsonResponse({'success': True})
-    except Notification.DoesNotExist:
+    pk = _own_notification(request, notification_id)
+    if pk is None:
         return JsonResponse({'error': 'Notification not found'}, status=404)
+    NotificationService.set_read(request.user, True, ids=[pk])
+    return JsonResponse({'success': True})
 
 @login_required
 def mark_all_notifications_unread(request):
     """Mark all notifications as unread (for testing or user preference)."""
-    Notification.objects.filter(
-        user=request.user, is_read=True, is_dismissed=False
-    ).update(is_read=False)
+    NotificationService.set_read(request.user, False)
     return JsonResponse({'success': True})
 
 @login_required
 def delete_notification(request, notification_id):
     """Dismiss a notification (mark as dismissed and read)."""
-    try:
-        n = Notification.objects.get(id=notification_id, user=request.user)
-        n.is_dismissed = True
-        n.is_read = True
-        n.save(update_fields=['is_dismissed', 'is_read'])
-        return JsonResponse({'success': True})
-    except Notification.DoesNotExist:
+    pk = _own_notification(request, notification_id)
+    if pk is None:
         return JsonResponse({'error': 'Notification not found'}, status=404)
+    NotificationService.dismiss(request.user, ids=[pk])
+    return JsonResponse({'success': True})
 
 @login_required
 def mark_all_notifications_read(request):
     """Mark all notifications as read."""
-    Notification.objects.filter(user=request.user, is_read=False, is_dismissed=False).update(is_read=True)
+    NotificationService.set_read(request.user, True)
     return JsonResponse({'success': True})
 
 @login_required
 def mark_notification_unread(request, notification_id):
     """Mark a specific notification as unread."""
-    try:
-        n = Notification.objects.get(id=notification_id, user=request.user)
-        n.is_read = False
-        n.save(update_fields=['is_read'])
-        return JsonResponse({'success': True})
-    except Notification.DoesNotExist:
+    pk = _own_notification(request, notification_id)
+    if pk is None:
         return JsonResponse({'error': 'Notification not found'}, status=404)
+    NotificationService.set_read(request.user, False, ids=[pk])
+    return JsonResponse({'success': True})
 
 @login_required
 def delete_all_notifications(request):
     """Delete all notifications for the current user."""
-    Notification.objects.filter(
-        user=request.user, is_dismissed=False
-    ).update(is_dismissed=True, is_read=True)
+    NotificationService.dismiss(request.user)
     return JsonResponse({'success': True})
 
 @login_required
 def poll_notifications(request):
-    """AJAX endpoint to poll for new notifications since last_id."""
+    """AJAX endpoint to poll for new notifications since last_id.
+    Read-only: reminders are written ahead of time by the send_reminders runner"""
     try:
         last_id = int(request.GET.get('last_id', 0))
     except (ValueError, TypeError):
         last_id = 0
-    NotificationService.create_deadline_notifications(request.user)
-    NotificationService.create_event_notifications(request.user)
     notifications = Notification.objects.filter(
         user=request.user,
         id__gt=last_id,
         is_dismissed=False).order_by('id')
-    data = [{
-            'id': n.id,
-            'title': n.title,
-            'message': n.message,
-            'created_at': n.created_at.strftime('%H:%M'),
-            'is_read': bool(n.is_read)}
-        for n in notifications]
-    unread_count = Notification.objects.filter(
-        user=request.user, is_read=False, is_dismissed=False).count()
+    data = [NotificationService.summary(n) for n in notifications]
+    unread_count = NotificationService.unread_count(request.user.id)
     return JsonResponse({'notifications': data, 'unread_count': unread_count})
\ No newline at end of file
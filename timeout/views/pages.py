@@ -5,7 +5,7 @@ Views for the main pages of the Timeout app, including dashboard, profile, calen
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect, render
 from django.utils import timezone
-from timeout.models import User, Note, Message, Conversation
+from timeout.models import User, Note, UserCounters
 from timeout.models.like import Like
 from timeout.models.bookmark import Bookmark
 from timeout.services import FeedService, DeadlineService, EventService
@@ -36,13 +36,8 @@ def _dashboard_schedule(user):
 
 
 def _dashboard_messaging(user):
-    """Messaging widget: unread message count."""
-    conversations = Conversation.objects.filter(participants=user)
-    unread_count = Message.objects.filter(
-        conversation__in=conversations,
-        is_read=False,
-    ).exclude(sender=user).count()
-    return {'unread_count': unread_count}
+    """Messaging widget: unread message count, read from the user's counters row."""
+    return {'unread_count': UserCounters.get(user.pk).unread_messages}
 
 
 def _dashboard_social(user):
@@ -0,0 +1,47 @@
+"""
+Async Server-Sent Events endpoint pushing new notifications, new messages and unread-count changes
+to the logged-in user's open tabs. Served through ASGI only: unless settings.REALTIME_STREAM_ENABLED
+is on the endpoint returns 404, because under WSGI a never-ending response would hold a worker for good.
+The poll endpoints remain as the fallback.
+"""
+import asyncio
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from timeout.services import realtime
+
+KEEPALIVE_SECONDS = 15
+RETRY_MILLISECONDS = 5000
+
+
+async def event_stream(user_id):
+    """Yield events published to a user until the client disconnects.
+    A comment line is sent every KEEPALIVE_SECONDS so proxies keep the connection open"""
+    backend = realtime.get_backend()
+    queue = backend.subscribe(user_id)
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n: connected\n\n'
+        while True:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            yield realtime.format_event(event, data)
+    finally:
+        backend.unsubscribe(user_id, queue)
+
+
+@login_required
+@require_GET
+async def stream(request):
+    """Open the user's push stream, or 404 when the stream is disabled."""
+    if not settings.REALTIME_STREAM_ENABLED:
+        raise Http404
+    user = await request.auser()
+    response = StreamingHttpResponse(event_stream(user.pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
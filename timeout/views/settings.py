@@ -8,6 +8,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import PasswordChangeForm
 from django.http import JsonResponse
 from django.shortcuts import render, redirect
+from django.urls import reverse
 from django.views.decorators.http import require_POST
 
 from timeout.forms import AppearanceForm
@@ -44,9 +45,11 @@ def settings_view(request):
             password_form = result
         elif result is not None:
             return result
+    feed_path = reverse('calendar_feed', args=[user.get_calendar_token()])
     context = {
         'appearance_form': appearance_form,
-        'password_form': password_form}
+        'password_form': password_form,
+        'calendar_feed_url': request.build_absolute_uri(feed_path)}
     return render(request, 'pages/settings.html', context)
 
 
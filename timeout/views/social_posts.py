@@ -9,7 +9,7 @@ from django.template.loader import render_to_string
 from django.views.decorators.http import require_POST
 from timeout.forms import PostForm, CommentForm
 from timeout.models import Post, Comment, Like, Bookmark, PostFlag
-from timeout.services import FeedService
+from timeout.services import FeedService, activity_buffer
 from timeout.services.social_service import _get_conversation_sidebar, are_blocked
 
 
@@ -22,10 +22,12 @@ def _get_user_post_relationships(user):
 
 
 def _toggle_m2m(model, **kwargs):
-    """Toggle a relationship: create if absent, delete if present. Returns True if created."""
-    obj, created = model.objects.get_or_create(**kwargs)
-    if not created:
-        obj.delete()
+    """Toggle a relationship: create if absent, delete if present. Returns True if created.
+    Runs in one transaction whose notification is written after it commits."""
+    with activity_buffer.collect():
+        obj, created = model.objects.get_or_create(**kwargs)
+        if not created:
+            obj.delete()
     return created
 
 
@@ -114,6 +116,7 @@ def like_post(request, post_id):
     if not _can_interact_with_post(post, request.user):
         return JsonResponse({'error': 'Cannot interact with this post'}, status=403)
     liked = _toggle_m2m(Like, user=request.user, post=post)
+    post.refresh_from_db(fields=['like_count'])
     return JsonResponse({'liked': liked, 'like_count': post.get_like_count()})
 
 @login_required
@@ -149,7 +152,8 @@ def add_comment(request, post_id):
         if parent_id:
             parent = get_object_or_404(Comment, id=parent_id)
             comment.parent = parent
-        comment.save()
+        with activity_buffer.collect():
+            comment.save()
         messages.success(request, 'Comment added!')
     else: messages.error(request, 'Error adding comment.')
     return redirect('social_feed')
@@ -8,12 +8,12 @@ import logging
 from datetime import datetime, timedelta
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.exceptions import ValidationError
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.views.decorators.http import require_POST
 from timeout.models import Event
+from timeout.services import StudySessionService
 from timeout.services.study_planner import get_free_slots, pick_evenly_spaced_slots
 
 logger = logging.getLogger(__name__)
@@ -115,26 +115,8 @@ def confirm_sessions(request):
     except (json.JSONDecodeError, ValueError):
         return JsonResponse({'success': False, 'error': 'Invalid session data.'}, status=400)
 
-    created = sum(1 for s in sessions if _create_session(request.user, s))
-    return JsonResponse({'success': True, 'count': created})
-
-
-def _create_session(user, s):
-    """Create a single study session event. Returns True on success."""
-    try:
-        start = timezone.make_aware(datetime.fromisoformat(s['start']))
-        end = timezone.make_aware(datetime.fromisoformat(s['end']))
-        event = Event(
-            creator=user, title=s['title'],
-            event_type=Event.EventType.STUDY_SESSION,
-            start_datetime=start, end_datetime=end,
-            visibility=Event.Visibility.PRIVATE,
-        )
-        event.full_clean()
-        event.save()
-        return True
-    except (ValidationError, KeyError, TypeError, ValueError):
-        return False
+    created = StudySessionService.create_sessions(request.user, sessions)
+    return JsonResponse({'success': True, 'count': len(created)})
 
 
 def call_gpt(deadline, hours_needed, session_length, free_slots, remainder_hours=0.0):
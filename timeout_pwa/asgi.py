@@ -2,6 +2,8 @@
 ASGI config for timeout_pwa project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the app through it (e.g. ``uvicorn timeout_pwa.asgi:application``) and set
+REALTIME_STREAM_ENABLED to push notifications over the Server-Sent Events stream.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
@@ -186,6 +186,38 @@ SENDGRID_API_KEY = os.environ.get('SENDGRID_API_KEY', '')
 SENDGRID_FROM_EMAIL = os.environ.get('SENDGRID_FROM_EMAIL', '')
 
 
+# Realtime push backend (Server-Sent Events). LocalBackend only reaches streams served
+# by the same process; a multi-process deployment plugs in a shared backend here.
+REALTIME_BACKEND = os.environ.get('REALTIME_BACKEND', 'timeout.services.realtime.LocalBackend')
+
+# The stream holds its connection open, which only an ASGI server (timeout_pwa.asgi) can do
+# without tying up a worker per tab. Turn it on only when the app is served through ASGI;
+# while it is off the stream endpoint returns 404 and pages keep the regular polling.
+REALTIME_STREAM_ENABLED = os.environ.get('REALTIME_STREAM_ENABLED', '').lower() in ('1', 'true', 'yes')
+
+
+# How notifications for likes, bookmarks and comments are written: 'commit' batches them
+# after the request's transaction commits; 'queue' only queues them and leaves the writes
+# to the flush_activity runner.
+NOTIFICATION_FANOUT = os.environ.get('NOTIFICATION_FANOUT', 'commit')
+
+
+# Notification retention, applied by the purge_notifications command. Ages are in days;
+# None keeps those rows forever. Deletes run in batches of BATCH_SIZE rows.
+NOTIFICATION_RETENTION = {
+    'DISMISSED_DAYS': 7,
+    'READ_DAYS': 90,
+    'EXPIRED_REMINDER_DAYS': 1,
+    'BATCH_SIZE': 1000,
+}
+
+
+# Home timelines: a new post is written to each follower's timeline, except for authors with
+# more than TIMELINE_FANOUT_LIMIT followers, whose posts are merged into the feed when it is read.
+# Followers past the first chunk are written by the fan_out_timelines runner.
+TIMELINE_FANOUT_LIMIT = 10000
+
+
 # Login/Logout URLs
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = '/dashboard/'